@@ -0,0 +1,262 @@
+'''
+headless batch evaluation and rendering of curve files\n
+usage: python -m batch data/ --out renders --format png csv --jobs 4
+convert to the binary format: python -m batch data/ --out binary --format crv
+export construction animations: python -m batch data/ --format mp4 --frames 200 --fps 50
+'''
+import argparse
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from curves.adaptive import adaptive_bezier, adaptive_bspline, pixel_matrix
+from curves.arclength import bezier_arc_length, bspline_arc_length
+from curves.bezier import Bezier, evaluate_many
+from curves.binary import save_binary
+from curves.bspline import BSpline
+from curves.loaders import load_curve
+from curves.parallel import PARALLEL_MIN_POINTS, adaptive_parallel, evaluate_parallel
+from .video import VIDEO_FORMATS, DEFAULT_FRAMES, DEFAULT_FPS, export_animation
+
+CURVE_EXTENSIONS = ('.txt', '.json', '.crv')
+POINT_FORMATS = ('csv', 'npy')
+IMAGE_FORMATS = ('png', 'svg')
+CONTAINER_FORMATS = ('crv',)
+
+
+def find_curve_files(paths):
+    files = []
+    for path in paths:
+        if os.path.isdir(path):
+            for root, dirs, names in os.walk(path):
+                dirs.sort()
+                for name in sorted(names):
+                    if name.lower().endswith(CURVE_EXTENSIONS):
+                        files.append(os.path.join(root, name))
+        else:
+            files.append(path)
+    return files
+
+
+def make_curve(curve):
+    if curve.kind == 'bezier':
+        return Bezier(curve.points)
+    return BSpline(curve.points, curve.degree, curve.knots)
+
+
+def evaluate_curve(curve, samples, arc_length=False):
+    '''
+    samples uniform in the parameter, or evenly spaced along the curve with
+    arc_length
+    '''
+    spline = make_curve(curve)
+    if not arc_length:
+        return spline.sample(samples)
+    if curve.kind == 'bezier':
+        return spline.evaluate(bezier_arc_length(spline.control_points).uniform_parameters(samples))
+    return spline.evaluate(bspline_arc_length(spline).uniform_parameters(samples))
+
+
+def evaluate_curves(curves, samples, workers=1, arc_length=False):
+    '''
+    samples every curve like evaluate_curve; curves sharing kind, size,
+    degree and knot vector are stacked and evaluated with one product
+    against their common basis, a very large B-spline on its own is split
+    by knot spans over workers processes
+    '''
+    if arc_length:
+        # the parameters differ per curve, there is no shared basis
+        return [evaluate_curve(curve, samples, arc_length) for curve in curves]
+
+    groups = {}
+    for index, curve in enumerate(curves):
+        spline = make_curve(curve)
+        knots = spline.knots.tobytes() if curve.kind == 'bspline' else None
+        key = (curve.kind, spline.control_points.shape, getattr(spline, 'degree', None), knots)
+        groups.setdefault(key, (spline, []))[1].append(index)
+
+    out = [None] * len(curves)
+    for spline, members in groups.values():
+        stack = np.stack([curves[index].points for index in members])
+        if isinstance(spline, Bezier):
+            result = evaluate_many(stack, samples)
+        elif len(members) == 1 and workers > 1 and max(samples, len(spline.control_points)) >= PARALLEL_MIN_POINTS:
+            result = [evaluate_parallel(spline, spline.grid(samples), workers)]
+        else:
+            result = spline.evaluator.evaluate_many(stack, spline.grid(samples))
+        for index, points in zip(members, result):
+            out[index] = points
+    return out
+
+
+def write_points(target, points, formats):
+    written = []
+    if 'csv' in formats:
+        header = ','.join('xyz'[:points.shape[1]] if points.shape[1] <= 3 else (f'x{i}' for i in range(points.shape[1])))
+        np.savetxt(target + '.csv', points, delimiter=',', header=header, comments='')
+        written.append(target + '.csv')
+    if 'npy' in formats:
+        np.save(target + '.npy', points)
+        written.append(target + '.npy')
+    return written
+
+
+def output_target(path, base, out_dir):
+    stem = os.path.splitext(os.path.relpath(path, base))[0]
+    target = os.path.join(out_dir, stem)
+    os.makedirs(os.path.dirname(target) or '.', exist_ok=True)
+    return target
+
+
+def export_points(paths, base, out_dir, formats, samples, workers=1, arc_length=False):
+    '''
+    csv/npy output for all files at once, so curves that share a knot vector
+    are evaluated together; returns (path, written, error) per file
+    '''
+    results = {}
+    curves = []
+    for path in paths:
+        try:
+            curves.append((path, load_curve(path)))
+        except Exception as e:
+            results[path] = (path, [], str(e))
+
+    try:
+        sampled = evaluate_curves([curve for path, curve in curves], samples, workers, arc_length)
+    except Exception:
+        # a bad curve fails only its own file
+        sampled = []
+        for path, curve in curves:
+            try:
+                sampled.append(evaluate_curve(curve, samples, arc_length))
+            except Exception as e:
+                sampled.append(e)
+
+    for (path, curve), points in zip(curves, sampled):
+        if isinstance(points, Exception):
+            results[path] = (path, [], str(points))
+            continue
+        try:
+            results[path] = (path, write_points(output_target(path, base, out_dir), points, formats), None)
+        except Exception as e:
+            results[path] = (path, [], str(e))
+    return [results[path] for path in paths]
+
+
+def render_curve(curve, path, dpi=100, jobs=1):
+    from matplotlib.figure import Figure
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+
+    fig = Figure(figsize=(6, 5), dpi=dpi)
+    FigureCanvasAgg(fig)
+    ax = fig.add_subplot(111)
+    points = curve.points
+
+    if curve.kind == 'bezier':
+        ax.plot(points[:, 0], points[:, 1], 'ro-', label='Control points')
+        ax.autoscale_view()
+        out = adaptive_bezier(points, matrix=pixel_matrix(ax.transData))[1]
+        ax.plot(out[:, 0], out[:, 1], linestyle='--', color='black', label='Bezier curve')
+    else:
+        ax.grid()
+        ax.set_xlabel('x')
+        ax.set_ylabel('y')
+        ax.set_title('B-Spline Curve')
+        ax.plot(points[:, 0], points[:, 1], 'k--', label='Control polygon', marker='o', markerfacecolor='red')
+        ax.autoscale_view()
+        spline = make_curve(curve)
+        if jobs > 1 and len(spline.control_points) >= PARALLEL_MIN_POINTS:
+            out = adaptive_parallel(spline, matrix=pixel_matrix(ax.transData), workers=jobs)[1]
+        else:
+            out = adaptive_bspline(spline.evaluator, spline.control_points, matrix=pixel_matrix(ax.transData))[1]
+        ax.plot(out[:, 0], out[:, 1], 'b', label='B-spline curve')
+
+    ax.legend(loc='best')
+    fig.savefig(path)
+
+
+def process_file(task):
+    # csv/npy output is written by export_points, for all files together
+    path, base, out_dir, formats, dpi, frames, fps, jobs = task
+    target = output_target(path, base, out_dir)
+
+    curve = load_curve(path)
+    written = []
+    if 'crv' in formats:
+        save_binary(target + '.crv', curve)
+        written.append(target + '.crv')
+    for fmt in formats:
+        if fmt in IMAGE_FORMATS:
+            render_curve(curve, target + '.' + fmt, dpi, jobs)
+            written.append(target + '.' + fmt)
+        elif fmt in VIDEO_FORMATS:
+            written.append(export_animation(curve, target, fmt, frames, fps, dpi, jobs))
+    return written
+
+
+def _run(task):
+    try:
+        return task[0], process_file(task), None
+    except Exception as e:
+        return task[0], [], str(e)
+
+
+def parse_args(argv):
+    parser = argparse.ArgumentParser(prog='python -m batch', description='Evaluate and render curve files without starting the GUI.')
+    parser.add_argument('paths', nargs='+', help='curve files (.txt/.json/.crv) or directories containing them')
+    parser.add_argument('-o', '--out', default='renders', help='output directory (default: renders)')
+    parser.add_argument('-f', '--format', nargs='+', default=['png'], choices=POINT_FORMATS + IMAGE_FORMATS + CONTAINER_FORMATS + VIDEO_FORMATS, help='outputs to write (default: png)')
+    parser.add_argument('-n', '--samples', type=int, default=100, help='samples for csv/npy output (default: 100)')
+    parser.add_argument('--arc-length', action='store_true', help='space csv/npy samples evenly along the curve instead of in the parameter')
+    parser.add_argument('-j', '--jobs', type=int, default=1, help='worker processes (default: 1, 0 for all cores)')
+    parser.add_argument('--dpi', type=int, default=100, help='resolution of the rendered images')
+    parser.add_argument('--frames', type=int, default=DEFAULT_FRAMES, help=f'frames per animation for mp4/gif/frames output (default: {DEFAULT_FRAMES})')
+    parser.add_argument('--fps', type=int, default=DEFAULT_FPS, help=f'frame rate of exported animations (default: {DEFAULT_FPS})')
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    files = find_curve_files(args.paths)
+    if not files:
+        print('No curve files found', file=sys.stderr)
+        return 1
+
+    base = os.path.commonpath([os.path.dirname(os.path.abspath(path)) for path in files])
+    jobs = args.jobs or os.cpu_count()
+    # a single file spreads its animation frames (or its samples) over the
+    # workers instead
+    frame_jobs = jobs if len(files) == 1 else 1
+    paths = [os.path.abspath(path) for path in files]
+
+    # point output is evaluated up front for all files together, the
+    # workers only render images, animations and containers
+    point_formats = [fmt for fmt in args.format if fmt in POINT_FORMATS]
+    other_formats = [fmt for fmt in args.format if fmt not in POINT_FORMATS]
+    points = {path: ([], None) for path in paths}
+    if point_formats:
+        points = {path: (written, error) for path, written, error in export_points(paths, base, args.out, point_formats, args.samples, frame_jobs, args.arc_length)}
+    if not other_formats:
+        return 1 if sum(report(path, *points[path]) for path in paths) else 0
+
+    tasks = [(path, base, args.out, other_formats, args.dpi, args.frames, args.fps, frame_jobs) for path in paths]
+
+    failed = 0
+    if jobs == 1 or len(tasks) == 1:
+        for path, written, error in map(_run, tasks):
+            failed += report(path, points[path][0] + written, points[path][1] or error)
+    else:
+        with ProcessPoolExecutor(max_workers=jobs) as executor:
+            for path, written, error in executor.map(_run, tasks, chunksize=max(1, len(tasks) // (jobs * 4))):
+                failed += report(path, points[path][0] + written, points[path][1] or error)
+    return 1 if failed else 0
+
+
+def report(path, written, error):
+    if error is not None:
+        print(f'{path}: error: {error}', file=sys.stderr)
+        return 1
+    print(f'{path} -> {", ".join(written)}')
+    return 0
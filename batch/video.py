@@ -0,0 +1,178 @@
+'''
+off-screen export of the construction animations\n
+frames are drawn on an Agg canvas: the static part of the figure (axes,
+control polygon, curve) is rendered once and restored from a cached
+background, only the construction lines are redrawn for every frame
+'''
+import os
+import shutil
+import subprocess
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from curves.bezier import Bezier
+from curves.bspline import BSpline
+from curves.frames import bezier_frames, bspline_frames
+
+VIDEO_FORMATS = ('mp4', 'gif', 'frames')
+DEFAULT_FRAMES = 100
+DEFAULT_FPS = 50
+
+
+def curve_frames(curve, count):
+    # frames are spaced evenly along the curve, like in the GUI
+    if curve.kind == 'bezier':
+        return bezier_frames(Bezier(curve.points).control_points, count, constant_speed=True)
+    return bspline_frames(BSpline(curve.points, curve.degree, curve.knots), count, constant_speed=True)
+
+
+class FrameRenderer:
+    '''
+    draws single frames of a curve's construction animation as RGB arrays
+    '''
+    def __init__(self, curve, count=DEFAULT_FRAMES, dpi=100):
+        from matplotlib.figure import Figure
+        from matplotlib.backends.backend_agg import FigureCanvasAgg
+
+        self.frames = curve_frames(curve, count)
+        self.fig = Figure(figsize=(6, 5), dpi=dpi)
+        self.canvas = FigureCanvasAgg(self.fig)
+        ax = self.fig.add_subplot(111)
+        points = curve.points
+
+        self.trace_line = None
+        self.level_lines = []
+        if curve.kind == 'bezier':
+            ax.plot(points[:, 0], points[:, 1], 'ro-', label='Control points')
+            ax.plot(self.frames.curve[:, 0], self.frames.curve[:, 1], linestyle='--', color='black', label='Bezier curve')
+            self.first_level = 1
+            for id in range(1, len(points)):
+                line, = ax.plot([], [], marker='o', linestyle='-', label=f'Segment{id}', animated=True)
+                self.level_lines.append(line)
+        else:
+            ax.grid()
+            ax.set_xlabel('x')
+            ax.set_ylabel('y')
+            ax.set_title('B-Spline Curve Animation')
+            ax.plot(points[:, 0], points[:, 1], 'k--', label='Control polygon', marker='o', markerfacecolor='red')
+            self.trace_line, = ax.plot([], [], 'b', label='B-spline curve', animated=True)
+            self.first_level = 0
+            for r in range(curve.degree + 1):
+                label = 'de Boor points' if r == 0 else '_nolegend_'
+                line, = ax.plot([], [], marker='o', linestyle='-', linewidth=1, markersize=4 if r < curve.degree else 7, label=label, animated=True)
+                self.level_lines.append(line)
+        ax.legend(loc='best')
+
+        # animated artists are skipped by draw(), so this renders the static
+        # background only
+        self.canvas.draw()
+        self.background = self.canvas.copy_from_bbox(self.fig.bbox)
+        self.artists = self.level_lines + ([self.trace_line] if self.trace_line is not None else [])
+
+    def __len__(self):
+        return len(self.frames.params)
+
+    def render(self, index):
+        levels = self.frames.levels[index]
+        size = levels.shape[0]
+        for k, line in enumerate(self.level_lines):
+            r = self.first_level + k
+            line.set_data(levels[r, :size - r, 0], levels[r, :size - r, 1])
+        if self.trace_line is not None:
+            trace = self.frames.curve[:index + 1]
+            self.trace_line.set_data(trace[:, 0], trace[:, 1])
+
+        self.canvas.restore_region(self.background)
+        for artist in self.artists:
+            artist.axes.draw_artist(artist)
+        return np.asarray(self.canvas.buffer_rgba())[:, :, :3].copy()
+
+
+def _render_range(task):
+    curve, count, dpi, start, stop = task
+    renderer = FrameRenderer(curve, count, dpi)
+    return np.stack([renderer.render(index) for index in range(start, stop)])
+
+
+def iter_frames(curve, count=DEFAULT_FRAMES, dpi=100, jobs=1):
+    '''
+    yields the frames in order; with jobs > 1 contiguous frame ranges are
+    rendered in worker processes, each with its own cached background
+    '''
+    if jobs <= 1 or count < 2 * jobs:
+        renderer = FrameRenderer(curve, count, dpi)
+        for index in range(len(renderer)):
+            yield renderer.render(index)
+        return
+
+    bounds = np.linspace(0, count, min(count, jobs * 4) + 1).astype(int)
+    tasks = [(curve, count, dpi, start, stop) for start, stop in zip(bounds[:-1], bounds[1:])]
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        for block in executor.map(_render_range, tasks):
+            yield from block
+
+
+def write_ffmpeg(frames, path, fps, ffmpeg):
+    first = next(frames)
+    height, width = first.shape[:2]
+    command = [
+        ffmpeg, '-y', '-loglevel', 'error',
+        '-f', 'rawvideo', '-pix_fmt', 'rgb24', '-s', f'{width}x{height}', '-r', str(fps), '-i', '-',
+        '-an', '-vf', 'pad=ceil(iw/2)*2:ceil(ih/2)*2', '-vcodec', 'libx264', '-pix_fmt', 'yuv420p', path,
+    ]
+    process = subprocess.Popen(command, stdin=subprocess.PIPE, stderr=subprocess.PIPE)
+    try:
+        process.stdin.write(first.tobytes())
+        for frame in frames:
+            process.stdin.write(frame.tobytes())
+    except BrokenPipeError:
+        pass
+    finally:
+        process.stdin.close()
+        error = process.stderr.read().decode(errors='replace').strip()
+        process.wait()
+    if process.returncode != 0:
+        raise RuntimeError(f'ffmpeg failed: {error}')
+
+
+def write_gif(frames, path, fps):
+    from PIL import Image
+
+    frames = list(frames)
+    # all frames share the colours of the static background and the line
+    # styles, so one palette (taken from a frame where every artist is
+    # visible) is enough and avoids quantizing every frame from scratch
+    palette = Image.fromarray(frames[len(frames) // 2]).quantize(256, method=Image.Quantize.MEDIANCUT)
+    images = [Image.fromarray(frame).quantize(palette=palette, dither=Image.Dither.NONE) for frame in frames]
+    images[0].save(path, save_all=True, append_images=images[1:], duration=round(1000 / fps), loop=0, optimize=False)
+
+
+def write_png_sequence(frames, directory):
+    from PIL import Image
+
+    os.makedirs(directory, exist_ok=True)
+    for index, frame in enumerate(frames):
+        Image.fromarray(frame).save(os.path.join(directory, f'frame_{index:05d}.png'), compress_level=1)
+
+
+def export_animation(curve, target, fmt, count=DEFAULT_FRAMES, fps=DEFAULT_FPS, dpi=100, jobs=1):
+    '''
+    writes the animation of curve next to target (path without extension)
+    and returns the written path; mp4 needs ffmpeg on PATH and falls back
+    to a GIF without it
+    '''
+    frames = iter_frames(curve, count, dpi, jobs)
+    if fmt == 'mp4':
+        ffmpeg = shutil.which('ffmpeg')
+        if ffmpeg is not None:
+            write_ffmpeg(frames, target + '.mp4', fps, ffmpeg)
+            return target + '.mp4'
+        fmt = 'gif'
+    if fmt == 'gif':
+        write_gif(frames, target + '.gif', fps)
+        return target + '.gif'
+    if fmt == 'frames':
+        write_png_sequence(frames, target + '_frames')
+        return target + '_frames'
+    raise ValueError(f'Unknown animation format: {fmt}')
@@ -0,0 +1,254 @@
+'''
+curve evaluation benchmarks\n
+usage:
+    python benchmarks/bench_curves.py --out results.json
+    python benchmarks/bench_curves.py --baseline results.json --threshold 1.25
+results are stored as JSON together with machine metadata; with --baseline
+every case slower than threshold x the stored time is flagged and the exit
+status is 1
+'''
+import argparse
+import datetime
+import json
+import os
+import platform
+import subprocess
+import sys
+import timeit
+
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from curves import bezier
+from curves.approximation import approximate
+from curves.bspline import BSpline, BSplineEvaluator, generate_knots
+from curves.incremental import IncrementalBezier, IncrementalBSpline
+from curves.interpolation import PARAMETERIZATIONS, interpolate
+from curves.parallel import evaluate_parallel
+
+BEZIER_DEGREES = (1, 2, 3, 5, 10, 25, 50, 100)
+BSPLINE_SIZES = (10, 100, 1000, 10000, 100000)
+INTERPOLATION_SIZES = (10, 100, 1000, 10000, 100000, 1000000)
+BATCH_COUNTS = (10, 100, 1000)
+PARALLEL_SIZES = (200000, 1000000)
+APPROXIMATION_SIZES = (10000, 100000, 1000000)
+APPROXIMATION_CONTROL_POINTS = 1000
+SAMPLES = 1000
+
+
+def bezier_cases(degrees):
+    rng = np.random.default_rng(0)
+    for degree in degrees:
+        points = rng.uniform(-200, 200, (degree + 1, 2))
+        for method in ('casteljau', 'bernstein', 'horner'):
+            yield 'bezier', method, {'degree': degree, 'samples': 101}, lambda p=points, m=method: bezier.evaluate(p, 101, m)
+
+
+def bspline_cases(sizes, degree=3):
+    from scipy import interpolate
+
+    rng = np.random.default_rng(1)
+    for size in sizes:
+        points = rng.uniform(0, 10, (size, 2))
+        knots = generate_knots(size, degree) if size < 100 else _knots(size, degree)
+        tck = [knots, [points[:, 0], points[:, 1]], degree]
+        evaluator = BSplineEvaluator(knots, degree)
+        u = evaluator.grid(SAMPLES)
+        params = {'points': size, 'degree': degree, 'samples': SAMPLES}
+        yield 'bspline', 'splev', params, lambda u=u, tck=tck: interpolate.splev(u, tck)
+        yield 'bspline', 'evaluator', params, lambda e=evaluator, p=points, u=u: BSplineEvaluator(e.knots, e.degree).evaluate(p, u)
+        yield 'bspline', 'evaluator-cached', params, lambda e=evaluator, p=points, u=u: e.evaluate(p, u)
+
+
+def interpolation_cases(sizes, degree=3):
+    from scipy.interpolate import splprep
+
+    rng = np.random.default_rng(2)
+    for size in sizes:
+        # a random walk keeps consecutive points distinct
+        points = np.cumsum(rng.uniform(0.1, 1, (size, 2)), axis=0)
+        params = {'points': size, 'degree': degree}
+        yield 'interpolation', 'splprep', params, lambda p=points: splprep([p[:, 0], p[:, 1]], k=degree, s=0)
+        for method in PARAMETERIZATIONS:
+            yield 'interpolation', 'banded-' + method, params, lambda p=points, m=method: interpolate(p, degree, m)
+
+
+def approximation_cases(sizes, count=APPROXIMATION_CONTROL_POINTS, degree=3):
+    # least squares on a fixed knot vector: splprep holds all points at once,
+    # approximate streams them in chunks (three passes, residuals included)
+    from scipy.interpolate import splprep
+
+    rng = np.random.default_rng(6)
+    knots = generate_knots(count, degree, decimals=None)
+    for size in sizes:
+        points = np.cumsum(rng.normal(0, 1, (size, 2)), axis=0)
+        params = {'points': size, 'control_points': count, 'degree': degree}
+        yield 'approximation', 'splprep', params, lambda p=points: splprep([p[:, 0], p[:, 1]], k=degree, task=-1, t=knots)
+        yield 'approximation', 'streaming', params, lambda p=points: approximate(p, count, degree)
+        yield 'approximation', 'streaming-smoothed', params, lambda p=points: approximate(p, count, degree, smoothing=1.0)
+
+
+def edit_cases(sizes, degrees, degree=3):
+    # moving one control point: full re-evaluation against the incremental path;
+    # the new positions are drawn before timing so the RNG is not measured
+    rng = np.random.default_rng(3)
+    for size in sizes:
+        points = rng.uniform(0, 10, (size, 2))
+        spline = BSpline(points, degree, _knots(size, degree))
+        u = spline.grid(SAMPLES * 10)
+        editor = IncrementalBSpline(spline, u)
+        params = {'points': size, 'degree': degree, 'samples': SAMPLES * 10}
+        yield 'edit', 'bspline-full', params, lambda s=spline, u=u: BSplineEvaluator(s.knots, s.degree).evaluate(s.control_points, u)
+        yield 'edit', 'bspline-incremental', params, lambda e=editor, i=size // 2, p=rng.uniform(0, 10, 2): e.move(i, p)
+    for degree in degrees:
+        points = rng.uniform(-200, 200, (degree + 1, 2))
+        u = np.linspace(0, 1, SAMPLES)
+        editor = IncrementalBezier(points, u)
+        params = {'degree': degree, 'samples': SAMPLES}
+        yield 'edit', 'bezier-full', params, lambda p=points, u=u: bezier.de_casteljau(p, u)
+        yield 'edit', 'bezier-incremental', params, lambda e=editor, i=degree // 2, p=rng.uniform(-200, 200, 2): e.move(i, p)
+
+
+def batch_cases(counts, size=50, degree=3, dims=3):
+    # many curves sharing one knot vector: a loop of single evaluations
+    # against one stacked product
+    rng = np.random.default_rng(4)
+    knots = _knots(size, degree)
+    evaluator = BSplineEvaluator(knots, degree)
+    u = evaluator.grid(SAMPLES)
+    for count in counts:
+        stack = rng.uniform(0, 10, (count, size, dims))
+        params = {'curves': count, 'points': size, 'degree': degree, 'dims': dims}
+        yield 'batch', 'bspline-loop', params, lambda s=stack: [evaluator.evaluate(c, u) for c in s]
+        yield 'batch', 'bspline-stacked', params, lambda s=stack: evaluator.evaluate_many(s, u)
+        beziers = rng.uniform(-200, 200, (count, degree + 1, dims))
+        params = {'curves': count, 'degree': degree, 'dims': dims}
+        yield 'batch', 'bezier-loop', params, lambda s=beziers: [bezier.evaluate(c, 101) for c in s]
+        yield 'batch', 'bezier-stacked', params, lambda s=beziers: bezier.evaluate_many(s, 101)
+
+
+def parallel_cases(sizes, degree=3):
+    # scaling over worker counts up to the core count; the pools are started
+    # once so process startup stays out of the timings
+    from concurrent.futures import ProcessPoolExecutor
+
+    rng = np.random.default_rng(5)
+    cores = os.cpu_count() or 1
+    workers = sorted({1, cores} | {2 ** k for k in range(1, cores.bit_length()) if 2 ** k <= cores})
+    pools = {count: ProcessPoolExecutor(max_workers=count) for count in workers if count > 1}
+    for size in sizes:
+        spline = BSpline(rng.uniform(0, 10, (size, 2)), degree, _knots(size, degree))
+        u = spline.grid(size * 4)
+        for count in workers:
+            params = {'points': size, 'degree': degree, 'samples': size * 4, 'workers': count}
+            # a fresh spline every run, the serial path would reuse its cached basis otherwise
+            yield 'parallel', 'evaluate', params, lambda s=spline, u=u, c=count: evaluate_parallel(BSpline(s.control_points, s.degree, s.knots), u, c, pools.get(c))
+
+
+def knot_cases(sizes, degree=3):
+    for size in sizes:
+        yield 'knots', 'generate_knots', {'points': size, 'degree': degree}, lambda s=size: generate_knots(s, degree)
+
+
+def _knots(size, degree):
+    # generate_knots rounds to two decimals, which repeats knots past ~100 points
+    inner = np.linspace(0, 1, size - degree + 1)
+    return np.concatenate(([0.0] * degree, inner, [1.0] * degree))
+
+
+def time_case(fn, repeat):
+    timer = timeit.Timer(fn)
+    number, _ = timer.autorange()
+    times = [t / number for t in timer.repeat(repeat=repeat, number=number)]
+    return {'min': min(times), 'median': float(np.median(times)), 'number': number}
+
+
+def machine_metadata():
+    import scipy
+
+    try:
+        commit = subprocess.run(['git', 'rev-parse', 'HEAD'], cwd=ROOT, capture_output=True, text=True).stdout.strip()
+    except OSError:
+        commit = ''
+    return {
+        'date': datetime.datetime.now().isoformat(timespec='seconds'),
+        'commit': commit,
+        'python': platform.python_version(),
+        'implementation': platform.python_implementation(),
+        'numpy': np.__version__,
+        'scipy': scipy.__version__,
+        'platform': platform.platform(),
+        'machine': platform.machine(),
+        'processor': platform.processor(),
+        'cpu_count': os.cpu_count(),
+    }
+
+
+def case_id(group, name, params):
+    return group + '/' + name + '[' + ','.join(f'{k}={v}' for k, v in sorted(params.items())) + ']'
+
+
+def compare(results, baseline, threshold):
+    previous = {case['id']: case for case in baseline['cases']}
+    regressions = []
+    for case in results['cases']:
+        old = previous.get(case['id'])
+        if old is None:
+            continue
+        ratio = case['min'] / old['min']
+        case['baseline_ratio'] = ratio
+        if ratio > threshold:
+            regressions.append(case)
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Benchmark curve evaluation.')
+    parser.add_argument('--out', help='write results to this JSON file')
+    parser.add_argument('--baseline', help='compare against a stored results file')
+    parser.add_argument('--threshold', type=float, default=1.25, help='slowdown ratio flagged as a regression (default: 1.25)')
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--quick', action='store_true', help='small sizes only, for smoke runs')
+    parser.add_argument('--only', nargs='+', choices=('bezier', 'bspline', 'interpolation', 'approximation', 'edit', 'batch', 'parallel', 'knots'), help='run only these groups')
+    args = parser.parse_args(argv)
+
+    sizes = BSPLINE_SIZES[:3] if args.quick else BSPLINE_SIZES
+    groups = {
+        'bezier': lambda: bezier_cases(BEZIER_DEGREES[:5] if args.quick else BEZIER_DEGREES),
+        'bspline': lambda: bspline_cases(sizes),
+        'interpolation': lambda: interpolation_cases(INTERPOLATION_SIZES[:3] if args.quick else INTERPOLATION_SIZES),
+        'approximation': lambda: approximation_cases(APPROXIMATION_SIZES[:2] if args.quick else APPROXIMATION_SIZES),
+        'edit': lambda: edit_cases(sizes, BEZIER_DEGREES[:5] if args.quick else BEZIER_DEGREES),
+        'batch': lambda: batch_cases(BATCH_COUNTS[:2] if args.quick else BATCH_COUNTS),
+        'parallel': lambda: parallel_cases(PARALLEL_SIZES[:1] if args.quick else PARALLEL_SIZES),
+        'knots': lambda: knot_cases(sizes),
+    }
+
+    results = {'metadata': machine_metadata(), 'cases': []}
+    for group in args.only or groups:
+        for group_name, name, params, fn in groups[group]():
+            timing = time_case(fn, args.repeat)
+            case = {'id': case_id(group_name, name, params), 'group': group_name, 'name': name, 'params': params}
+            case.update(timing)
+            results['cases'].append(case)
+            print(f'{case["id"]:<70}{timing["min"] * 1e3:>12.4f} ms')
+
+    status = 0
+    if args.baseline:
+        with open(args.baseline) as file:
+            baseline = json.load(file)
+        regressions = compare(results, baseline, args.threshold)
+        for case in regressions:
+            print(f'REGRESSION {case["id"]}: {case["baseline_ratio"]:.2f}x slower than baseline', file=sys.stderr)
+        status = 1 if regressions else 0
+
+    if args.out:
+        with open(args.out, 'w') as file:
+            json.dump(results, file, indent=2)
+    return status
+
+
+if __name__ == '__main__':
+    sys.exit(main())
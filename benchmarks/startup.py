@@ -0,0 +1,68 @@
+'''
+startup timing report: per-package import cost (from python -X importtime)
+and the time until the main window is first painted\n
+usage: python benchmarks/startup.py [--runs 5] [--top 15] [--offscreen]
+'''
+import argparse
+import os
+import re
+import statistics
+import subprocess
+import sys
+import time
+from collections import defaultdict
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+IMPORT_LINE = re.compile(r'import time:\s+(\d+)\s+\|\s+(\d+)\s+\|\s*(\S+)')
+PAINT_LINE = re.compile(r'first paint: ([\d.]+) ms')
+
+
+def run_once(offscreen):
+    env = dict(os.environ)
+    if offscreen:
+        env['QT_QPA_PLATFORM'] = 'offscreen'
+    start = time.perf_counter()
+    proc = subprocess.run([sys.executable, '-X', 'importtime', 'main.py', '--startup-report'],
+                          cwd=ROOT, env=env, capture_output=True, text=True, timeout=120)
+    wall = (time.perf_counter() - start) * 1000
+
+    packages = defaultdict(float)
+    total = 0.0
+    for match in IMPORT_LINE.finditer(proc.stderr):
+        # self time grouped by top-level package, so nested imports are not counted twice
+        own, name = int(match.group(1)) / 1000, match.group(3)
+        packages[name.split('.')[0]] += own
+        total += own
+
+    paint = PAINT_LINE.search(proc.stdout)
+    if paint is None:
+        raise RuntimeError('main.py did not report a first paint:\n' + proc.stderr[-2000:])
+    return packages, total, float(paint.group(1)), wall
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Measure application startup time.')
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--top', type=int, default=15)
+    parser.add_argument('--offscreen', action='store_true', help='use the offscreen Qt platform (no display needed)')
+    args = parser.parse_args(argv)
+
+    runs = [run_once(args.offscreen) for _ in range(args.runs)]
+    packages = defaultdict(list)
+    for run in runs:
+        for name, ms in run[0].items():
+            packages[name].append(ms)
+
+    print(f'{"package":<30}{"import ms (median)":>20}')
+    ranked = sorted(packages.items(), key=lambda item: -statistics.median(item[1]))
+    for name, values in ranked[:args.top]:
+        print(f'{name:<30}{statistics.median(values):>20.1f}')
+    print()
+    print(f'total import time   {statistics.median(run[1] for run in runs):>10.1f} ms')
+    print(f'time to first paint {statistics.median(run[2] for run in runs):>10.1f} ms')
+    print(f'process wall time   {statistics.median(run[3] for run in runs):>10.1f} ms')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
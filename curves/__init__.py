@@ -0,0 +1,3 @@
+from .bezier import Bezier, de_casteljau, bernstein_basis, evaluate as evaluate_bezier, evaluate_many as evaluate_beziers
+from .bspline import BSpline, BSplineEvaluator, generate_knots
+from .cache import CurveCache
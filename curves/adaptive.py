@@ -0,0 +1,111 @@
+import numpy as np
+
+# default chord error allowed between the tessellation and the true curve, in pixels
+PIXEL_TOLERANCE = 0.5
+MAX_DEPTH = 16
+
+
+def pixel_matrix(transform):
+    '''
+    linear part of an affine data -> pixel transform (e.g. ax.transData),
+    so flatness can be measured in screen pixels
+    '''
+    origin, ex, ey = transform.transform(np.array([[0.0, 0.0], [1.0, 0.0], [0.0, 1.0]]))
+    return np.column_stack((ex - origin, ey - origin))
+
+
+def _to_pixels(points, matrix):
+    if matrix is None:
+        return points
+    return points @ np.asarray(matrix, dtype=np.float64).T
+
+
+def _chord_distance(points, start, end):
+    # distance of points (..., K, 2) from the chords start -> end (K, 2)
+    chord = end - start
+    length = np.hypot(chord[..., 0], chord[..., 1])
+    rel = points - start
+    cross = np.abs(rel[..., 0] * chord[..., 1] - rel[..., 1] * chord[..., 0])
+    degenerate = length == 0
+    safe = np.where(degenerate, 1.0, length)
+    return np.where(degenerate, np.hypot(rel[..., 0], rel[..., 1]), cross / safe)
+
+
+def _split_half(segments):
+    # de Casteljau subdivision at t = 0.5 of K segments at once
+    n = segments.shape[1]
+    left = np.empty_like(segments)
+    right = np.empty_like(segments)
+    cur = segments
+    left[:, 0] = cur[:, 0]
+    right[:, n - 1] = cur[:, n - 1]
+    for r in range(1, n):
+        cur = 0.5 * (cur[:, :-1] + cur[:, 1:])
+        left[:, r] = cur[:, 0]
+        right[:, n - 1 - r] = cur[:, -1]
+    return left, right
+
+
+def adaptive_bezier(control_points, tolerance=PIXEL_TOLERANCE, matrix=None, max_depth=MAX_DEPTH):
+    '''
+    tessellate a Bezier curve by recursive de Casteljau subdivision until
+    every piece's control polygon lies within tolerance of its chord\n
+    matrix maps data to pixels (see pixel_matrix); returns (params, points)
+    '''
+    points = np.ascontiguousarray(control_points, dtype=np.float64)
+    if len(points) < 3:
+        return np.array([0.0, 1.0])[:len(points)], points.copy()
+
+    segments = points[None]
+    starts = np.array([0.0])
+    width = 1.0
+    done_starts = []
+    done_segments = []
+    for depth in range(max_depth + 1):
+        pix = _to_pixels(segments, matrix)
+        error = _chord_distance(pix[:, 1:-1], pix[:, :1], pix[:, -1:]).max(axis=1)
+        flat = error <= tolerance
+        if depth == max_depth:
+            flat[:] = True
+        done_starts.append(starts[flat])
+        done_segments.append(segments[flat])
+        if flat.all():
+            break
+        width /= 2
+        left, right = _split_half(segments[~flat])
+        segments = np.concatenate((left, right))
+        starts = np.concatenate((starts[~flat], starts[~flat] + width))
+
+    starts = np.concatenate(done_starts)
+    segments = np.concatenate(done_segments)
+    order = np.argsort(starts)
+    params = np.append(starts[order], 1.0)
+    curve = np.vstack((segments[order, 0], points[-1]))
+    return params, curve
+
+
+def adaptive_bspline(evaluator, coefficients, tolerance=PIXEL_TOLERANCE, matrix=None, max_depth=MAX_DEPTH):
+    '''
+    tessellate a B-spline by bisecting parameter intervals until the curve
+    midpoint is within tolerance of the chord\n
+    every knot span starts with degree + 1 pieces so features inside a span
+    are not skipped; returns (params, points)
+    '''
+    coefficients = evaluator.coefficients(coefficients)
+    start, end = evaluator.domain
+    breaks = np.unique(np.clip(evaluator.knots, start, end))
+    pieces = max(evaluator.degree, 1) + 1
+    u = np.concatenate([np.linspace(a, b, pieces, endpoint=False) for a, b in zip(breaks[:-1], breaks[1:])] + [[end]])
+    values = evaluator.evaluate(coefficients, u)
+
+    for depth in range(max_depth):
+        mid = 0.5 * (u[:-1] + u[1:])
+        mid_values = evaluator.evaluate(coefficients, mid)
+        pix = _to_pixels(values, matrix)
+        error = _chord_distance(_to_pixels(mid_values, matrix), pix[:-1], pix[1:])
+        split = error > tolerance
+        if not split.any():
+            break
+        u = np.insert(u, np.flatnonzero(split) + 1, mid[split])
+        values = np.insert(values, np.flatnonzero(split) + 1, mid_values[split], axis=0)
+    return u, values
@@ -0,0 +1,153 @@
+'''
+least-squares B-spline approximation of point streams\n
+a fixed clamped knot vector with a chosen number of control points is
+fitted to any number of points: the normal equations N^T N c = N^T P are
+accumulated chunk by chunk, N^T N kept as the degree + 1 upper diagonals of
+a symmetric band, so memory only depends on the chunk size and the number
+of control points. The data is read three times (parameters, normal
+equations, residuals), so the source has to be re-iterable: an array (a
+memory-mapped one is read piecewise) or a callable returning a fresh
+iterator of (rows, d) chunks, e.g. lambda: loaders.iter_point_chunks(path)
+'''
+from collections import namedtuple
+
+import numpy as np
+
+from .bspline import BSpline, BSplineEvaluator, generate_knots
+from .interpolation import PARAMETERIZATIONS
+from .loaders import CHUNK_ROWS
+
+ChunkResidual = namedtuple('ChunkResidual', ['start', 'count', 'rms', 'max'])
+
+
+def chunk_source(source, chunk_rows=CHUNK_ROWS):
+    '''
+    a callable returning an iterator of chunks, for an array or a callable
+    '''
+    if callable(source):
+        return source
+    return lambda: (source[start:start + chunk_rows] for start in range(0, len(source), chunk_rows))
+
+
+def _steps(previous, chunk, exponent):
+    # parameter increments of the chunk's points; the first point steps
+    # from the last point of the previous chunk (or starts at 0)
+    joined = chunk if previous is None else np.concatenate((previous[None], chunk))
+    return np.linalg.norm(np.diff(joined, axis=0), axis=1) ** exponent
+
+
+def _chunks(chunks):
+    for chunk in chunks():
+        chunk = np.ascontiguousarray(chunk, dtype=np.float64)
+        if len(chunk):
+            yield chunk
+
+
+def measure(chunks, parameterization='chord'):
+    '''
+    number of points and total parameter length of a chunk stream
+    '''
+    exponent = PARAMETERIZATIONS[parameterization]
+    count, total, previous = 0, 0.0, None
+    for chunk in _chunks(chunks):
+        total += _steps(previous, chunk, exponent).sum()
+        count += len(chunk)
+        previous = chunk[-1]
+    return count, total
+
+
+def parameter_chunks(chunks, parameterization, total):
+    '''
+    yields (chunk, parameters in [0, 1]) with the same running sum the
+    measuring pass used
+    '''
+    exponent = PARAMETERIZATIONS[parameterization]
+    running, previous = 0.0, None
+    for chunk in _chunks(chunks):
+        steps = _steps(previous, chunk, exponent)
+        sums = running + np.cumsum(steps)
+        if previous is None:
+            sums = np.concatenate(([0.0], sums))
+        running = sums[-1]
+        previous = chunk[-1]
+        yield chunk, np.clip(sums / total, 0.0, 1.0)
+
+
+def accumulate(bands, columns, weights):
+    '''
+    adds the Gram matrix of rows whose non-zeros are weights at consecutive
+    columns into the upper form bands of solveh_banded
+    '''
+    upper, n = len(bands) - 1, bands.shape[1]
+    k = columns.shape[1]
+    for a in range(k):
+        for b in range(a, k):
+            bands[upper - (b - a)] += np.bincount(columns[:, b], weights[:, a] * weights[:, b], minlength=n)
+
+
+def approximate(source, count, degree=3, parameterization='chord', smoothing=0.0, knots=None, chunk_rows=CHUNK_ROWS):
+    '''
+    least-squares B-spline with count control points through a point stream\n
+    knots default to a clamped uniform vector on [0, 1]. smoothing > 0 adds
+    a penalty on the second differences of the control points, weighted by
+    the number of points per control point so the same value smooths alike
+    at any input size. Returns the BSpline and a ChunkResidual (start row,
+    rows, rms and max distance to the curve) per chunk
+    '''
+    from scipy.linalg import LinAlgError, solveh_banded
+
+    if parameterization not in PARAMETERIZATIONS:
+        raise ValueError(f'Unknown parameterization: {parameterization}')
+    if smoothing < 0:
+        raise ValueError('Smoothing must not be negative')
+    chunks = chunk_source(source, chunk_rows)
+    if knots is None:
+        if count <= degree:
+            raise ValueError('More control points than the degree are needed')
+        knots = generate_knots(count, degree, decimals=None)
+    evaluator = BSplineEvaluator(knots, degree)
+    n = evaluator.n
+    start, end = evaluator.domain
+
+    points, total = measure(chunks, parameterization)
+    if points == 0:
+        raise ValueError('No points to approximate')
+    if total == 0:
+        # every point in one place, spread them evenly instead
+        parameterization = 'uniform'
+        total = max(points - 1, 1)
+
+    penalize = smoothing > 0 and n >= 3
+    upper = max(degree, 2 if penalize else 0)
+    bands = np.zeros((upper + 1, n))
+    rhs = None
+    offsets = np.arange(degree + 1) - degree
+    for chunk, params in parameter_chunks(chunks, parameterization, total):
+        u = start + params * (end - start)
+        spans, values = evaluator.basis_functions(u)
+        columns = spans[:, None] + offsets
+        accumulate(bands, columns, values)
+        if rhs is None:
+            rhs = np.zeros((n, chunk.shape[1]))
+        for a in range(degree + 1):
+            for d in range(chunk.shape[1]):
+                rhs[:, d] += np.bincount(columns[:, a], values[:, a] * chunk[:, d], minlength=n)
+
+    if penalize:
+        rows = np.arange(n - 2)[:, None] + np.arange(3)
+        weight = np.sqrt(smoothing * points / n)
+        accumulate(bands, rows, np.broadcast_to(weight * np.array([1.0, -2.0, 1.0]), rows.shape))
+
+    try:
+        control_points = solveh_banded(bands, rhs, check_finite=False)
+    except LinAlgError:
+        raise ValueError('Some knot spans hold too few points, use fewer control points or add smoothing') from None
+    spline = BSpline(control_points, degree, knots)
+
+    residuals = []
+    row = 0
+    for chunk, params in parameter_chunks(chunks, parameterization, total):
+        distance = np.linalg.norm(spline.evaluate(start + params * (end - start)) - chunk, axis=1)
+        residuals.append(ChunkResidual(row, len(chunk), float(np.sqrt(np.mean(distance ** 2))), float(distance.max())))
+        row += len(chunk)
+    return spline, residuals
@@ -0,0 +1,150 @@
+'''
+arc-length parameterization of curves\n
+the speed |C'(u)| is integrated with Gauss-Legendre quadrature over every
+polynomial piece (knot span) once, halving the pieces where the rule is not
+accurate enough, giving a table of cumulative lengths at the breakpoints. A
+length is turned back into a parameter by a binary search in that table
+followed by Newton steps inside the piece, so evenly spaced points along
+the curve cost O(log n) each
+'''
+import numpy as np
+
+from .bezier import HORNER_MAX_DEGREE, de_casteljau, horner
+
+GAUSS_ORDER = 8
+# a piece is halved while its halves' lengths differ from the whole one by
+# more than this (relative), at most REFINE_DEPTH times
+REFINE_TOLERANCE = 1e-6
+REFINE_DEPTH = 8
+NEWTON_STEPS = 8
+# relative to the total length
+NEWTON_TOLERANCE = 1e-10
+# a Bezier curve is one polynomial piece, it is cut into this many for the table
+BEZIER_PIECES = 64
+# above this degree every speed evaluation is a full de Casteljau pass and a
+# table costs seconds
+ARC_LENGTH_MAX_DEGREE = 100
+
+
+class ArcLength:
+    '''
+    cumulative arc length of a curve given by its derivative (a vectorized
+    callable u -> (M, d)) and the breakpoints of its polynomial pieces
+    '''
+    def __init__(self, derivative, breaks, order=GAUSS_ORDER):
+        self.derivative = derivative
+        self.breaks = np.ascontiguousarray(breaks, dtype=np.float64)
+        if len(self.breaks) < 2:
+            raise ValueError('At least two breakpoints are needed')
+        nodes, weights = np.polynomial.legendre.leggauss(order)
+        # quadrature on [0, 1]
+        self.nodes = (nodes + 1.0) / 2.0
+        self.weights = weights / 2.0
+
+        # where the speed comes close to zero (near cusps) it is far from
+        # polynomial and those pieces are halved until the rule agrees with
+        # itself
+        starts, ends = self.breaks[:-1], self.breaks[1:]
+        lengths = self._integrate(starts, ends)
+        done_starts, done_lengths = [], []
+        for _ in range(REFINE_DEPTH):
+            mid = (starts + ends) / 2.0
+            left = self._integrate(starts, mid)
+            right = self._integrate(mid, ends)
+            split = np.abs(left + right - lengths) > REFINE_TOLERANCE * (left + right)
+            done_starts.append(starts[~split])
+            done_lengths.append(lengths[~split])
+            starts = np.concatenate((starts[split], mid[split]))
+            ends = np.concatenate((mid[split], ends[split]))
+            lengths = np.concatenate((left[split], right[split]))
+            if len(starts) == 0:
+                break
+        starts = np.concatenate(done_starts + [starts])
+        lengths = np.concatenate(done_lengths + [lengths])
+        order = np.argsort(starts, kind='stable')
+        self.breaks = np.append(starts[order], self.breaks[-1])
+        self.cumulative = np.concatenate(([0.0], np.cumsum(lengths[order])))
+
+    @property
+    def length(self):
+        return self.cumulative[-1]
+
+    @property
+    def domain(self):
+        return self.breaks[0], self.breaks[-1]
+
+    def speed(self, u):
+        return np.linalg.norm(self.derivative(u), axis=1)
+
+    def _integrate(self, start, u):
+        # length from every start up to u
+        width = u - start
+        nodes = start[:, None] + width[:, None] * self.nodes
+        speed = self.speed(nodes.ravel()).reshape(nodes.shape)
+        return width * (speed @ self.weights)
+
+    def _pieces(self, u):
+        return np.clip(np.searchsorted(self.breaks, u, side='right') - 1, 0, len(self.breaks) - 2)
+
+    def lengths(self, u):
+        '''
+        arc length from the start of the domain to every parameter in u
+        '''
+        u = np.clip(np.atleast_1d(np.asarray(u, dtype=np.float64)), *self.domain)
+        pieces = self._pieces(u)
+        return self.cumulative[pieces] + self._integrate(self.breaks[pieces], u)
+
+    def parameters(self, s):
+        '''
+        parameters at the arc lengths s (clipped to [0, length])
+        '''
+        s = np.clip(np.atleast_1d(np.asarray(s, dtype=np.float64)), 0.0, self.length)
+        pieces = np.clip(np.searchsorted(self.cumulative, s, side='right') - 1, 0, len(self.breaks) - 2)
+        lo = self.breaks[pieces]
+        hi = self.breaks[pieces + 1]
+        base = self.cumulative[pieces]
+        piece_length = self.cumulative[pieces + 1] - base
+        # linear guess inside the piece, then Newton on length(u) - s
+        fraction = np.divide(s - base, piece_length, out=np.zeros_like(s), where=piece_length > 0)
+        u = lo + fraction * (hi - lo)
+        tolerance = NEWTON_TOLERANCE * max(self.length, 1.0)
+        for _ in range(NEWTON_STEPS):
+            error = base + self._integrate(lo, u) - s
+            if np.abs(error).max(initial=0.0) <= tolerance:
+                break
+            speed = self.speed(u)
+            step = np.divide(error, speed, out=np.zeros_like(error), where=speed > 0)
+            u = np.clip(u - step, lo, hi)
+        return u
+
+    def uniform_parameters(self, count):
+        '''
+        count parameters evenly spaced along the curve, ends included
+        '''
+        if self.length == 0:
+            return np.linspace(*self.domain, count)
+        return self.parameters(np.linspace(0.0, self.length, count))
+
+
+def bspline_arc_length(spline, order=GAUSS_ORDER):
+    '''
+    table over the distinct knots of the spline's domain
+    '''
+    derivative = spline.derivative()
+    start, end = spline.domain
+    knots = spline.knots
+    breaks = np.unique(knots[(knots >= start) & (knots <= end)])
+    return ArcLength(derivative.evaluate, breaks, order)
+
+
+def bezier_arc_length(control_points, pieces=BEZIER_PIECES, order=GAUSS_ORDER):
+    points = np.ascontiguousarray(control_points, dtype=np.float64)
+    degree = len(points) - 1
+    hodograph = degree * np.diff(points, axis=0) if degree > 0 else np.zeros_like(points)
+
+    def derivative(ts):
+        if degree - 1 <= HORNER_MAX_DEGREE:
+            return horner(hodograph, ts)
+        return de_casteljau(hodograph, ts)
+
+    return ArcLength(derivative, np.linspace(0.0, 1.0, pieces + 1), order)
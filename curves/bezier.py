@@ -0,0 +1,178 @@
+from functools import lru_cache
+
+import numpy as np
+
+
+def de_casteljau(control_points, ts, return_levels=False):
+    '''
+    evaluate a Bezier curve at every parameter in ts at once\n
+    control_points: (N, d) array, ts: scalar or (M,) array\n
+    returns the (M, d) curve points and, if return_levels is set, the
+    (N, N, M, d) pyramid where levels[r, :N - r] holds the points of level r
+    (level 0 being the control points themselves)
+    '''
+    points = np.ascontiguousarray(control_points, dtype=np.float64)
+    if points.ndim != 2 or len(points) == 0:
+        raise ValueError('control_points must be a non-empty (N, d) array')
+    ts = np.atleast_1d(np.asarray(ts, dtype=np.float64))
+
+    n, dim = points.shape
+    m = len(ts)
+    t = ts[:, None]
+    s = 1.0 - t
+
+    if return_levels:
+        levels = np.zeros((n, n, m, dim))
+        levels[0] = points[:, None, :]
+        for r in range(1, n):
+            prev = levels[r - 1]
+            np.multiply(prev[:n - r], s, out=levels[r, :n - r])
+            levels[r, :n - r] += t * prev[1:n - r + 1]
+        return levels[n - 1, 0], levels
+
+    # two ping-pong buffers are enough when the pyramid is not needed
+    cur = np.empty((n, m, dim))
+    cur[:] = points[:, None, :]
+    tmp = np.empty_like(cur)
+    for r in range(1, n):
+        k = n - r
+        np.multiply(cur[:k], s, out=tmp[:k])
+        tmp[:k] += t * cur[1:k + 1]
+        cur, tmp = tmp, cur
+    return cur[0].copy()
+
+
+# above this degree the Horner form loses too many digits and we use de Casteljau
+HORNER_MAX_DEGREE = 30
+
+
+def bernstein_matrix(degree, ts):
+    '''
+    (M, degree + 1) matrix of Bernstein polynomials at the parameters ts,
+    built with the de Casteljau recurrence: only sums of non-negative terms,
+    no binomials, so the product with the control points is as accurate as
+    de Casteljau itself at any degree
+    '''
+    t = np.atleast_1d(np.asarray(ts, dtype=np.float64))[:, None]
+    s = 1.0 - t
+    basis = np.zeros((len(t), degree + 1))
+    basis[:, 0] = 1.0
+    for r in range(1, degree + 1):
+        basis[:, 1:r + 1] = s * basis[:, 1:r + 1] + t * basis[:, :r]
+        basis[:, 0:1] *= s
+    return basis
+
+
+@lru_cache(maxsize=32)
+def bernstein_basis(degree, samples):
+    '''
+    (samples, degree + 1) matrix of Bernstein polynomials on a uniform grid
+    over [0, 1]; cached per (degree, samples) and returned read-only
+    '''
+    basis = bernstein_matrix(degree, np.linspace(0, 1, samples))
+    basis.flags.writeable = False
+    return basis
+
+
+def horner(control_points, ts):
+    '''
+    evaluate the Bernstein form with a Horner scheme in t / (1 - t), switching
+    to (1 - t) / t on the upper half of the interval to keep the ratio <= 1
+    '''
+    points = np.ascontiguousarray(control_points, dtype=np.float64)
+    ts = np.atleast_1d(np.asarray(ts, dtype=np.float64))
+    n = len(points) - 1
+    out = np.empty((len(ts), points.shape[1]))
+    if n == 0:
+        out[:] = points[0]
+        return out
+
+    k = np.arange(n + 1)
+    binom = np.ones(n + 1)
+    binom[1:] = np.cumprod((n - k[:-1]) / (k[:-1] + 1))
+    coeffs = binom[:, None] * points
+
+    for mask, c, a, b in ((ts <= 0.5, coeffs, ts, 1.0 - ts),
+                          (ts > 0.5, coeffs[::-1], 1.0 - ts, ts)):
+        if not mask.any():
+            continue
+        ratio = (a[mask] / b[mask])[:, None]
+        acc = np.broadcast_to(c[n], (mask.sum(), points.shape[1])).copy()
+        for i in range(n - 1, -1, -1):
+            acc *= ratio
+            acc += c[i]
+        out[mask] = acc * (b[mask] ** n)[:, None]
+    return out
+
+
+def evaluate(control_points, samples=101, method='bernstein'):
+    '''
+    sample a Bezier curve on a uniform grid of samples parameters\n
+    method is 'bernstein' (cached basis matrix times the control points),
+    'horner' or 'casteljau'; Horner falls back to de Casteljau above
+    HORNER_MAX_DEGREE, the Bernstein basis needs no fallback
+    '''
+    points = np.ascontiguousarray(control_points, dtype=np.float64)
+    degree = len(points) - 1
+
+    if method == 'bernstein':
+        return bernstein_basis(degree, samples) @ points
+    elif method == 'horner':
+        if degree <= HORNER_MAX_DEGREE:
+            return horner(points, np.linspace(0, 1, samples))
+    elif method != 'casteljau':
+        raise ValueError(f'Unknown evaluation method: {method}')
+
+    return de_casteljau(points, np.linspace(0, 1, samples))
+
+
+def evaluate_many(control_points, samples=101, method='bernstein'):
+    '''
+    sample C Bezier curves of the same degree at once\n
+    control_points: (C, n + 1, d) tensor in any dimension d; every
+    coordinate of every curve becomes a column of one (n + 1, C * d) matrix,
+    so a single product with the cached basis (or one de Casteljau pass)
+    evaluates all of them; returns a (C, samples, d) transposed view of one
+    buffer
+    '''
+    points = np.asarray(control_points, dtype=np.float64)
+    if points.ndim != 3 or points.shape[1] == 0:
+        raise ValueError('control_points must be a non-empty (curves, N, dims) array')
+    curves, n, dim = points.shape
+    columns = points.transpose(1, 0, 2).reshape(n, curves * dim)
+    out = evaluate(columns, samples, method)
+    return out.reshape(samples, curves, dim).transpose(1, 0, 2)
+
+
+class Bezier:
+    '''
+    Bezier curve over [0, 1] with its control points held as a contiguous
+    float64 (n + 1, d) array
+    '''
+    def __init__(self, control_points):
+        self.control_points = np.ascontiguousarray(control_points, dtype=np.float64)
+        if self.control_points.ndim != 2 or len(self.control_points) == 0:
+            raise ValueError('control_points must be a non-empty (N, d) array')
+
+    @property
+    def degree(self):
+        return len(self.control_points) - 1
+
+    def evaluate(self, ts):
+        return de_casteljau(self.control_points, ts)
+
+    def sample(self, samples=101, method='bernstein'):
+        return evaluate(self.control_points, samples, method)
+
+    def construction(self, t):
+        '''
+        point at t and the list of intermediate de Casteljau polygons
+        '''
+        final, levels = de_casteljau(self.control_points, t, return_levels=True)
+        n = len(levels)
+        return final[0], [levels[r, :n - r, 0] for r in range(1, n)]
+
+    def derivative(self):
+        if self.degree == 0:
+            return Bezier(np.zeros_like(self.control_points))
+        return Bezier(self.degree * np.diff(self.control_points, axis=0))
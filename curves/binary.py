@@ -0,0 +1,76 @@
+'''
+compact binary curve container (.crv)\n
+a 64 byte little-endian header (magic, version, curve type, dtype, degree,
+point count, knot count, dimension) followed by the contiguous point array
+and the knot array; loading memory-maps both, so opening a file is O(1)
+and pages are only read when the data is used
+'''
+import struct
+
+import numpy as np
+
+from .loaders import CurveRecord, CurveFormatError
+
+EXTENSION = '.crv'
+MAGIC = b'CURVBIN\0'
+VERSION = 1
+HEADER = struct.Struct('<8sHBx4sIQQI')
+HEADER_SIZE = 64
+KINDS = ('bezier', 'bspline')
+DTYPE = np.dtype('<f8')
+
+
+def save_binary(path, record):
+    points = np.ascontiguousarray(record.points, dtype=DTYPE)
+    if points.ndim != 2:
+        raise ValueError('points must be an (N, d) array')
+    knots = np.empty(0, dtype=DTYPE) if record.knots is None else np.ascontiguousarray(record.knots, dtype=DTYPE)
+    # the header fields are unsigned, bad records are rejected before packing
+    if record.kind not in KINDS:
+        raise ValueError(f'unknown curve type {record.kind}')
+    if len(points) == 0:
+        raise ValueError('a curve needs at least one point')
+    if not 0 <= record.degree <= 0xFFFFFFFF:
+        raise ValueError(f'invalid degree {record.degree}')
+
+    header = HEADER.pack(MAGIC, VERSION, KINDS.index(record.kind), DTYPE.str.encode().ljust(4, b'\0'),
+                         record.degree, len(points), len(knots), points.shape[1])
+    with open(path, 'wb') as file:
+        file.write(header.ljust(HEADER_SIZE, b'\0'))
+        points.tofile(file)
+        knots.tofile(file)
+
+
+def read_header(path):
+    with open(path, 'rb') as file:
+        raw = file.read(HEADER_SIZE)
+    if len(raw) < HEADER_SIZE:
+        raise CurveFormatError('file too short for a curve header', path)
+    magic, version, kind, dtype, degree, count, knot_count, dim = HEADER.unpack_from(raw)
+    if magic != MAGIC:
+        raise CurveFormatError('not a binary curve file', path)
+    if version != VERSION:
+        raise CurveFormatError(f'unsupported binary curve version {version}', path)
+    if kind >= len(KINDS):
+        raise CurveFormatError(f'unknown curve type {kind}', path)
+    return {'kind': KINDS[kind], 'dtype': np.dtype(dtype.rstrip(b'\0').decode()), 'degree': degree,
+            'count': count, 'knot_count': knot_count, 'dim': dim}
+
+
+def load_binary(path, mode='c'):
+    '''
+    memory-map a .crv file; mode is passed to np.memmap ('c' gives
+    copy-on-write arrays that can be edited without touching the file,
+    'r' read-only)
+    '''
+    header = read_header(path)
+    dtype = header['dtype']
+    count, dim, knot_count = header['count'], header['dim'], header['knot_count']
+
+    points = np.empty((0, dim), dtype=dtype)
+    if count:
+        points = np.memmap(path, dtype=dtype, mode=mode, offset=HEADER_SIZE, shape=(count, dim))
+    knots = None
+    if knot_count:
+        knots = np.memmap(path, dtype=dtype, mode=mode, offset=HEADER_SIZE + count * dim * dtype.itemsize, shape=(knot_count,))
+    return CurveRecord(header['kind'], points, header['degree'], knots)
@@ -0,0 +1,176 @@
+import numpy as np
+
+
+class BSplineEvaluator:
+    '''
+    evaluates B-splines sharing one knot vector and degree\n
+    the Cox-de Boor recursion is run once per parameter grid to build a sparse
+    (samples, n) basis matrix; evaluating a curve is then a single sparse
+    matrix product, so x, y (and any number of curves stacked as extra
+    columns) go through one multiply
+    '''
+    def __init__(self, knots, degree):
+        self.knots = np.ascontiguousarray(knots, dtype=np.float64)
+        self.degree = int(degree)
+        self.n = len(self.knots) - self.degree - 1
+
+        if self.degree < 0:
+            raise ValueError('Degree must be positive')
+        if self.n < 1:
+            raise ValueError('Knot vector too short for the given degree')
+        if np.any(np.diff(self.knots) < 0):
+            raise ValueError('Knot vector must be non-decreasing')
+        if self.knots[self.degree] >= self.knots[self.n]:
+            raise ValueError('Knot vector has an empty parameter domain')
+
+        self._grid_key = None
+        self._basis = None
+
+    @property
+    def domain(self):
+        return self.knots[self.degree], self.knots[self.n]
+
+    def grid(self, samples):
+        start, end = self.domain
+        return np.linspace(start, end, samples, endpoint=True)
+
+    def find_spans(self, u):
+        # index i with knots[i] <= u < knots[i + 1], restricted to the valid
+        # spans so the end of the domain (and anything outside) uses the end
+        # polynomials, like splev's extrapolation
+        spans = np.searchsorted(self.knots, u, side='right') - 1
+        return np.clip(spans, self.degree, self.n - 1)
+
+    def basis_functions(self, u):
+        '''
+        non-zero basis values for every parameter: returns spans (M,) and the
+        (M, degree + 1) values of N[span - degree .. span]
+        '''
+        u = np.atleast_1d(np.asarray(u, dtype=np.float64))
+        p = self.degree
+        knots = self.knots
+        spans = self.find_spans(u)
+
+        # one row per basis function, so every step streams over contiguous memory
+        m = len(u)
+        values = np.empty((p + 1, m))
+        values[0] = 1.0
+        left = np.empty((p + 1, m))
+        right = np.empty((p + 1, m))
+        temp = np.empty(m)
+        for j in range(1, p + 1):
+            np.subtract(u, knots[spans + 1 - j], out=left[j])
+            np.subtract(knots[spans + j], u, out=right[j])
+            saved = np.zeros(m)
+            for r in range(j):
+                denom = right[r + 1] + left[j - r]
+                temp.fill(0.0)
+                np.divide(values[r], denom, out=temp, where=denom != 0)
+                np.multiply(right[r + 1], temp, out=values[r])
+                values[r] += saved
+                saved = left[j - r] * temp
+            values[j] = saved
+        return spans, np.ascontiguousarray(values.T)
+
+    def basis_matrix(self, u):
+        u = np.atleast_1d(np.asarray(u, dtype=np.float64))
+        key = (u.shape, u.tobytes())
+        if key == self._grid_key:
+            return self._basis
+
+        # scipy is only loaded once a spline is actually evaluated
+        from scipy import sparse
+
+        spans, values = self.basis_functions(u)
+        p = self.degree
+        columns = spans[:, None] - p + np.arange(p + 1)
+        indptr = np.arange(0, (len(u) + 1) * (p + 1), p + 1)
+        basis = sparse.csr_matrix((values.ravel(), columns.ravel(), indptr), shape=(len(u), self.n))
+
+        self._grid_key = key
+        self._basis = basis
+        return basis
+
+    def coefficients(self, coefficients):
+        # rows are control points; splev style [x, y] lists have to be
+        # transposed by the caller, their orientation is never guessed
+        c = np.asarray(coefficients, dtype=np.float64)
+        if c.ndim not in (1, 2) or c.shape[0] != self.n:
+            raise ValueError(f'coefficients must be an ({self.n},) or ({self.n}, dims) array')
+        return np.ascontiguousarray(c)
+
+    def evaluate(self, coefficients, u):
+        '''
+        coefficients: (n,) or (n, k) array with one control point per row,
+        u: parameters; returns an (M,) or (M, k) array
+        '''
+        return self.basis_matrix(u) @ self.coefficients(coefficients)
+
+    def evaluate_many(self, control_points, u):
+        '''
+        control_points: (C, n, d) tensor of C curves on this knot vector, in
+        any dimension d; all of them go through one product with the shared
+        basis matrix; the (C, M, d) samples are returned as a transposed
+        view of one (M, C, d) buffer
+        '''
+        c = np.asarray(control_points, dtype=np.float64)
+        if c.ndim != 3 or c.shape[1] != self.n:
+            raise ValueError(f'control_points must be a (curves, {self.n}, dims) array')
+        curves, n, dim = c.shape
+        # (n, C * d) columns: every coordinate of every curve is one right-hand side
+        out = self.basis_matrix(u) @ c.transpose(1, 0, 2).reshape(n, curves * dim)
+        return out.reshape(-1, curves, dim).transpose(1, 0, 2)
+
+
+def generate_knots(count, degree, decimals=2):
+    '''
+    clamped uniform knot vector for count control points, rounded to two
+    decimals like the knot field in the GUI (decimals=None keeps them exact,
+    rounding repeats knots past ~100 points)
+    '''
+    t = np.linspace(0, 1, count - degree + 1, endpoint=True)
+    t = np.concatenate(([0.0] * degree, t, [1.0] * degree))
+    return t if decimals is None else np.round(t, decimals=decimals)
+
+
+class BSpline:
+    '''
+    B-spline curve: contiguous float64 (n, d) control points, degree and knot
+    vector (a clamped uniform one is generated when none is given)
+    '''
+    def __init__(self, control_points, degree, knots=None):
+        self.control_points = np.ascontiguousarray(control_points, dtype=np.float64)
+        if self.control_points.ndim == 1:
+            self.control_points = self.control_points[:, None]
+        self.degree = int(degree)
+        if knots is None:
+            knots = generate_knots(len(self.control_points), self.degree)
+        self.knots = np.ascontiguousarray(knots, dtype=np.float64)
+        if len(self.knots) != len(self.control_points) + self.degree + 1:
+            raise ValueError('Number of knots must be equal to number of control points + degree + 1')
+        self.evaluator = BSplineEvaluator(self.knots, self.degree)
+
+    @property
+    def domain(self):
+        return self.evaluator.domain
+
+    def grid(self, samples):
+        return self.evaluator.grid(samples)
+
+    def evaluate(self, u):
+        return self.evaluator.evaluate(self.control_points, u)
+
+    def sample(self, samples=100):
+        return self.evaluate(self.grid(samples))
+
+    def knot_points(self):
+        return self.evaluate(self.knots[self.degree:len(self.knots) - self.degree])
+
+    def derivative(self):
+        p = self.degree
+        if p == 0:
+            raise ValueError('A degree 0 B-spline has no continuous derivative')
+        t = self.knots
+        span = t[p + 1:p + len(self.control_points)] - t[1:len(self.control_points)]
+        scale = np.divide(p, span, out=np.zeros_like(span), where=span != 0)
+        return BSpline(scale[:, None] * np.diff(self.control_points, axis=0), p - 1, t[1:-1])
@@ -0,0 +1,91 @@
+from collections import OrderedDict
+import hashlib
+import threading
+
+import numpy as np
+
+
+class CurveCache:
+    '''
+    bounded LRU cache for fitted splines (tck) and sampled curve arrays\n
+    keys are digests of the control points, degree, knot vector and sample
+    count; cached arrays are made read-only so callers cannot corrupt them,
+    and lookups are locked so background evaluation threads can share it
+    '''
+    def __init__(self, maxsize=64):
+        if maxsize < 1:
+            raise ValueError('Cache size must be at least 1')
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def make_key(kind, points, degree, knots=None, samples=None):
+        digest = hashlib.blake2b(digest_size=16)
+        digest.update(kind.encode())
+        for array in (points, knots):
+            if array is None:
+                digest.update(b'none')
+                continue
+            array = np.ascontiguousarray(array, dtype=np.float64)
+            digest.update(str(array.shape).encode())
+            digest.update(array.tobytes())
+        digest.update(repr((degree, samples)).encode())
+        return digest.hexdigest()
+
+    def get(self, key):
+        with self._lock:
+            if key in self._entries:
+                self.hits += 1
+                self._entries.move_to_end(key)
+                return self._entries[key]
+            self.misses += 1
+            return None
+
+    def put(self, key, value):
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def get_or_compute(self, key, compute):
+        value = self.get(key)
+        if value is None:
+            value = _freeze(compute())
+            self.put(key, value)
+        return value
+
+    def resize(self, maxsize):
+        if maxsize < 1:
+            raise ValueError('Cache size must be at least 1')
+        with self._lock:
+            self.maxsize = maxsize
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self):
+        return {'hits': self.hits, 'misses': self.misses, 'size': len(self._entries), 'maxsize': self.maxsize}
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, key):
+        return key in self._entries
+
+
+def _freeze(value):
+    if isinstance(value, np.ndarray):
+        value.flags.writeable = False
+    elif isinstance(value, (tuple, list)):
+        for item in value:
+            _freeze(item)
+    return value
@@ -0,0 +1,90 @@
+'''
+precomputed animation frames: for every parameter value the traced curve
+point and the full construction pyramid, stored in single arrays so playback
+only has to index into them
+'''
+from collections import namedtuple
+
+import numpy as np
+
+from .arclength import ARC_LENGTH_MAX_DEGREE, bezier_arc_length, bspline_arc_length
+from .bezier import de_casteljau
+
+# params (F,), curve (F, d), levels (F, L, L, d) where levels[i, r, :L - r]
+# holds the points of construction level r at frame i
+AnimationFrames = namedtuple('AnimationFrames', ['params', 'curve', 'levels'])
+
+
+# the de Casteljau pyramid grows with the square of the control point count,
+# above this size frames are built when they are shown instead of up front
+FRAME_MEMORY_LIMIT = 256 * 2 ** 20
+
+
+class LevelsOnDemand:
+    '''
+    stands in for the (F, L, L, d) levels array when it would not fit in
+    FRAME_MEMORY_LIMIT; indexing a frame runs its construction
+    '''
+    def __init__(self, control_points, params):
+        self.control_points = control_points
+        self.params = params
+
+    def __len__(self):
+        return len(self.params)
+
+    def __getitem__(self, index):
+        return de_casteljau(self.control_points, self.params[index:index + 1], return_levels=True)[1][:, :, 0]
+
+
+def bezier_frames(control_points, frames=101, max_bytes=FRAME_MEMORY_LIMIT, constant_speed=False):
+    '''
+    de Casteljau construction at frames uniformly spaced t in [0, 1], or
+    spaced evenly along the curve with constant_speed (up to
+    ARC_LENGTH_MAX_DEGREE)
+    '''
+    control_points = np.ascontiguousarray(control_points, dtype=np.float64)
+    n, dim = control_points.shape
+    if constant_speed and n - 1 <= ARC_LENGTH_MAX_DEGREE:
+        params = bezier_arc_length(control_points).uniform_parameters(frames)
+    else:
+        params = np.linspace(0, 1, frames)
+    if frames * n * n * dim * 8 > max_bytes:
+        return AnimationFrames(params, de_casteljau(control_points, params), LevelsOnDemand(control_points, params))
+    curve, levels = de_casteljau(control_points, params, return_levels=True)
+    return AnimationFrames(params, curve, np.ascontiguousarray(levels.transpose(2, 0, 1, 3)))
+
+
+def de_boor_levels(spline, u):
+    '''
+    de Boor construction for every parameter in u; level 0 holds the
+    degree + 1 control points that influence the span, level r the points
+    after r rounds of interpolation, so levels[:, degree, 0] is the curve
+    '''
+    u = np.atleast_1d(np.asarray(u, dtype=np.float64))
+    p = spline.degree
+    t = spline.knots
+    points = spline.control_points
+    spans = spline.evaluator.find_spans(u)
+
+    levels = np.zeros((len(u), p + 1, p + 1, points.shape[1]))
+    d = points[spans[:, None] - p + np.arange(p + 1)]
+    levels[:, 0] = d
+    for r in range(1, p + 1):
+        for j in range(p, r - 1, -1):
+            left = t[spans + j - p]
+            right = t[spans + j + 1 - r]
+            denom = right - left
+            alpha = np.divide(u - left, denom, out=np.zeros(len(u)), where=denom != 0)[:, None]
+            d[:, j] = (1.0 - alpha) * d[:, j - 1] + alpha * d[:, j]
+        levels[:, r, :p + 1 - r] = d[:, r:]
+    return levels
+
+
+def bspline_frames(spline, frames=100, constant_speed=False):
+    # a degree 0 spline jumps between its control points, it has no length
+    if constant_speed and spline.degree > 0:
+        params = bspline_arc_length(spline).uniform_parameters(frames)
+    else:
+        params = spline.grid(frames)
+    levels = de_boor_levels(spline, params)
+    return AnimationFrames(params, levels[:, spline.degree, 0].copy(), levels)
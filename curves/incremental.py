@@ -0,0 +1,85 @@
+'''
+sampled curves that stay cheap to update while control points are edited\n
+the basis at the sample parameters is computed once and kept together with
+the sampled points; moving a control point only touches the samples it
+influences
+'''
+import numpy as np
+
+from .bezier import bernstein_matrix
+
+
+class IncrementalBSpline:
+    '''
+    samples of a B-spline at fixed, non-decreasing parameters\n
+    spans and the degree + 1 non-zero basis values of every sample are kept,
+    so moving control point i re-evaluates only the samples in
+    [knots[i], knots[i + degree + 1]), in O(degree) each
+    '''
+    def __init__(self, spline, params, samples=None):
+        self.evaluator = spline.evaluator
+        self.degree = spline.degree
+        self.control_points = np.array(spline.control_points, dtype=np.float64)
+        self.params = np.ascontiguousarray(params, dtype=np.float64)
+        self.spans, self.values = self.evaluator.basis_functions(self.params)
+        if samples is None:
+            self.samples = np.empty((len(self.params), self.control_points.shape[1]))
+            self.evaluate_rows(0, len(self.params))
+        else:
+            self.samples = np.array(samples, dtype=np.float64)
+
+    def rows(self, index):
+        # samples whose span lies in [index, index + degree] use control point index
+        lo = np.searchsorted(self.spans, index, side='left')
+        hi = np.searchsorted(self.spans, index + self.degree, side='right')
+        return lo, hi
+
+    def evaluate_rows(self, lo, hi):
+        p = self.degree
+        columns = self.spans[lo:hi, None] - p + np.arange(p + 1)
+        self.samples[lo:hi] = np.einsum('mk,mkd->md', self.values[lo:hi], self.control_points[columns])
+
+    def move(self, indices, points):
+        '''
+        sets control_points[indices] = points and updates the affected
+        samples; returns the (lo, hi) row range that changed
+        '''
+        indices = np.atleast_1d(np.asarray(indices, dtype=np.intp))
+        self.control_points[indices] = points
+        changed = np.array([self.rows(index) for index in np.unique(indices)])
+        # neighbouring control points share most of their samples
+        start, stop = changed[0]
+        for lo, hi in changed[1:]:
+            if lo > stop:
+                self.evaluate_rows(start, stop)
+                start = lo
+            stop = max(stop, hi)
+        self.evaluate_rows(start, stop)
+        return changed[:, 0].min(), changed[:, 1].max()
+
+
+class IncrementalBezier:
+    '''
+    samples of a Bezier curve at fixed parameters\n
+    every sample depends on every control point, but the Bernstein basis at
+    the parameters is kept, so moving k points costs O(samples * k) instead
+    of a full O(samples * degree) evaluation
+    '''
+    def __init__(self, control_points, params, samples=None):
+        self.control_points = np.array(control_points, dtype=np.float64)
+        self.params = np.ascontiguousarray(params, dtype=np.float64)
+        self.basis = bernstein_matrix(len(self.control_points) - 1, self.params)
+        if samples is not None:
+            self.samples = np.array(samples, dtype=np.float64)
+        else:
+            self.samples = self.evaluate()
+
+    def evaluate(self):
+        return self.basis @ self.control_points
+
+    def move(self, indices, points):
+        indices = np.atleast_1d(np.asarray(indices, dtype=np.intp))
+        delta = np.asarray(points, dtype=np.float64).reshape(len(indices), -1) - self.control_points[indices]
+        self.control_points[indices] += delta
+        self.samples += self.basis[:, indices] @ delta
+        return 0, len(self.samples)
@@ -0,0 +1,89 @@
+'''
+global B-spline interpolation through data points\n
+every point gets a parameter (chord-length, centripetal or uniform), the
+knots are averages of degree consecutive parameters, and the control
+points solve the collocation system N c = points. With averaged knots N
+has at most degree non-zero diagonals on each side of the main one, so
+the system is solved as a banded one in O(n * degree^2)
+'''
+import numpy as np
+
+from .bspline import BSpline, BSplineEvaluator
+
+# exponent applied to the distances between consecutive points
+PARAMETERIZATIONS = {'chord': 1.0, 'centripetal': 0.5, 'uniform': 0.0}
+
+
+def parameterize(points, method='chord'):
+    '''
+    non-decreasing parameters in [0, 1], one per point
+    '''
+    if method not in PARAMETERIZATIONS:
+        raise ValueError(f'Unknown parameterization: {method}')
+    points = np.asarray(points, dtype=np.float64)
+    steps = np.linalg.norm(np.diff(points, axis=0), axis=1) ** PARAMETERIZATIONS[method]
+    total = steps.sum()
+    if total == 0:
+        return np.linspace(0.0, 1.0, len(points))
+    params = np.concatenate(([0.0], np.cumsum(steps) / total))
+    params[-1] = 1.0
+    return params
+
+
+def averaged_knots(params, degree):
+    '''
+    clamped knot vector whose interior knots are the means of degree
+    consecutive parameters (skipping the first and last one)
+    '''
+    n = len(params)
+    sums = np.concatenate(([0.0], np.cumsum(params)))
+    # knot j + degree is the mean of params[j:j + degree], j = 1 .. n - degree - 1
+    j = np.arange(1, n - degree)
+    inner = (sums[j + degree] - sums[j]) / degree
+    return np.concatenate((np.zeros(degree + 1), inner, np.ones(degree + 1)))
+
+
+def collocation_bands(evaluator, params):
+    '''
+    the collocation matrix in the diagonal ordered form of solve_banded:
+    returns (lower, upper) and the (lower + upper + 1, n) bands
+    '''
+    spans, values = evaluator.basis_functions(params)
+    p = evaluator.degree
+    columns = spans[:, None] - p + np.arange(p + 1)
+    offsets = columns - np.arange(len(params))[:, None]
+    # only the non-zeros decide the band, clamped ends store a few zeros
+    # outside of it
+    nonzero = values != 0
+    lower = max(-offsets.min(initial=0, where=nonzero), 0)
+    upper = max(offsets.max(initial=0, where=nonzero), 0)
+    bands = np.zeros((lower + upper + 1, evaluator.n))
+    bands.ravel()[((upper - offsets) * evaluator.n + columns)[nonzero]] = values[nonzero]
+    return (lower, upper), bands
+
+
+def interpolate(points, degree=3, parameterization='chord'):
+    '''
+    B-spline of the given degree passing through every point\n
+    points: (n, d) array with n > degree; returns the BSpline and the
+    parameters of the points on it
+    '''
+    from scipy.linalg import solve_banded
+
+    points = np.ascontiguousarray(points, dtype=np.float64)
+    if points.ndim != 2:
+        raise ValueError('points must be an (n, d) array')
+    degree = int(degree)
+    if degree < 1:
+        raise ValueError('Degree must be at least 1')
+    if len(points) <= degree:
+        raise ValueError('Not enough points for the given degree')
+
+    params = parameterize(points, parameterization)
+    if np.any(np.diff(params) <= 0):
+        raise ValueError('Consecutive points must be distinct')
+    knots = averaged_knots(params, degree)
+    evaluator = BSplineEvaluator(knots, degree)
+    bandwidth, bands = collocation_bands(evaluator, params)
+    control_points = solve_banded(bandwidth, bands, points, overwrite_ab=True, check_finite=False)
+    return BSpline(control_points, degree, knots), params
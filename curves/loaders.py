@@ -0,0 +1,176 @@
+'''
+parsers for the TXT and JSON curve files in data/\n
+B-spline TXT: "(x, y), (x, y), ..." on line 1, the degree on line 2 and an
+optional knot vector on line 3\n
+Bezier TXT: one "x y" pair per line\n
+B-spline JSON: {"points": "[(x, y), ...]", "degree": p, "knots": "..." | "None"}\n
+Bezier JSON: {"points": [{"x": .., "y": ..}, ...]}
+'''
+from collections import namedtuple
+import json
+import re
+
+import numpy as np
+
+CurveRecord = namedtuple('CurveRecord', ['kind', 'points', 'degree', 'knots'])
+
+CHUNK_ROWS = 1 << 20
+
+_POINT_SEPARATORS = str.maketrans('()[],', '     ')
+
+
+class CurveFormatError(ValueError):
+    def __init__(self, message, path=None, lineno=None):
+        self.path = path
+        self.lineno = lineno
+        location = ':'.join(str(part) for part in (path, lineno) if part is not None)
+        super().__init__(f'{location}: {message}' if location else message)
+
+
+def _to_floats(tokens, lineno, path=None):
+    try:
+        return np.array(tokens, dtype=np.float64)
+    except ValueError:
+        for token in tokens:
+            try:
+                float(token)
+            except ValueError:
+                raise CurveFormatError(f'invalid number {token!r}', path, lineno) from None
+        raise
+
+
+def parse_points_string(text, lineno=1, path=None):
+    '''
+    "(x, y), (x, y)" or "[(x,y),(x,y)]" -> (N, 2) float64 array
+    '''
+    opens = text.count('(')
+    if opens == 0 or opens != text.count(')'):
+        raise CurveFormatError('points must be written as (x, y) pairs', path, lineno)
+    values = _to_floats(text.translate(_POINT_SEPARATORS).split(), lineno, path)
+    if len(values) != 2 * opens:
+        raise CurveFormatError(f'expected 2 coordinates per point, got {len(values)} values for {opens} points', path, lineno)
+    return values.reshape(-1, 2)
+
+
+def parse_knots(text, lineno=1, path=None):
+    return _to_floats(text.split(), lineno, path)
+
+
+def parse_degree(value, lineno=1, path=None):
+    try:
+        degree = int(str(value).strip())
+    except ValueError:
+        raise CurveFormatError(f'invalid degree {value!r}', path, lineno) from None
+    if degree < 0:
+        raise CurveFormatError('Degree must be positive', path, lineno)
+    return degree
+
+
+def _first_line(path):
+    with open(path, 'r') as file:
+        for line in file:
+            if line.strip():
+                return line.strip()
+    return ''
+
+
+def load_bspline_txt(path):
+    with open(path, 'r') as file:
+        lines = [(lineno, line.strip()) for lineno, line in enumerate(file, 1) if line.strip()]
+    if len(lines) < 2:
+        raise CurveFormatError('expected a points line and a degree line', path, len(lines) + 1)
+
+    points = parse_points_string(lines[0][1], lines[0][0], path)
+    degree = parse_degree(lines[1][1], lines[1][0], path)
+    knots = parse_knots(lines[2][1], lines[2][0], path) if len(lines) > 2 else None
+    return CurveRecord('bspline', points, degree, knots)
+
+
+def iter_point_chunks(path, chunk_rows=CHUNK_ROWS):
+    '''
+    stream an "x y" per line file as (rows, 2) float64 chunks, so files
+    larger than memory can be processed piecewise
+    '''
+    with open(path, 'r') as file:
+        lineno = 0
+        while True:
+            chunk_lines = []
+            linenos = []
+            for line in file:
+                lineno += 1
+                if line.strip():
+                    chunk_lines.append(line)
+                    linenos.append(lineno)
+                    if len(chunk_lines) == chunk_rows:
+                        break
+            if not chunk_lines:
+                return
+            try:
+                chunk = np.loadtxt(chunk_lines, dtype=np.float64, ndmin=2)
+            except ValueError as e:
+                raise CurveFormatError(str(e), path, _error_line(str(e), linenos)) from None
+            if chunk.shape[1] != 2:
+                raise CurveFormatError(f'expected 2 columns, got {chunk.shape[1]}', path, linenos[0])
+            yield chunk
+
+
+def _error_line(message, linenos):
+    # loadtxt reports the row within the chunk (1-based only for column count
+    # errors); map it back to the file line
+    match = re.search(r'row (\d+)', message)
+    if match is None:
+        return None
+    row = int(match.group(1)) - ('columns changed' in message)
+    return linenos[row] if 0 <= row < len(linenos) else None
+
+
+def load_bezier_txt(path, chunk_rows=CHUNK_ROWS):
+    chunks = list(iter_point_chunks(path, chunk_rows))
+    points = np.concatenate(chunks) if chunks else np.empty((0, 2))
+    return CurveRecord('bezier', points, len(points) - 1, None)
+
+
+def _key_line(text, key):
+    match = re.search(r'"' + key + r'"\s*:', text)
+    return text.count('\n', 0, match.start()) + 1 if match else None
+
+
+def load_json(path):
+    with open(path, 'r') as file:
+        text = file.read()
+    try:
+        data = json.loads(text)
+    except json.JSONDecodeError as e:
+        raise CurveFormatError(e.msg, path, e.lineno) from None
+
+    if not isinstance(data, dict) or 'points' not in data:
+        raise CurveFormatError('JSON file does not contain points', path)
+    points = data['points']
+
+    if isinstance(points, str):
+        if 'degree' not in data:
+            raise CurveFormatError('JSON file does not contain points or degree', path)
+        knots = data.get('knots')
+        if knots is not None and knots != 'None':
+            knots = parse_knots(knots, _key_line(text, 'knots'), path)
+        else:
+            knots = None
+        return CurveRecord('bspline', parse_points_string(points, _key_line(text, 'points'), path),
+                           parse_degree(data['degree'], _key_line(text, 'degree'), path), knots)
+
+    try:
+        array = np.array([(point['x'], point['y']) for point in points], dtype=np.float64).reshape(-1, 2)
+    except (KeyError, TypeError, ValueError):
+        raise CurveFormatError('points must be objects with numeric "x" and "y"', path, _key_line(text, 'points')) from None
+    return CurveRecord('bezier', array, len(array) - 1, None)
+
+
+def load_curve(path):
+    if path.lower().endswith('.crv'):
+        from .binary import load_binary
+        return load_binary(path)
+    if path.lower().endswith('.json'):
+        return load_json(path)
+    if _first_line(path).startswith(('(', '[')):
+        return load_bspline_txt(path)
+    return load_bezier_txt(path)
@@ -0,0 +1,110 @@
+'''
+level-of-detail decimation of long polylines for display\n
+everything works in pixel coordinates: runs of vertices within one pixel
+column are reduced to their first, extreme and last vertices and stretches
+outside the viewport are dropped, so the result draws the same pixels but
+stays small however many points the full data has
+'''
+import numpy as np
+
+# polylines with at most this many vertices are drawn as they are
+LOD_THRESHOLD = 5000
+# markers closer than this (in pixels) overlap almost completely, only one is drawn
+MARKER_SPACING = 2
+
+
+def visible_vertices(pixels, viewport):
+    '''
+    mask of the vertices that belong to a segment touching the viewport
+    (x0, y0, x1, y1); a segment is kept when its bounding box intersects it
+    '''
+    x0, y0, x1, y1 = viewport
+    keep = np.zeros(len(pixels), dtype=bool)
+    if len(pixels) == 1:
+        keep[0] = x0 <= pixels[0, 0] <= x1 and y0 <= pixels[0, 1] <= y1
+        return keep
+    a, b = pixels[:-1], pixels[1:]
+    lo = np.minimum(a, b)
+    hi = np.maximum(a, b)
+    segments = (lo[:, 0] <= x1) & (hi[:, 0] >= x0) & (lo[:, 1] <= y1) & (hi[:, 1] >= y0)
+    keep[:-1] |= segments
+    keep[1:] |= segments
+    return keep
+
+
+def decimate_polyline(points, pixels, viewport, markers=False, marker_spacing=MARKER_SPACING):
+    '''
+    display version of the polyline points, given their pixel positions and
+    the viewport in pixels\n
+    M4 per pixel column: of every run of consecutive vertices in the same
+    column only the first, lowest, highest and last are kept, in drawing
+    order, so x-monotone data (traces, sampled functions) shrinks to at most
+    four vertices per column and a curve folding back over itself still
+    draws the same pixels. NaN rows separate visible pieces; with markers a
+    boolean mask selecting one vertex per marker_spacing pixel cell is
+    returned as well, for Line2D.set_markevery
+    '''
+    points = np.asarray(points, dtype=np.float64)
+    n = len(points)
+    if n == 0:
+        return (points, np.zeros(0, dtype=bool)) if markers else points
+
+    keep = visible_vertices(pixels, viewport)
+    finite = np.isfinite(pixels).all(axis=1)
+    keep &= finite
+    pixels = np.where(finite[:, None], pixels, 0)
+
+    # a run ends where the column changes or the line leaves the viewport
+    column = np.floor(pixels[:, 0]).astype(np.int64)
+    change = np.ones(n + 1, dtype=bool)
+    change[1:-1] = (column[1:] != column[:-1]) | (keep[1:] != keep[:-1])
+    starts = np.flatnonzero(change[:-1])
+    run = np.cumsum(change[:-1]) - 1
+    y = pixels[:, 1]
+    lowest = _first_where(y == np.minimum.reduceat(y, starts)[run], run, len(starts))
+    highest = _first_where(y == np.maximum.reduceat(y, starts)[run], run, len(starts))
+
+    selected = change[:-1] | change[1:]
+    selected[lowest] = True
+    selected[highest] = True
+    if markers:
+        # every marker cell keeps a vertex to carry its marker
+        visible = np.flatnonzero(keep)
+        cells = visible[np.unique(_cell_keys(pixels[visible], marker_spacing), return_index=True)[1]]
+        selected[cells] = True
+    selected &= keep
+    index = np.flatnonzero(selected)
+
+    # break the line wherever hidden vertices were skipped
+    hidden = np.cumsum(~keep)
+    breaks = np.flatnonzero(hidden[index[1:]] != hidden[index[:-1]]) + 1
+    out = np.insert(points[index], breaks, np.nan, axis=0)
+    if not markers:
+        return out
+
+    mask = np.zeros(len(out), dtype=bool)
+    inside = _inside(pixels[index], viewport)
+    first = np.unique(_cell_keys(pixels[index], marker_spacing), return_index=True)[1]
+    marked = np.zeros(len(index), dtype=bool)
+    marked[first] = True
+    marked &= inside
+    mask[np.arange(len(index)) + np.searchsorted(breaks, np.arange(len(index)), side='right')] = marked
+    return out, mask
+
+
+def _first_where(condition, run, runs):
+    # index of the first vertex of every run where condition holds
+    index = np.flatnonzero(condition)
+    first = np.full(runs, -1)
+    first[run[index][::-1]] = index[::-1]
+    return first[first >= 0]
+
+
+def _cell_keys(pixels, size):
+    cells = np.floor(pixels / size).astype(np.int64)
+    return (cells[:, 0] << 32) ^ (cells[:, 1] & 0xffffffff)
+
+
+def _inside(pixels, viewport):
+    x0, y0, x1, y1 = viewport
+    return (pixels[:, 0] >= x0) & (pixels[:, 0] <= x1) & (pixels[:, 1] >= y0) & (pixels[:, 1] <= y1)
@@ -0,0 +1,173 @@
+'''
+process-pool evaluation of very large B-splines\n
+the parameters are cut into contiguous chunks at knot span boundaries and
+every worker evaluates its chunk with the local knots and the control points
+of those spans (plus the degree overlapping ones). Control points, knots,
+parameters and results live in shared memory, only chunk bounds are pickled
+'''
+import os
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from .adaptive import MAX_DEPTH, PIXEL_TOLERANCE, adaptive_bspline
+from .bspline import BSplineEvaluator
+
+# below this many control points (or samples) starting processes costs more
+# than it saves
+PARALLEL_MIN_POINTS = 200000
+# chunks per worker, so uneven spans still keep every worker busy
+CHUNKS_PER_WORKER = 4
+
+
+def default_workers():
+    return os.cpu_count() or 1
+
+
+def span_chunks(spans, count):
+    '''
+    (start, stop) index ranges splitting the sorted spans into about count
+    pieces, cutting only where the span changes
+    '''
+    m = len(spans)
+    targets = np.linspace(0, m, count + 1).astype(int)[1:-1]
+    # move every cut back to the first sample of its span
+    cuts = np.unique(np.searchsorted(spans, spans[targets], side='left'))
+    bounds = np.concatenate(([0], cuts[cuts > 0], [m]))
+    return list(zip(bounds[:-1], bounds[1:]))
+
+
+class SharedArrays:
+    '''
+    numpy arrays copied into shared memory blocks; specs() is what workers
+    need to attach, close() releases (and unlinks) the blocks
+    '''
+    def __init__(self, **arrays):
+        self.blocks = []
+        self.arrays = {}
+        self._specs = {}
+        for name, array in arrays.items():
+            array = np.asarray(array)
+            block = shared_memory.SharedMemory(create=True, size=max(array.nbytes, 1))
+            self.blocks.append(block)
+            view = np.ndarray(array.shape, array.dtype, buffer=block.buf)
+            view[...] = array
+            self.arrays[name] = view
+            self._specs[name] = (block.name, array.shape, array.dtype.str)
+
+    def add_empty(self, name, shape, dtype=np.float64):
+        dtype = np.dtype(dtype)
+        block = shared_memory.SharedMemory(create=True, size=max(int(np.prod(shape)) * dtype.itemsize, 1))
+        self.blocks.append(block)
+        self.arrays[name] = np.ndarray(shape, dtype, buffer=block.buf)
+        self._specs[name] = (block.name, shape, dtype.str)
+        return self.arrays[name]
+
+    def specs(self):
+        return dict(self._specs)
+
+    def close(self):
+        self.arrays = {}
+        for block in self.blocks:
+            block.close()
+            block.unlink()
+        self.blocks = []
+
+
+def attach(specs):
+    blocks = []
+    arrays = {}
+    for name, (block_name, shape, dtype) in specs.items():
+        block = shared_memory.SharedMemory(name=block_name)
+        blocks.append(block)
+        arrays[name] = np.ndarray(shape, dtype, buffer=block.buf)
+    return blocks, arrays
+
+
+def _local_evaluator(arrays, degree, first, last):
+    # spans first..last need basis functions first - degree..last, which
+    # only depend on knots[first - degree:last + degree + 2]
+    knots = arrays['knots'][first - degree:last + degree + 2]
+    return BSplineEvaluator(knots, degree), arrays['points'][first - degree:last + 1]
+
+
+def _evaluate_chunk(task):
+    specs, degree, start, stop, first, last = task
+    blocks, arrays = attach(specs)
+    try:
+        evaluator, points = _local_evaluator(arrays, degree, first, last)
+        arrays['out'][start:stop] = evaluator.evaluate(points, arrays['u'][start:stop])
+    finally:
+        del arrays
+        for block in blocks:
+            block.close()
+
+
+def _adaptive_chunk(task):
+    specs, degree, first, last, tolerance, matrix, max_depth = task
+    blocks, arrays = attach(specs)
+    try:
+        evaluator, points = _local_evaluator(arrays, degree, first, last)
+        return adaptive_bspline(evaluator, np.array(points), tolerance, matrix, max_depth)
+    finally:
+        del arrays
+        for block in blocks:
+            block.close()
+
+
+def _run(fn, tasks, workers, executor):
+    if executor is not None:
+        return list(executor.map(fn, tasks))
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(fn, tasks))
+
+
+def evaluate_parallel(spline, u, workers=None, executor=None):
+    '''
+    spline.evaluate(u) for non-decreasing parameters u, spread over worker
+    processes; an existing executor can be passed to skip process startup
+    '''
+    workers = workers or default_workers()
+    u = np.ascontiguousarray(u, dtype=np.float64)
+    spans = spline.evaluator.find_spans(u)
+    chunks = span_chunks(spans, workers * CHUNKS_PER_WORKER)
+    if workers == 1 or len(chunks) == 1:
+        return spline.evaluate(u)
+
+    shared = SharedArrays(points=spline.control_points, knots=spline.knots, u=u)
+    try:
+        out = shared.add_empty('out', (len(u), spline.control_points.shape[1]))
+        specs = shared.specs()
+        tasks = [(specs, spline.degree, start, stop, spans[start], spans[stop - 1]) for start, stop in chunks]
+        _run(_evaluate_chunk, tasks, workers, executor)
+        return out.copy()
+    finally:
+        shared.close()
+
+
+def adaptive_parallel(spline, tolerance=PIXEL_TOLERANCE, matrix=None, max_depth=MAX_DEPTH, workers=None, executor=None):
+    '''
+    adaptive_bspline split by knot spans over worker processes; every span
+    is refined on its own, so the result is the same as the serial one
+    '''
+    workers = workers or default_workers()
+    p = spline.degree
+    spans = np.arange(p, len(spline.control_points))
+    spans = spans[spline.knots[spans] < spline.knots[spans + 1]]
+    chunks = span_chunks(spans, workers * CHUNKS_PER_WORKER)
+    if workers == 1 or len(chunks) == 1:
+        return adaptive_bspline(spline.evaluator, spline.control_points, tolerance, matrix, max_depth)
+
+    shared = SharedArrays(points=spline.control_points, knots=spline.knots)
+    try:
+        specs = shared.specs()
+        tasks = [(specs, p, spans[a], spans[b - 1], tolerance, matrix, max_depth) for a, b in chunks]
+        results = _run(_adaptive_chunk, tasks, workers, executor)
+    finally:
+        shared.close()
+
+    # neighbouring chunks share their boundary parameter
+    params = np.concatenate([u[:-1] for u, values in results[:-1]] + [results[-1][0]])
+    values = np.concatenate([values[:-1] for u, values in results[:-1]] + [results[-1][1]])
+    return params, values
@@ -0,0 +1,112 @@
+from PyQt5.QtCore import QObject, QTimer, Qt, pyqtSignal
+
+DEFAULT_FPS = 50
+
+
+class FrameAnimator(QObject):
+    '''
+    plays precomputed AnimationFrames on a matplotlib canvas\n
+    level_lines[k] shows construction level first_level + k, trace_line the
+    curve traced so far; all of them should be created with animated=True.
+    Static artists are rendered once into a saved background and every frame
+    only the animated artists are blitted over it
+    '''
+    frameChanged = pyqtSignal(int)
+
+    def __init__(self, canvas, frames, level_lines, first_level=0, trace_line=None, fps=DEFAULT_FPS, loop=True, parent=None):
+        super().__init__(parent)
+        self.canvas = canvas
+        self.frames = frames
+        self.level_lines = level_lines
+        self.first_level = first_level
+        self.trace_line = trace_line
+        self.loop = loop
+        self.index = 0
+        self.background = None
+
+        self.artists = list(level_lines)
+        if trace_line is not None:
+            self.artists.append(trace_line)
+
+        self.timer = QTimer(self)
+        self.timer.setTimerType(Qt.PreciseTimer)
+        self.timer.timeout.connect(self.next_frame)
+        self.set_fps(fps)
+        self.connect_canvas()
+
+    def connect_canvas(self):
+        self.draw_cid = self.canvas.mpl_connect('draw_event', self.on_draw)
+
+    def disconnect_canvas(self):
+        self.canvas.mpl_disconnect(self.draw_cid)
+
+    @property
+    def frame_count(self):
+        return len(self.frames.params)
+
+    def set_fps(self, fps):
+        self.fps = max(1, fps)
+        self.timer.setInterval(round(1000 / self.fps))
+
+    def is_playing(self):
+        return self.timer.isActive()
+
+    def play(self):
+        if not self.loop and self.index == self.frame_count - 1:
+            self.index = 0
+        self.timer.start()
+
+    def pause(self):
+        self.timer.stop()
+
+    def toggle(self):
+        if self.is_playing():
+            self.pause()
+        else:
+            self.play()
+
+    def seek(self, index):
+        self.index = min(max(int(index), 0), self.frame_count - 1)
+        self.update_artists()
+        self.blit()
+        self.frameChanged.emit(self.index)
+
+    def next_frame(self):
+        index = self.index + 1
+        if index >= self.frame_count:
+            if not self.loop:
+                self.pause()
+                return
+            index = 0
+        self.seek(index)
+
+    def update_artists(self):
+        levels = self.frames.levels[self.index]
+        size = levels.shape[0]
+        for k, line in enumerate(self.level_lines):
+            r = self.first_level + k
+            points = levels[r, :size - r]
+            line.set_data(points[:, 0], points[:, 1])
+        if self.trace_line is not None:
+            trace = self.frames.curve[:self.index + 1]
+            self.trace_line.set_data(trace[:, 0], trace[:, 1])
+
+    def on_draw(self, event):
+        self.background = self.canvas.copy_from_bbox(self.canvas.figure.bbox)
+        self.draw_artists()
+
+    def draw_artists(self):
+        for artist in self.artists:
+            artist.axes.draw_artist(artist)
+
+    def blit(self):
+        if self.background is None:
+            self.canvas.draw_idle()
+            return
+        self.canvas.restore_region(self.background)
+        self.draw_artists()
+        self.canvas.blit(self.canvas.figure.bbox)
+
+    def close(self):
+        self.pause()
+        self.disconnect_canvas()
@@ -1,13 +1,40 @@
-from PyQt5.QtWidgets import QApplication, QWidget, QPushButton, QVBoxLayout, QHBoxLayout, QComboBox, QLineEdit, QLabel, QInputDialog, QScrollArea, QErrorMessage, QSlider, QFileDialog
+from PyQt5.QtWidgets import QApplication, QWidget, QPushButton, QVBoxLayout, QHBoxLayout, QComboBox, QLabel, QInputDialog, QErrorMessage, QSlider, QFileDialog, QProgressBar, QSpinBox, QCheckBox
 from PyQt5.QtCore import Qt
 import matplotlib
-import matplotlib.pyplot as plt
 matplotlib.use('Qt5Agg')
-from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg
+from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg, NavigationToolbar2QT
 from matplotlib.figure import Figure
 import numpy as np
 import random
-import json
+
+from curves import bezier, binary, loaders
+from curves.adaptive import adaptive_bezier, pixel_matrix
+from curves.frames import FRAME_MEMORY_LIMIT, bezier_frames
+from curves.incremental import IncrementalBezier
+from curves.lod import LOD_THRESHOLD
+from .pointsTable import PointsTableModel, PointsTableView
+from .animationEngine import FrameAnimator, DEFAULT_FPS
+from .levelOfDetail import LevelOfDetail, ZoomTracker
+from .pointDragger import PointDragger, DragPiece
+from .sceneView import SceneAnimator, SceneToolbar, SceneView
+from . import settings
+from .worker import JobRunner
+
+
+BEZIER_FRAMES = 101
+# only the first construction levels get a legend entry, a longer list is unreadable
+LEGEND_SEGMENTS = 10
+
+
+def tessellate_bezier(control_points, matrix):
+    params, points = adaptive_bezier(control_points, matrix=matrix)
+    return IncrementalBezier(control_points, params, points)
+
+
+def compute_bezier(control_points, frames, matrix, constant_speed=False):
+    curve = bezier.Bezier(control_points)
+    return bezier_frames(curve.control_points, frames, constant_speed=constant_speed), tessellate_bezier(curve.control_points, matrix)
+
 
 class BezierWidget(QWidget):
     def __init__(self):
@@ -17,7 +44,6 @@ class BezierWidget(QWidget):
 
     def initUI(self):
         self.layout = QVBoxLayout()
-        self.input_layout = QVBoxLayout()
 
         self.degree_label = QLabel("Select degree:")
         self.combo = QComboBox()
@@ -28,213 +54,395 @@ class BezierWidget(QWidget):
         self.generate_plot_button = QPushButton("Plot")
         self.import_button = QPushButton("Import from file")
         self.import_json_button = QPushButton("Import from JSON file")
-
-        self.wid = QWidget()
-        self.scroll_area = QScrollArea()
-        self.scroll_area.setWidget(self.wid)
-        self.scroll_area.setWidgetResizable(True)
-        self.scroll_area.setFixedHeight(300)
-
-        self.fig = Figure(figsize=(5, 4), dpi=100)
-        self.canvas = FigureCanvasQTAgg(self.fig)
-        self.axes = self.fig.add_subplot(111)
+        self.import_binary_button = QPushButton("Import from binary file")
+        self.export_binary_button = QPushButton("Export to binary file")
+
+        self.points_model = PointsTableModel('P')
+        self.points_view = PointsTableView(self.points_model)
+        self.points_view.setFixedHeight(300)
+        self.points_model.dataChanged.connect(self.sync_edits)
+
+        # one setting picks the renderer of the plot
+        self.view = SceneView(self) if settings.RENDERER == 'scene' else None
+        self.canvas = None
+        if self.view is None:
+            self.fig = Figure(figsize=(5, 4), dpi=100)
+            self.canvas = FigureCanvasQTAgg(self.fig)
+            self.axes = self.fig.add_subplot(111)
 
         self.slider = QSlider(Qt.Horizontal)
         self.slider.setMinimum(0)
-        self.slider.setMaximum(100)
+        self.slider.setMaximum(BEZIER_FRAMES - 1)
         self.slider.setValue(50)
 
-        self.slider_value_label = QLabel(f"Current t value: {self.slider.value() / 100}")
+        self.play_button = QPushButton("Play")
+        self.fps_label = QLabel("FPS")
+        self.fps_field = QSpinBox()
+        self.fps_field.setRange(1, 240)
+        self.fps_field.setValue(DEFAULT_FPS)
+        # frames evenly spaced along the curve instead of in t
+        self.constant_speed = QCheckBox("Constant speed")
+        self.constant_speed.setChecked(True)
+        self.animation_layout = QHBoxLayout()
+        self.animation_layout.addWidget(self.play_button)
+        self.animation_layout.addWidget(self.slider)
+        self.animation_layout.addWidget(self.fps_label)
+        self.animation_layout.addWidget(self.fps_field)
+        self.animation_layout.addWidget(self.constant_speed)
+
+        self.slider_value_label = QLabel(f"Current t value: {self.slider.value() / (BEZIER_FRAMES - 1)}")
 
         self.index = self.combo.currentIndex() + 2
         self.previous_index = self.combo.currentIndex()
-        self.control_points = []
+        self.control_points = np.empty((0, 2))
+        self.plot_key = None
+        self.bezier_curve = None
+        self.segment_lines = []
+        self.curve_line = None
+        self.curve_matrix = None
+        self.animator = None
+        self.lod = None
+        self.editor = None
+        self.polygon_line = None
+
+        self.runner = JobRunner(self)
+        self.runner.failed.connect(self.show_job_error)
+        self.progress_bar = QProgressBar()
+        self.progress_bar.setRange(0, 0)
+        self.progress_bar.setMaximumHeight(10)
+        self.progress_bar.setTextVisible(False)
+        self.progress_bar.hide()
+        self.runner.busy.connect(self.progress_bar.setVisible)
 
         self.setup_initial_input_fields()
 
         self.combo.activated.connect(self.modifyGUI)
         self.slider.valueChanged.connect(self.slider_value_changed)
+        self.play_button.clicked.connect(self.toggle_animation)
+        self.fps_field.valueChanged.connect(self.set_fps)
+        self.constant_speed.toggled.connect(self.constant_speed_toggled)
         self.generate_button.clicked.connect(self.generate_values)
         self.clear_button.clicked.connect(self.clear_fields)
         self.generate_plot_button.clicked.connect(self.generate_plot)
         self.import_button.clicked.connect(self.import_from_file)
         self.import_json_button.clicked.connect(self.import_from_json_file)
+        self.import_binary_button.clicked.connect(self.import_from_binary_file)
+        self.export_binary_button.clicked.connect(self.export_to_binary_file)
 
         self.layout.addWidget(self.degree_label)
         self.layout.addWidget(self.combo)
-        self.layout.addWidget(self.scroll_area)
+        self.layout.addWidget(self.points_view)
         self.layout.addWidget(self.clear_button)
         self.layout.addWidget(self.generate_button)
         self.layout.addWidget(self.import_button)
         self.layout.addWidget(self.import_json_button)
+        self.layout.addWidget(self.import_binary_button)
+        self.layout.addWidget(self.export_binary_button)
         self.layout.addWidget(self.generate_plot_button)
-        self.layout.addWidget(self.canvas)
-        self.layout.addWidget(self.slider)
+        if self.view is not None:
+            self.layout.addWidget(SceneToolbar(self.view, self.export_image, self))
+            # the view hit-tests and drags control points itself
+            self.dragger = self.view
+        else:
+            self.layout.addWidget(NavigationToolbar2QT(self.canvas, self))
+            self.dragger = PointDragger(self.canvas, self.axes, parent=self)
+        self.dragger.dragStarted.connect(self.drag_started)
+        self.dragger.dragMoved.connect(self.drag_point)
+        self.dragger.dragFinished.connect(self.drag_finished)
+        self.resume_animation = False
+        self.drag_pieces = []
+        # the shown curve is tessellated again for a new zoom
+        self.zoom = ZoomTracker(self.current_matrix, self.retessellate, self.tessellation_busy, parent=self)
+        if self.view is not None:
+            self.view.viewChanged.connect(self.zoom.changed)
+        else:
+            self.canvas.mpl_connect('draw_event', self.zoom.changed)
+        self.layout.addWidget(self.view or self.canvas)
+        self.layout.addLayout(self.animation_layout)
         self.layout.addWidget(self.slider_value_label)
+        self.layout.addWidget(self.progress_bar)
 
-        self.wid.setLayout(self.input_layout)
         self.setLayout(self.layout)
         self.show()
 
     def setup_initial_input_fields(self):
-        for ind in range(self.index):
-            self.add_input_row()
+        self.points_model.set_empty(self.index)
 
     def modifyGUI(self):
-        count = 0
-        i = self.input_layout.count() - 1
-
-        if self.combo.currentIndex() != 4:
-            while i >= 0:
-                item = self.input_layout.itemAt(i)
-                if item.widget() is not None:
-                    item.widget().deleteLater()
-                    self.input_layout.removeWidget(item.widget())
-                    i -= 1
-
         if self.combo.currentIndex() == 4:
             num, ok = QInputDialog.getInt(self, "Degree input dialog", "Enter a degree", value=5, min=5, max=100)
             if ok:
                 count = num
-                while i >= 0:
-                    item = self.input_layout.itemAt(i)
-                    if item.widget() is not None:
-                        item.widget().deleteLater()
-                        self.input_layout.removeWidget(item.widget())
-                        i -= 1
             else:
                 self.combo.setCurrentIndex(self.previous_index)
                 return
         else:
             count = self.combo.currentIndex() + 1
 
-        for j in range(count + 1):
-            self.add_input_row()
+        self.points_model.set_empty(count + 1)
 
         self.previous_index = self.combo.currentIndex()
 
-    def add_input_row(self):
-        row = QWidget()
-        layout_row = QHBoxLayout()
-        layout_row.setContentsMargins(0, 0, 0, 0)
-        row.setLayout(layout_row)
-        label = QLabel(f'P{self.input_layout.count() + 1}')
-        layout_row.addWidget(label)
-
-        line_edit1 = QLineEdit()
-        line_edit1.setPlaceholderText('Set x')
-        line_edit1.setFixedSize(100, 20)
-        layout_row.addWidget(line_edit1)
-
-        line_edit2 = QLineEdit()
-        line_edit2.setPlaceholderText('Set y')
-        line_edit2.setFixedSize(100, 20)
-        layout_row.addWidget(line_edit2)
-
-        row.setFixedHeight(20)
-        self.input_layout.addWidget(row)
-
-    def linear_interp(self, p1, p2, t):
-        return (1 - t) * p1 + t * p2
-
-    def de_casteljau(self, control_points, t):
-        points = np.array(control_points)
-        n = len(points)
-        intermediate_points = []
-        for r in range(1, n):
-            new_points = []
-            for i in range(n - r):
-                new_point = self.linear_interp(points[i], points[i + 1], t)
-                new_points.append(new_point)
-            points = np.array(new_points)
-            intermediate_points.append(points.copy())
-        return points[0], intermediate_points
+    def frame_param(self, index):
+        if self.animator is None:
+            return index / (BEZIER_FRAMES - 1)
+        return self.animator.frames.params[index]
 
     def slider_value_changed(self):
-        t = self.slider.value() / 100
-        self.slider_value_label.setText(f"Current t value: {t}")
-        if self.control_points:
+        t = self.slider.value() / (BEZIER_FRAMES - 1)
+        self.slider_value_label.setText(f"Current t value: {self.frame_param(self.slider.value()):.4g}")
+        if len(self.control_points):
             self.update_plot(t)
 
     def generate_plot(self):
-        self.control_points = []
-        t = self.slider.value() / 100
-
-        for i in range(self.input_layout.count()):
-            row_widget = self.input_layout.itemAt(i).widget()
-            row_layout = row_widget.layout()
-            x_input_edit = row_layout.itemAt(1).widget()
-            y_input_edit = row_layout.itemAt(2).widget()
-            x_input = x_input_edit.text()
-            y_input = y_input_edit.text()
+        t = self.slider.value() / (BEZIER_FRAMES - 1)
 
-            try:
-                x = float(x_input)
-                y = float(y_input)
-                point = [x, y]
-                self.control_points.append(point)
-            except ValueError:
-                err = QErrorMessage()
-                err.showMessage("Invalid input. Please input numerical values.")
-                err.exec_()
-                return
+        if self.points_model.has_empty():
+            err = QErrorMessage()
+            err.showMessage("Invalid input. Please input numerical values.")
+            err.exec_()
+            return
 
-        if len(self.control_points) == self.input_layout.count():
+        self.control_points = self.points_model.points.copy()
+        if len(self.control_points):
             self.update_plot(t)
 
     def update_plot(self, t):
+        control_points_arr = np.array(self.control_points, dtype=np.float64)
+
+        # the curve, the control polygon and every frame of the construction
+        # only depend on the control points; they are computed once in the
+        # background and the slider then just picks a precomputed frame
+        key = (control_points_arr.shape, control_points_arr.tobytes())
+        if key != self.plot_key:
+            self.plot_key = key
+            self.draw_static(control_points_arr)
+            self.runner.cancel()
+            self.runner.submit(compute_bezier, (control_points_arr, BEZIER_FRAMES, self.curve_matrix, self.constant_speed.isChecked()), self.show_bezier)
+            self.zoom.track(self.curve_matrix)
+            return
+
+        if self.animator is not None:
+            self.animator.seek(round(t * (BEZIER_FRAMES - 1)))
+
+    def draw_static(self, control_points_arr):
+        if self.animator is not None:
+            self.animator.close()
+            self.animator = None
+            self.play_button.setText("Play")
+        self.editor = None
+        self.dragger.set_points(None)
+        self.zoom.track(None)
+        if self.view is not None:
+            self.draw_static_scene(control_points_arr)
+            return
         self.axes.clear()
-        bezier_curve_points_list = []
-        id = 1
-        control_points_arr = np.array(self.control_points)
-        self.axes.plot(control_points_arr[:, 0], control_points_arr[:, 1], 'ro-', label='Control points')
-        final, points = self.de_casteljau(control_points_arr, t)
-        for q in range(101):
-            point = self.de_casteljau(control_points_arr, q / 100)[0]
-            bezier_curve_points_list.append(point)
-        bezier_curve = np.array(bezier_curve_points_list)
-        for intermediate in points:
-            self.axes.plot(intermediate[:, 0], intermediate[:, 1], marker='o', linestyle='-', label=f'Segment{id}')
-            id += 1
-        self.axes.plot(bezier_curve[:, 0], bezier_curve[:, 1], linestyle='--', color='black', label='Bezier curve')
-        self.axes.legend()
+        self.polygon_line, = self.axes.plot(control_points_arr[:, 0], control_points_arr[:, 1], 'ro-', label='Control points')
+        self.axes.autoscale_view()
+        if self.lod is not None:
+            self.lod.close()
+        self.lod = LevelOfDetail(self.axes)
+        self.lod.add(self.polygon_line, control_points_arr, markers=True)
+        self.curve_matrix = pixel_matrix(self.axes.transData)
+        self.segment_lines = []
+        # a frame shows about n^2 / 2 construction points, past the LOD
+        # threshold their markers would dominate every redraw
+        n = len(control_points_arr)
+        marker = 'o' if n * n // 2 <= LOD_THRESHOLD else None
+        for id in range(1, n):
+            line, = self.axes.plot([], [], marker=marker, linestyle='-', label=f'Segment{id}' if id <= LEGEND_SEGMENTS else '_nolegend_', animated=True)
+            self.segment_lines.append(line)
+        self.curve_line, = self.axes.plot([], [], linestyle='--', color='black', label='Bezier curve')
+        # placing the legend at 'best' scans every drawn vertex
+        self.axes.legend(loc='best' if marker else 'upper right')
         self.canvas.draw()
 
+    def draw_static_scene(self, control_points_arr):
+        self.lod = None
+        self.view.clear()
+        self.polygon_line = self.view.plot(control_points_arr, label='Control points', color='r', marker='o')
+        self.curve_matrix = None
+        self.segment_lines = []
+        n = len(control_points_arr)
+        marker = 'o' if n * n // 2 <= LOD_THRESHOLD else None
+        for id in range(1, n):
+            self.segment_lines.append(self.view.plot(label=f'Segment{id}' if id <= LEGEND_SEGMENTS else '_nolegend_', marker=marker))
+        self.curve_line = self.view.plot(label='Bezier curve', color='k', linestyle='--')
+        self.view.fit(control_points_arr)
+        self.view.legend()
+        self.curve_matrix = self.view.pixel_matrix()
+
+    def set_line(self, line, points, markers=False):
+        # scene items decimate themselves, matplotlib lines go through the LOD
+        if self.view is not None:
+            line.set_points(points)
+        else:
+            self.lod.add(line, points, markers)
+
+    def redraw(self):
+        if self.canvas is not None:
+            self.canvas.draw_idle()
+
+    def current_matrix(self):
+        if self.view is not None:
+            return self.view.pixel_matrix()
+        return pixel_matrix(self.axes.transData)
+
+    def tessellation_busy(self):
+        return bool(self.runner.jobs) or self.dragger.is_dragging()
+
+    def retessellate(self, matrix):
+        # only the curve depends on the zoom, the frames are kept
+        if self.editor is not None:
+            self.runner.submit(tessellate_bezier, (self.editor.control_points.copy(), matrix), self.show_tessellation)
+
+    def show_bezier(self, result):
+        frames, editor = result
+        self.show_tessellation(editor)
+        self.show_frames(frames)
+        self.sync_edits()
+
+    def show_tessellation(self, editor):
+        self.editor = editor
+        self.bezier_curve = self.editor.samples
+        self.set_line(self.curve_line, self.bezier_curve)
+        self.dragger.set_points(self.editor.control_points)
+        self.redraw()
+
+    def show_frames(self, frames):
+        playing = self.resume_animation or (self.animator is not None and self.animator.is_playing())
+        self.resume_animation = False
+        if self.animator is not None:
+            self.animator.close()
+        if self.view is not None:
+            self.animator = SceneAnimator(self.view, frames, self.segment_lines, first_level=1, fps=self.fps_field.value(), parent=self)
+        else:
+            self.animator = FrameAnimator(self.canvas, frames, self.segment_lines, first_level=1, fps=self.fps_field.value(), parent=self)
+        self.animator.frameChanged.connect(self.frame_changed)
+        self.animator.index = self.slider.value()
+        self.animator.update_artists()
+        self.frame_changed(self.animator.index)
+        if self.canvas is not None:
+            self.canvas.draw()
+        if playing:
+            self.animator.play()
+
+    def sync_edits(self):
+        # the plotted curve follows edits of its control points: the
+        # Bernstein basis at the tessellation parameters is reused, only the
+        # construction frames are rebuilt in the background
+        if self.editor is None:
+            return
+        points = self.points_model.points
+        if points.shape != self.editor.control_points.shape:
+            return
+        rows = np.flatnonzero((points != self.editor.control_points).any(axis=1))
+        if len(rows) == 0 or not np.isfinite(points[rows]).all():
+            return
+        self.move_points(rows, points[rows])
+        self.redraw()
+        self.rebuild_frames()
+
+    def move_points(self, rows, values):
+        self.editor.move(rows, values)
+        self.bezier_curve = self.editor.samples
+        self.set_line(self.polygon_line, self.editor.control_points, markers=True)
+        self.set_line(self.curve_line, self.bezier_curve)
+        self.dragger.invalidate()
+
+    def rebuild_frames(self):
+        self.control_points = self.editor.control_points.copy()
+        self.plot_key = (self.control_points.shape, self.control_points.tobytes())
+        self.runner.cancel()
+        self.runner.submit(bezier_frames, (self.control_points, BEZIER_FRAMES, FRAME_MEMORY_LIMIT, self.constant_speed.isChecked()), self.show_frames)
+
+    def drag_started(self, index):
+        # a new tessellation must not replace the editor being dragged
+        if self.runner.jobs:
+            self.runner.cancel()
+            self.zoom.expire()
+        # the construction is rebuilt once the point is dropped
+        if self.animator is not None and self.animator.is_playing():
+            self.animator.pause()
+            self.resume_animation = True
+        # scene items are rebuilt in place while the point moves
+        if self.view is not None:
+            return
+        # the whole curve moves, but only two segments of the polygon
+        self.drag_pieces = [
+            DragPiece(self.lod, self.polygon_line, self.editor.control_points, index, index + 1, markers=True),
+            DragPiece(self.lod, self.curve_line, self.editor.samples, 0, len(self.editor.samples)),
+        ]
+        self.dragger.set_artists([piece.piece for piece in self.drag_pieces])
+
+    def drag_point(self, index, x, y):
+        self.editor.move(index, (x, y))
+        self.bezier_curve = self.editor.samples
+        if self.view is not None:
+            self.set_line(self.polygon_line, self.editor.control_points)
+            self.set_line(self.curve_line, self.bezier_curve)
+        for piece in self.drag_pieces:
+            piece.update()
+        self.points_model.set_point(index, x, y)
+
+    def drag_finished(self, index, x, y):
+        for piece in self.drag_pieces:
+            piece.restore()
+        self.drag_pieces = []
+        self.rebuild_frames()
+
+    def toggle_animation(self):
+        if self.animator is None:
+            return
+        self.animator.toggle()
+        self.play_button.setText("Pause" if self.animator.is_playing() else "Play")
+
+    def set_fps(self, fps):
+        if self.animator is not None:
+            self.animator.set_fps(fps)
+
+    def frame_changed(self, index):
+        self.slider.blockSignals(True)
+        self.slider.setValue(index)
+        self.slider.blockSignals(False)
+        self.slider_value_label.setText(f"Current t value: {self.frame_param(index):.4g}")
+
+    def constant_speed_toggled(self):
+        if self.editor is not None and not self.dragger.is_dragging():
+            self.rebuild_frames()
+
+    def export_image(self):
+        # the scene renderer is for editing, pictures are still drawn by matplotlib
+        from batch.render import render_curve
+
+        if len(self.control_points) == 0:
+            return
+        filename, _ = QFileDialog.getSaveFileName(self, "Save Image", "", "Images (*.png *.svg)")
+        if not filename:
+            return
+        points = np.array(self.control_points, dtype=np.float64)
+        try:
+            render_curve(loaders.CurveRecord('bezier', points, len(points) - 1, None), filename)
+        except (OSError, ValueError) as e:
+            QErrorMessage(self).showMessage(f"Failed to export the image: {e}")
+
+    def show_job_error(self, message):
+        err = QErrorMessage(self)
+        err.showMessage(f"Failed to evaluate the curve: {message}")
+
     def generate_values(self):
-        for i in range(self.input_layout.count()):
-            row_widget = self.input_layout.itemAt(i).widget()
-            row_layout = row_widget.layout()
-            row_layout.itemAt(1).widget().setText(str(random.randrange(-200, 200)))
-            row_layout.itemAt(2).widget().setText(str(random.randrange(-200, 200)))
+        count = self.points_model.rowCount()
+        self.points_model.set_points([[random.randrange(-200, 200), random.randrange(-200, 200)] for _ in range(count)])
 
     def clear_fields(self):
-        for i in range(self.input_layout.count()):
-            row_widget = self.input_layout.itemAt(i).widget()
-            row_layout = row_widget.layout()
-            row_layout.itemAt(1).widget().setText("")
-            row_layout.itemAt(2).widget().setText("")
+        self.points_model.clear_values()
 
     def import_from_file(self):
         options = QFileDialog.Options()
         file_name, _ = QFileDialog.getOpenFileName(self, "Open Control Points File", "", "Text Files (*.txt);;All Files (*)", options=options)
         if file_name:
             try:
-                with open(file_name, 'r') as file:
-                    lines = file.readlines()
-                    self.control_points = []
-                    required_fields = len(lines)
-                    self.adjust_input_fields(required_fields)
-                    for i, line in enumerate(lines):
-                        parts = line.strip().split()
-                        if len(parts) == 2:
-                            x, y = float(parts[0]), float(parts[1])
-                            if i < self.input_layout.count():
-                                row_widget = self.input_layout.itemAt(i).widget()
-                                row_layout = row_widget.layout()
-                                row_layout.itemAt(1).widget().setText(str(x))
-                                row_layout.itemAt(2).widget().setText(str(y))
-                            self.control_points.append([x, y])
-                    self.update_plot(self.slider.value() / 100)
+                self.load_points(loaders.load_bezier_txt(file_name).points)
             except Exception as e:
                 err = QErrorMessage()
                 err.showMessage(f"Failed to load file: {str(e)}")
@@ -245,39 +453,52 @@ class BezierWidget(QWidget):
         file_name, _ = QFileDialog.getOpenFileName(self, "Open Control Points JSON File", "", "JSON Files (*.json);;All Files (*)", options=options)
         if file_name:
             try:
-                with open(file_name, 'r') as file:
-                    data = json.load(file)
-                    self.control_points = []
-                    required_fields = len(data["points"])
-                    self.adjust_input_fields(required_fields)
-                    for i, point in enumerate(data["points"]):
-                        x = point.get("x")
-                        y = point.get("y")
-                        if x is not None and y is not None:
-                            if i < self.input_layout.count():
-                                row_widget = self.input_layout.itemAt(i).widget()
-                                row_layout = row_widget.layout()
-                                row_layout.itemAt(1).widget().setText(str(x))
-                                row_layout.itemAt(2).widget().setText(str(y))
-                            self.control_points.append([x, y])
-                    self.update_plot(self.slider.value() / 100)
+                self.load_points(loaders.load_json(file_name).points)
             except Exception as e:
                 err = QErrorMessage()
                 err.showMessage(f"Failed to load JSON file: {str(e)}")
                 err.exec_()
 
+    def import_from_binary_file(self):
+        options = QFileDialog.Options()
+        file_name, _ = QFileDialog.getOpenFileName(self, "Open Binary Curve File", "", "Binary Curve Files (*.crv);;All Files (*)", options=options)
+        if file_name:
+            try:
+                self.load_points(binary.load_binary(file_name).points)
+            except Exception as e:
+                err = QErrorMessage()
+                err.showMessage(f"Failed to load binary file: {str(e)}")
+                err.exec_()
+
+    def export_to_binary_file(self):
+        if self.points_model.has_empty():
+            err = QErrorMessage()
+            err.showMessage("Invalid input. Please input numerical values.")
+            err.exec_()
+            return
+
+        options = QFileDialog.Options()
+        file_name, _ = QFileDialog.getSaveFileName(self, "Save Binary Curve File", "", "Binary Curve Files (*.crv);;All Files (*)", options=options)
+        if file_name:
+            if not file_name.endswith(binary.EXTENSION):
+                file_name += binary.EXTENSION
+            points = self.points_model.points
+            try:
+                binary.save_binary(file_name, loaders.CurveRecord('bezier', points, len(points) - 1, None))
+            except Exception as e:
+                err = QErrorMessage()
+                err.showMessage(f"Failed to save binary file: {str(e)}")
+                err.exec_()
+
+    def load_points(self, points):
+        self.points_model.set_points(points)
+        self.adjust_input_fields(self.points_model.rowCount())
+        self.control_points = self.points_model.points.copy()
+        self.update_plot(self.slider.value() / (BEZIER_FRAMES - 1))
+
     def adjust_input_fields(self, required_fields):
-        current_fields = self.input_layout.count()
-
-        if required_fields > current_fields:
-            for _ in range(required_fields - current_fields):
-                self.add_input_row()
-        elif required_fields < current_fields:
-            for _ in range(current_fields - required_fields):
-                item = self.input_layout.itemAt(self.input_layout.count() - 1)
-                if item.widget() is not None:
-                    item.widget().deleteLater()
-                    self.input_layout.removeWidget(item.widget())
+        if required_fields != self.points_model.rowCount():
+            self.points_model.resize(required_fields)
 
         if required_fields <= 4:
             self.combo.blockSignals(True)
@@ -287,4 +508,4 @@ class BezierWidget(QWidget):
             self.combo.blockSignals(True)
             self.combo.setCurrentIndex(4)
             self.combo.blockSignals(False)
-            self.previous_index = 4
\ No newline at end of file
+            self.previous_index = 4
@@ -1,14 +1,93 @@
 from PyQt5.QtWidgets import *
 from PyQt5.QtCore import Qt, QRegExp
 from PyQt5.QtGui import QRegExpValidator
-from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
+from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas, NavigationToolbar2QT
 from matplotlib.figure import Figure
-from matplotlib.animation import FuncAnimation
 
 import numpy as np
-from scipy import interpolate
 
-import json, re
+from curves.adaptive import adaptive_bspline, pixel_matrix, PIXEL_TOLERANCE
+from curves.approximation import approximate
+from curves.bspline import BSpline, generate_knots
+from curves.cache import CurveCache
+from curves.frames import bspline_frames
+from curves.incremental import IncrementalBSpline
+from curves.interpolation import PARAMETERIZATIONS, interpolate
+from curves.parallel import PARALLEL_MIN_POINTS, adaptive_parallel, default_workers
+from curves import binary, loaders
+from .pointsTable import PointsTableModel, PointsTableView
+from .animationEngine import FrameAnimator, DEFAULT_FPS
+from .levelOfDetail import LevelOfDetail, ZoomTracker
+from .pointDragger import PointDragger, DragPiece
+from .sceneView import SceneAnimator, SceneToolbar, SceneView
+from . import settings
+from .worker import JobRunner
+
+CURVE_CACHE_SIZE = 64
+ANIMATION_FRAMES = 100
+DEFAULT_CONTROL_POINTS = 20
+MAX_CONTROL_POINTS = 100000
+# the residual tooltip lists at most this many chunks
+RESIDUAL_TOOLTIP_ROWS = 40
+
+
+def sample_bspline_adaptive(cache, points, degree, knots, matrix, tolerance=PIXEL_TOLERANCE, workers=1):
+    # the worker count does not change the samples, it stays out of the key
+    key = cache.make_key('bspline', points, degree, knots, ('adaptive', tolerance, matrix.tobytes()))
+
+    def compute():
+        spline = BSpline(points, degree, knots)
+        if workers > 1 and len(spline.control_points) >= PARALLEL_MIN_POINTS:
+            return adaptive_parallel(spline, tolerance, matrix, workers=workers)
+        return adaptive_bspline(spline.evaluator, spline.control_points, tolerance, matrix)
+
+    return cache.get_or_compute(key, compute)
+
+
+def sample_knots(cache, points, degree, knots):
+    key = cache.make_key('knots', points, degree, knots)
+    return cache.get_or_compute(key, lambda: BSpline(points, degree, knots).knot_points().T)
+
+
+def compute_bspline(cache, points, degree, knots, matrix, show_knots, workers=1):
+    # the cached samples seed editors that keep the curve up to date while
+    # single points are edited
+    spline = BSpline(points, degree, knots)
+    params, out = sample_bspline_adaptive(cache, points, degree, knots, matrix, workers=workers)
+    editor = IncrementalBSpline(spline, params, out)
+    knot_editor = None
+    if show_knots:
+        knot_points = sample_knots(cache, points, degree, spline.knots)
+        knot_editor = IncrementalBSpline(spline, spline.knots[degree:len(spline.knots) - degree], knot_points.T)
+    return editor, knot_editor
+
+
+def animation_frames(cache, points, degree, knots, frames, constant_speed=True):
+    key = cache.make_key('frames', points, degree, knots, (frames, constant_speed))
+    return cache.get_or_compute(key, lambda: bspline_frames(BSpline(points, degree, knots), frames, constant_speed))
+
+
+def fit_interpolation(cache, points, degree, parameterization='chord'):
+    key = cache.make_key('interpolate', points, degree, None, (parameterization,))
+    return cache.get_or_compute(key, lambda: interpolate(points, degree, parameterization)[0])
+
+
+def sample_interpolation(cache, points, degree, matrix, parameterization='chord', tolerance=PIXEL_TOLERANCE, workers=1):
+    spline = fit_interpolation(cache, points, degree, parameterization)
+    key = cache.make_key('interpolate', points, degree, spline.knots, ('adaptive', parameterization, tolerance, matrix.tobytes()))
+
+    def compute():
+        if workers > 1 and len(spline.control_points) >= PARALLEL_MIN_POINTS:
+            return adaptive_parallel(spline, tolerance, matrix, workers=workers)[1].T
+        return adaptive_bspline(spline.evaluator, spline.control_points, tolerance, matrix)[1].T
+
+    return cache.get_or_compute(key, compute)
+
+
+def fit_approximation(cache, points, count, degree, parameterization, smoothing):
+    key = cache.make_key('approximate', points, degree, None, (count, parameterization, smoothing))
+    return cache.get_or_compute(key, lambda: approximate(points, count, degree, parameterization, smoothing))
+
 
 class BsplineFigure(FigureCanvas):
     def __init__(self, widget, width=5, height=5, dpi=100):
@@ -22,11 +101,12 @@ class BsplineFigure(FigureCanvas):
         self.widget = widget  
     
 class AnimationWindow(QWidget):
-    def __init__(self, points, degree, knots):
+    def __init__(self, points, degree, knots, cache=None):
         super().__init__()
         self.points = points
         self.degree = degree
         self.knots = knots
+        self.cache = cache if cache is not None else CurveCache(CURVE_CACHE_SIZE)
         self.initUI()
 
     def initUI(self):
@@ -34,41 +114,108 @@ class AnimationWindow(QWidget):
         self.layout = QVBoxLayout(self)
         self.setLayout(self.layout)
 
-        self.figure = BsplineFigure(self)
-        self.layout.addWidget(self.figure)
+        self.view = SceneView(self) if settings.RENDERER == 'scene' else None
+        self.figure = BsplineFigure(self) if self.view is None else None
+        self.layout.addWidget(self.view or self.figure)
+
+        self.controlsLayout = QHBoxLayout()
+        self.playButton = QPushButton('Pause')
+        self.seekSlider = QSlider(Qt.Horizontal)
+        self.seekSlider.setRange(0, ANIMATION_FRAMES - 1)
+        self.fpsLabel = QLabel('FPS')
+        self.fpsField = QSpinBox()
+        self.fpsField.setRange(1, 240)
+        self.fpsField.setValue(DEFAULT_FPS)
+        # frames evenly spaced along the curve instead of in the parameter
+        self.constantSpeed = QCheckBox('Constant speed')
+        self.constantSpeed.setChecked(True)
+        self.controlsLayout.addWidget(self.playButton)
+        self.controlsLayout.addWidget(self.seekSlider)
+        self.controlsLayout.addWidget(self.fpsLabel)
+        self.controlsLayout.addWidget(self.fpsField)
+        self.controlsLayout.addWidget(self.constantSpeed)
+        self.layout.addLayout(self.controlsLayout)
 
         self.startAnimation()
 
+        self.playButton.clicked.connect(self.toggle_animation)
+        self.seekSlider.valueChanged.connect(self.seek)
+        self.fpsField.valueChanged.connect(self.set_fps)
+        self.constantSpeed.toggled.connect(self.restartAnimation)
+
     def startAnimation(self):
-        self.ax = self.figure.ax
-        self.ax.clear()
-        self.ax.grid()
-        self.ax.set_xlabel('x')
-        self.ax.set_ylabel('y')
-        self.ax.set_title('B-Spline Curve Animation')
-        
         ctr = np.array(self.points)
         x = ctr[:, 0]
         y = ctr[:, 1]
 
-        tck = [self.knots, [x, y], self.degree]
+        # every frame (traced point and de Boor polygons) is computed up front
+        self.frames = animation_frames(self.cache, ctr, self.degree, self.knots, ANIMATION_FRAMES, self.constantSpeed.isChecked())
+
+        if self.view is not None:
+            self.lod = None
+            self.view.clear('B-Spline Curve Animation')
+            self.view.plot(ctr, label='Control polygon', color='k', linestyle='--', marker='o', markerfacecolor='r')
+            self.line = self.view.plot(label='B-spline curve', color='b')
+            levels = []
+            for r in range(self.degree + 1):
+                label = 'de Boor points' if r == 0 else '_nolegend_'
+                levels.append(self.view.plot(label=label, marker='o', linewidth=1, markersize=4 if r < self.degree else 7))
+            self.view.fit(ctr)
+            self.view.legend()
+            self.animator = SceneAnimator(self.view, self.frames, levels, trace_line=self.line, fps=self.fpsField.value(), parent=self)
+        else:
+            self.ax = self.figure.ax
+            self.ax.clear()
+            self.ax.grid()
+            self.ax.set_xlabel('x')
+            self.ax.set_ylabel('y')
+            self.ax.set_title('B-Spline Curve Animation')
+
+            polygon, = self.ax.plot(x, y, 'k--', label='Control polygon', marker='o', markerfacecolor='red')
+            self.ax.autoscale_view()
+            self.lod = LevelOfDetail(self.ax)
+            self.lod.add(polygon, ctr, markers=True)
+            self.line, = self.ax.plot([], [], 'b', label='B-spline curve', animated=True)
+            levels = []
+            for r in range(self.degree + 1):
+                label = 'de Boor points' if r == 0 else '_nolegend_'
+                line, = self.ax.plot([], [], marker='o', linestyle='-', linewidth=1, markersize=4 if r < self.degree else 7, label=label, animated=True)
+                levels.append(line)
+            self.ax.legend(loc='best')
+            self.animator = FrameAnimator(self.figure, self.frames, levels, trace_line=self.line, fps=self.fpsField.value(), parent=self)
+
+        self.animator.frameChanged.connect(self.frame_changed)
+        self.animator.seek(0)
+        if self.figure is not None:
+            self.figure.draw()
+        self.animator.play()
+        self.playButton.setText('Pause')
 
-        u3 = np.linspace(self.knots[self.degree], self.knots[-self.degree-1], 100, endpoint=True)
-        self.out = interpolate.splev(u3, tck)
+    def restartAnimation(self):
+        self.animator.close()
+        if self.lod is not None:
+            self.lod.close()
+        self.startAnimation()
+
+    def set_fps(self, fps):
+        self.animator.set_fps(fps)
 
-        self.line, = self.ax.plot([], [], 'b', label='B-spline curve')
-        self.ax.plot(x, y, 'k--', label='Control polygon', marker='o', markerfacecolor='red')
-        self.ax.legend(loc='best')
+    def toggle_animation(self):
+        self.animator.toggle()
+        self.playButton.setText('Pause' if self.animator.is_playing() else 'Play')
 
-        self.anim = FuncAnimation(self.figure.fig, self.animate, init_func=self.init_anim, frames=100, interval=20, blit=True)
+    def seek(self, index):
+        if index != self.animator.index:
+            self.animator.seek(index)
 
-    def init_anim(self):
-        self.line.set_data([], [])
-        return self.line,
+    def frame_changed(self, index):
+        self.seekSlider.blockSignals(True)
+        self.seekSlider.setValue(index)
+        self.seekSlider.blockSignals(False)
 
-    def animate(self, i):
-        self.line.set_data(self.out[0][:i], self.out[1][:i])
-        return self.line,
+    def closeEvent(self, event):
+        self.animator.close()
+        super().closeEvent(event)
 
 
 class QHSeparationLine(QFrame):
@@ -86,7 +233,6 @@ class QHSeparationLine(QFrame):
 
 class BSplineWidget(QWidget):
     
-    pointsArray = []
     points = []
     lenght = 0
     degree = 0
@@ -95,13 +241,42 @@ class BSplineWidget(QWidget):
     def __init__(self):
         super().__init__()
         
-        self.figure = BsplineFigure(self)
+        self.curve_cache = CurveCache(CURVE_CACHE_SIZE)
+        self.runner = JobRunner(self)
+        self.runner.failed.connect(self.show_job_error)
+        # one setting picks the renderer of the main plot
+        self.view = SceneView(self) if settings.RENDERER == 'scene' else None
+        self.figure = BsplineFigure(self) if self.view is None else None
+        self.lod = None
+        self.editor = None
+        self.knotEditor = None
+        self.polygonLine = None
+        self.fitPolygonLine = None
         
         self.layout = QVBoxLayout(self)
         self.setLayout(self.layout)
         
         # figure 
-        self.layout.addWidget(self.figure)
+        if self.view is not None:
+            self.layout.addWidget(SceneToolbar(self.view, self.export_image, self))
+            self.layout.addWidget(self.view)
+            # the view hit-tests and drags control points itself
+            self.dragger = self.view
+        else:
+            self.layout.addWidget(NavigationToolbar2QT(self.figure, self))
+            self.layout.addWidget(self.figure)
+            self.dragger = PointDragger(self.figure, self.figure.ax, parent=self)
+        self.dragger.dragStarted.connect(self.drag_started)
+        self.dragger.dragMoved.connect(self.drag_point)
+        self.dragger.dragFinished.connect(self.drag_finished)
+        self.dragPieces = []
+        # the shown curve is tessellated again for a new zoom
+        self.tessellate = None
+        self.zoom = ZoomTracker(self.current_matrix, self.retessellate, self.tessellation_busy, parent=self)
+        if self.view is not None:
+            self.view.viewChanged.connect(self.zoom.changed)
+        else:
+            self.figure.mpl_connect('draw_event', self.zoom.changed)
         self.separator = QHSeparationLine()
         
         # layouts
@@ -119,6 +294,12 @@ class BSplineWidget(QWidget):
         self.clearButton.clicked.connect(self.clear_points)
         self.leftLayout.addWidget(self.clearButton)
         
+        self.pointsModel = PointsTableModel('Point')
+        self.pointsView = PointsTableView(self.pointsModel)
+        self.pointsView.setMinimumHeight(150)
+        self.pointsModel.dataChanged.connect(self.sync_edits)
+        self.leftLayout.addWidget(self.pointsView)
+        
         self.bellowLayout.addLayout(self.leftLayout)
         
         #right 
@@ -143,6 +324,37 @@ class BSplineWidget(QWidget):
         
         self.showKnots = QCheckBox('Show Knots')
         self.rightLayout.addWidget(self.showKnots, 2, 0)
+
+        # very large curves are sampled by this many processes
+        self.workersLabel = QLabel('Workers')
+        self.workersField = QSpinBox()
+        self.workersField.setRange(1, default_workers())
+        self.workersField.setValue(default_workers())
+        self.rightLayout.addWidget(self.workersLabel, 3, 0)
+        self.rightLayout.addWidget(self.workersField, 3, 1)
+
+        # how the interpolated curve spaces its parameters
+        self.parameterizationLabel = QLabel('Parameterization')
+        self.parameterizationField = QComboBox()
+        self.parameterizationField.addItems(list(PARAMETERIZATIONS))
+        self.rightLayout.addWidget(self.parameterizationLabel, 4, 0)
+        self.rightLayout.addWidget(self.parameterizationField, 4, 1)
+
+        # least-squares approximation with a fixed number of control points
+        self.controlCountLabel = QLabel('Control Points')
+        self.controlCountField = QSpinBox()
+        self.controlCountField.setRange(2, MAX_CONTROL_POINTS)
+        self.controlCountField.setValue(DEFAULT_CONTROL_POINTS)
+        self.rightLayout.addWidget(self.controlCountLabel, 5, 0)
+        self.rightLayout.addWidget(self.controlCountField, 5, 1)
+
+        self.smoothingLabel = QLabel('Smoothing')
+        self.smoothingField = QDoubleSpinBox()
+        self.smoothingField.setRange(0, 1e6)
+        self.smoothingField.setDecimals(4)
+        self.smoothingField.setSingleStep(0.1)
+        self.rightLayout.addWidget(self.smoothingLabel, 6, 0)
+        self.rightLayout.addWidget(self.smoothingField, 6, 1)
         
         self.bellowLayout.addLayout(self.rightLayout)
         
@@ -150,14 +362,23 @@ class BSplineWidget(QWidget):
         self.randomButton = QPushButton('Random Data')
         self.txtButton = QPushButton('Text Data')
         self.jsonButton = QPushButton('JSON Data')
+        self.binaryButton = QPushButton('Binary Data')
+        self.exportBinaryButton = QPushButton('Export Binary')
+        self.approximateFileButton = QPushButton('Approximate File')
         
         self.randomButton.clicked.connect(self.random_data)
         self.txtButton.clicked.connect(self.get_txt_data)
         self.jsonButton.clicked.connect(self.get_json_data)
+        self.binaryButton.clicked.connect(self.get_binary_data)
+        self.exportBinaryButton.clicked.connect(self.export_binary_data)
+        self.approximateFileButton.clicked.connect(self.approximate_file)
         
         self.bottomLayout.addWidget(self.randomButton)
         self.bottomLayout.addWidget(self.txtButton)
         self.bottomLayout.addWidget(self.jsonButton)
+        self.bottomLayout.addWidget(self.binaryButton)
+        self.bottomLayout.addWidget(self.exportBinaryButton)
+        self.bottomLayout.addWidget(self.approximateFileButton)
         
         # Plot button
         self.PlotButton = QPushButton('Plot B-Spline Curve')
@@ -165,6 +386,9 @@ class BSplineWidget(QWidget):
         
         self.plotInterpolateButton = QPushButton('Interpolate B-Spline Curve')
         self.plotInterpolateButton.clicked.connect(self.draw_interpolate)
+
+        self.approximateButton = QPushButton('Approximate B-Spline Curve')
+        self.approximateButton.clicked.connect(self.draw_approximation)
         
         self.animateButton = QPushButton('Animate B-Spline Curve')
         self.animateButton.clicked.connect(self.open_animation_window)  
@@ -175,6 +399,7 @@ class BSplineWidget(QWidget):
         self.layout.addWidget(self.separator)
         self.layout.addWidget(self.PlotButton)
         self.layout.addWidget(self.plotInterpolateButton)
+        self.layout.addWidget(self.approximateButton)
         self.layout.addWidget(self.animateButton)
         self.layout.addWidget(self.separator)
         self.layout.addLayout(self.bottomLayout)
@@ -183,6 +408,19 @@ class BSplineWidget(QWidget):
         self.layout.addWidget(self.errorLabel)
         self.errorLabel.setStyleSheet('color: red')
         self.errorLabel.setAlignment(Qt.AlignCenter)
+
+        self.residualLabel = QLabel()
+        self.residualLabel.setAlignment(Qt.AlignCenter)
+        self.residualLabel.hide()
+        self.layout.addWidget(self.residualLabel)
+        
+        self.progressBar = QProgressBar()
+        self.progressBar.setRange(0, 0)
+        self.progressBar.setMaximumHeight(10)
+        self.progressBar.setTextVisible(False)
+        self.progressBar.hide()
+        self.layout.addWidget(self.progressBar)
+        self.runner.busy.connect(self.progressBar.setVisible)
         
     def update_values(self):
         self.points = self.get_points()
@@ -190,25 +428,17 @@ class BSplineWidget(QWidget):
         self.show_knots = self.get_show_knots()
          
     def get_points(self):
-        coefficients = []
-        
-        if len(self.pointsArray) == 0:
+        if self.pointsModel.rowCount() == 0:
             self.errorLabel.setText('Error: No points added')
             self.errorLabel.show()
             return
         
-            
-        for pointLayout in self.pointsArray:
-            x = pointLayout.itemAt(1).widget().text()
-            y = pointLayout.itemAt(2).widget().text()
-            
-            if x == '' or y == '':
-                self.errorLabel.setText('Error: Empty fields')
-                self.errorLabel.show()
-                return
-            
-            coefficients.append([float(x), float(y)])
-        return coefficients
+        if self.pointsModel.has_empty():
+            self.errorLabel.setText('Error: Empty fields')
+            self.errorLabel.show()
+            return
+        
+        return self.pointsModel.points.copy()
     
     def get_knot_vector(self):
         if self.knotVectorField.text() == '':
@@ -229,41 +459,15 @@ class BSplineWidget(QWidget):
         return self.showKnots.isChecked()
     
     def add_point(self):
-        
-        point_name = "Point" + str(len(self.pointsArray) + 1)
-        
-        pointLayout = QGridLayout()
-        pointLabel = QLabel(point_name)
-        xField = QLineEdit()
-        yField = QLineEdit()
-        
-        reg_ex = QRegExp("[0-9]+.?[0-9]{,2}")
-        input_validator = QRegExpValidator(reg_ex)
-        xField.setValidator(input_validator)
-        yField.setValidator(input_validator)
-        
-        pointLayout.addWidget(pointLabel, 0, 0)
-        pointLayout.addWidget(xField, 0, 1)
-        pointLayout.addWidget(yField, 0, 2)
-   
-        self.pointsArray.append(pointLayout)
-        self.leftLayout.addLayout(pointLayout)
+        self.pointsModel.append_point()
+        self.pointsView.scrollToBottom()
 
     def clear_points(self):
-        for pointLayout in self.pointsArray:
-            for i in reversed(range(pointLayout.count())):
-                widget = pointLayout.itemAt(i).widget()
-                pointLayout.removeWidget(widget)
-                widget.deleteLater()
-            pointLayout.deleteLater()
-        if self.pointsArray != []:
-            self.pointsArray.clear()
-        
-        if self.points != []:
-            self.points.clear()
+        self.pointsModel.clear()
+        self.points = []
         
     def generate_knots(self):
-        if len(self.pointsArray) == 0:
+        if self.pointsModel.rowCount() == 0:
             self.errorLabel.setText('Error: No points added')
             self.errorLabel.show()
             return
@@ -272,26 +476,20 @@ class BSplineWidget(QWidget):
         if degree == None:
             return
         
-        l = len(self.pointsArray)
-        t = np.linspace(0, 1, l - degree + 1, endpoint=True)
-        zeros = [0] * (degree)
-        t = np.append(zeros, t)
-        
-        ones = [1] * (degree)
-        t = np.append(t, ones)                
-        t = np.round(t, decimals=2)
+        t = generate_knots(self.pointsModel.rowCount(), degree)
         
         self.knotVectorField.setText(' '.join(map(str, t)))
         
     def draw_bspline(self):
+        self.runner.cancel()
         self.update_values()
         plist = self.points
 
         if plist is None:
-            self.figure.ax.clear()
+            self.clear_plot()
             return
         if len(plist) < 2:
-            self.figure.ax.clear()
+            self.clear_plot()
             self.errorLabel.setText('Error: Not enough points')
             self.errorLabel.show()
             return
@@ -319,40 +517,52 @@ class BSplineWidget(QWidget):
                     self.errorLabel.show()
                     return
             else: 
-                t = np.linspace(0, 1, l - degree + 1, endpoint=True)
-                zeros = [0] * (degree)
-                t = np.append(zeros, t)
-
-                ones = [1] * (degree)
-                t = np.append(t, ones)                
-                t = np.round(t, decimals=2)
+                t = generate_knots(l, degree)
 
                 self.knotVectorField.setText(' '.join(map(str, t)))
 
-            # knots, coefficients, degree
-            tck = [t, [x, y], degree]
-
-            # evaluate B-spline
-            u3 = np.linspace(t[degree], t[-degree-1], 100, endpoint=True)
-            out = interpolate.splev(u3, tck)
+            # validates the knot vector before the axes are touched
+            BSpline(ctr, degree, t)
 
             self.errorLabel.hide()
-
-            self.figure.ax.clear()
-            self.figure.ax.grid()
-            self.figure.ax.set_xlabel('x')
-            self.figure.ax.set_ylabel('y')
-            self.figure.ax.set_title('B-Spline Curve')
+            self.residualLabel.hide()
+
+            if self.view is not None:
+                self.reset_lod()
+                self.view.clear('B-Spline Curve')
+                self.polygonLine = self.view.plot(ctr, label='Control polygon', color='k', linestyle='--', marker='o', markerfacecolor='r')
+                self.curveLine = self.view.plot(label='B-spline curve', color='b')
+                self.knotsLine = self.view.plot(label='Knots', color='g', linestyle='', marker='o') if self.show_knots else None
+                # the curve lies in the control polygon's hull, so the view is final here
+                self.view.fit(ctr)
+                self.view.legend()
+                matrix = self.view.pixel_matrix()
+            else:
+                self.figure.ax.clear()
+                self.figure.ax.grid()
+                self.figure.ax.set_xlabel('x')
+                self.figure.ax.set_ylabel('y')
+                self.figure.ax.set_title('B-Spline Curve')
             
-            self.figure.ax.plot(x, y, 'k--', label='Control polygon', marker='o', markerfacecolor='red')
-            self.figure.ax.plot(out[0], out[1], 'b', label='B-spline curve')
-
-            if self.show_knots:
-                knots_x, knots_y = interpolate.splev(t[degree:-degree], tck)
-                self.figure.ax.plot(knots_x, knots_y, 'go', label='Knots')
-
-            self.figure.ax.legend(loc='best')
-            self.figure.draw()
+                self.polygonLine, = self.figure.ax.plot(x, y, 'k--', label='Control polygon', marker='o', markerfacecolor='red')
+
+                # the curve lies in the control polygon's hull, so the limits are final here
+                self.figure.ax.autoscale_view()
+                self.reset_lod()
+                self.lod.add(self.polygonLine, ctr, markers=True)
+                matrix = pixel_matrix(self.figure.ax.transData)
+                self.curveLine, = self.figure.ax.plot([], [], 'b', label='B-spline curve')
+                self.knotsLine = None
+                if self.show_knots:
+                    self.knotsLine, = self.figure.ax.plot([], [], 'go', label='Knots')
+
+                self.figure.ax.legend(loc='best')
+                self.figure.draw()
+
+            # evaluation runs in the background, only set_data/draw happen here
+            self.runner.submit(compute_bspline, (self.curve_cache, ctr, degree, t, matrix, self.show_knots, self.workersField.value()), self.show_bspline)
+            self.tessellate = self.tessellate_bspline
+            self.zoom.track(matrix)
 
         except Exception as e:
             self.errorLabel.setText('Error: ' + str(e))
@@ -361,14 +571,15 @@ class BSplineWidget(QWidget):
     
     def draw_interpolate(self):
         
+        self.runner.cancel()
         self.update_values()
         plist = self.points
         
         if plist is None:
-            self.figure.ax.clear()
+            self.clear_plot()
             return
         if len(plist) < 2:
-            self.figure.ax.clear()
+            self.clear_plot()
             self.errorLabel.setText('Error: Not enough points')
             self.errorLabel.show()
             return
@@ -386,33 +597,334 @@ class BSplineWidget(QWidget):
             x = ctr[:, 0]
             y = ctr[:, 1]
             
-            tck, u = interpolate.splprep([x, y], k=degree, s=0)
-            u = np.linspace(0, 1, num=50, endpoint=True)
-            out = interpolate.splev(u, tck)
-
             self.errorLabel.hide()
-
-            self.figure.ax.clear()
-            self.figure.ax.set_xlabel('x')
-            self.figure.ax.set_ylabel('y')
-            self.figure.ax.grid()
-            self.figure.ax.set_title('Interpolated B-Spline Curve')
+            self.residualLabel.hide()
+
+            if self.view is not None:
+                self.reset_lod()
+                self.view.clear('Interpolated B-Spline Curve')
+                self.view.plot(ctr, label='Control points', color='r', linestyle='', marker='o')
+                self.curveLine = self.view.plot(label='Interpolated B-spline', color='b')
+                self.knotsLine = None
+                self.view.fit(ctr)
+                self.view.legend()
+                matrix = self.view.pixel_matrix()
+            else:
+                self.figure.ax.clear()
+                self.figure.ax.set_xlabel('x')
+                self.figure.ax.set_ylabel('y')
+                self.figure.ax.grid()
+                self.figure.ax.set_title('Interpolated B-Spline Curve')
             
-            self.figure.ax.plot(x, y, 'ro', label='Control points')
-            self.figure.ax.plot(out[0], out[1], 'b', label='Interpolated B-spline')
-
-            self.figure.ax.legend(loc='best')
-            self.figure.draw()
+                points, = self.figure.ax.plot(x, y, 'ro', label='Control points')
+                self.figure.ax.autoscale_view()
+                self.reset_lod()
+                self.lod.add(points, ctr, markers=True)
+                matrix = pixel_matrix(self.figure.ax.transData)
+                self.curveLine, = self.figure.ax.plot([], [], 'b', label='Interpolated B-spline')
+                self.knotsLine = None
+
+                self.figure.ax.legend(loc='best')
+                self.figure.draw()
+
+            parameterization = self.parameterizationField.currentText()
+            workers = self.workersField.value()
+            self.runner.submit(sample_interpolation, (self.curve_cache, ctr, degree, matrix, parameterization, PIXEL_TOLERANCE, workers), self.show_interpolation)
+            # later zooms keep the view, the curve is only replaced
+            self.tessellate = lambda matrix: self.runner.submit(sample_interpolation, (self.curve_cache, ctr, degree, matrix, parameterization,
+                                                                                        PIXEL_TOLERANCE, workers), self.show_curve)
+            self.zoom.track(matrix)
 
         except Exception as e:
             self.errorLabel.setText('Error: ' + str(e))
             self.errorLabel.show()
             return
             
+    def clear_plot(self):
+        # the editors, dragger and LOD refer to the lines being removed
+        self.runner.cancel()
+        self.residualLabel.hide()
+        self.dragPieces = []
+        if self.view is not None:
+            self.reset_lod()
+            self.view.clear()
+        else:
+            self.figure.ax.clear()
+            self.reset_lod()
+        self.polygonLine = None
+        self.fitPolygonLine = None
+        self.redraw()
+
+    def set_line(self, line, points, markers=False):
+        # scene items decimate themselves, matplotlib lines go through the LOD
+        if self.view is not None:
+            line.set_points(points)
+        else:
+            self.lod.add(line, points, markers)
+
+    def redraw(self):
+        # scene items repaint on their own once their data is set
+        if self.figure is not None:
+            self.figure.draw_idle()
+
+    def reset_lod(self):
+        self.editor = None
+        self.knotEditor = None
+        self.tessellate = None
+        self.zoom.track(None)
+        self.dragger.set_points(None)
+        if self.lod is not None:
+            self.lod.close()
+            self.lod = None
+        if self.view is None:
+            self.lod = LevelOfDetail(self.figure.ax)
+
+    def current_matrix(self):
+        if self.view is not None:
+            return self.view.pixel_matrix()
+        return pixel_matrix(self.figure.ax.transData)
+
+    def tessellation_busy(self):
+        return bool(self.runner.jobs) or self.dragger.is_dragging()
+
+    def retessellate(self, matrix):
+        if self.tessellate is not None:
+            self.tessellate(matrix)
+
+    def tessellate_bspline(self, matrix):
+        # the editor holds the control points as edited since the plot
+        if self.editor is None:
+            return
+        points = self.editor.control_points.copy()
+        self.runner.submit(compute_bspline, (self.curve_cache, points, self.editor.degree, self.editor.evaluator.knots, matrix,
+                           self.knotEditor is not None, self.workersField.value()), self.show_bspline)
+
+    def show_bspline(self, result):
+        self.editor, self.knotEditor = result
+        self.set_line(self.curveLine, self.editor.samples)
+        if self.knotsLine is not None and self.knotEditor is not None:
+            self.set_line(self.knotsLine, self.knotEditor.samples, markers=True)
+        self.dragger.set_points(self.editor.control_points)
+        self.redraw()
+        # points edited while the curve was being evaluated
+        self.sync_edits()
+
+    def sync_edits(self):
+        # a plotted B-spline follows edits of its control points; only the
+        # samples in the support of the changed points are re-evaluated
+        if self.editor is None:
+            return
+        points = self.pointsModel.points
+        if points.shape != self.editor.control_points.shape:
+            return
+        rows = np.flatnonzero((points != self.editor.control_points).any(axis=1))
+        if len(rows) == 0 or not np.isfinite(points[rows]).all():
+            return
+        self.move_points(rows, points[rows])
+
+    def move_points(self, rows, values):
+        self.editor.move(rows, values)
+        self.set_line(self.polygonLine, self.editor.control_points, markers=True)
+        self.set_line(self.curveLine, self.editor.samples)
+        if self.knotEditor is not None:
+            self.knotEditor.move(rows, values)
+            self.set_line(self.knotsLine, self.knotEditor.samples, markers=True)
+        self.dragger.invalidate()
+        self.redraw()
+
+    def drag_started(self, index):
+        # a new tessellation must not replace the editor being dragged
+        if self.runner.jobs:
+            self.runner.cancel()
+            self.zoom.expire()
+        # scene items are rebuilt in place while the point moves
+        if self.view is not None or self.editor is None:
+            return
+        # only the polygon segments and curve samples in the support of the
+        # dragged point move, the rest of the lines stays in the background
+        self.dragPieces = [
+            DragPiece(self.lod, self.polygonLine, self.editor.control_points, index, index + 1, markers=True),
+            DragPiece(self.lod, self.curveLine, self.editor.samples, *self.editor.rows(index)),
+        ]
+        if self.knotEditor is not None:
+            self.dragPieces.append(DragPiece(self.lod, self.knotsLine, self.knotEditor.samples, *self.knotEditor.rows(index), markers=True))
+        self.dragger.set_artists([piece.piece for piece in self.dragPieces])
+
+    def drag_point(self, index, x, y):
+        self.editor.move(index, (x, y))
+        if self.knotEditor is not None:
+            self.knotEditor.move(index, (x, y))
+        if self.view is not None:
+            self.set_line(self.polygonLine, self.editor.control_points)
+            self.set_line(self.curveLine, self.editor.samples)
+            if self.knotEditor is not None:
+                self.set_line(self.knotsLine, self.knotEditor.samples)
+        for piece in self.dragPieces:
+            piece.update()
+        self.pointsModel.set_point(index, x, y)
+
+    def drag_finished(self, index, x, y):
+        for piece in self.dragPieces:
+            piece.restore()
+        self.dragPieces = []
+
+    def show_interpolation(self, out):
+        # an interpolating curve may leave the points' bounding box
+        if self.view is not None:
+            self.curveLine.set_points(out.T)
+            self.view.fit()
+            return
+        self.curveLine.set_data(out[0], out[1])
+        self.figure.ax.relim()
+        self.figure.ax.autoscale_view()
+        self.lod.add(self.curveLine, out.T)
+        self.figure.draw_idle()
+
+    def show_curve(self, out):
+        # a curve tessellated again for the current zoom keeps the view
+        self.set_line(self.curveLine, out.T)
+        self.redraw()
+
+    def draw_approximation(self):
+        self.runner.cancel()
+        self.update_values()
+        plist = self.points
+
+        if plist is None:
+            self.clear_plot()
+            return
+        degree = self.degree
+        if degree is None:
+            return
+
+        ctr = np.array(plist, dtype=np.float64)
+        self.errorLabel.hide()
+        self.start_approximation('Approximated B-Spline Curve', ctr)
+        self.runner.submit(fit_approximation, (self.curve_cache, ctr, self.controlCountField.value(), degree,
+                           self.parameterizationField.currentText(), self.smoothingField.value()), self.show_approximation)
+
+    def approximate_file(self):
+        # the points are streamed from the file and never loaded into the table
+        filename = QFileDialog.getOpenFileName(self, 'Open File', '', 'Point Files (*.txt *.crv)')[0]
+        if filename == '':
+            return
+        degree = self.get_degree()
+        if degree is None:
+            return
+
+        if filename.endswith(binary.EXTENSION):
+            try:
+                source = binary.load_binary(filename, mode='r').points
+            except (OSError, ValueError) as e:
+                self.errorLabel.setText('Error: ' + str(e))
+                self.errorLabel.show()
+                return
+        else:
+            source = lambda: loaders.iter_point_chunks(filename)
+
+        self.runner.cancel()
+        self.errorLabel.hide()
+        self.start_approximation('Approximated B-Spline Curve', None)
+        self.runner.submit(approximate, (source, self.controlCountField.value(), degree,
+                           self.parameterizationField.currentText(), self.smoothingField.value()), self.show_approximation)
+
+    def start_approximation(self, title, data):
+        # data is None for streamed files, the plot then follows the fit
+        self.residualLabel.hide()
+        if self.view is not None:
+            self.reset_lod()
+            self.view.clear(title)
+            if data is not None:
+                self.view.plot(data, label='Data points', color='r', linestyle='', marker='o', markersize=3)
+            self.fitPolygonLine = self.view.plot(label='Control polygon', color='k', linestyle='--', marker='o', markersize=4)
+            self.curveLine = self.view.plot(label='Approximated B-spline', color='b')
+            self.knotsLine = None
+            if data is not None:
+                self.view.fit(data)
+            self.view.legend()
+            return
+
+        # clearing the axes drops their callbacks, the LOD connects afterwards
+        self.figure.ax.clear()
+        self.reset_lod()
+        self.figure.ax.set_xlabel('x')
+        self.figure.ax.set_ylabel('y')
+        self.figure.ax.grid()
+        self.figure.ax.set_title(title)
+        if data is not None:
+            points, = self.figure.ax.plot(data[:, 0], data[:, 1], 'r.', markersize=3, label='Data points')
+            self.lod.add(points, data, markers=True)
+        self.fitPolygonLine, = self.figure.ax.plot([], [], 'ko--', markersize=4, label='Control polygon')
+        self.curveLine, = self.figure.ax.plot([], [], 'b', label='Approximated B-spline')
+        self.knotsLine = None
+        # placing the legend at 'best' scans every data point
+        self.figure.ax.legend(loc='upper right')
+        self.figure.draw()
+
+    def show_approximation(self, result):
+        spline, residuals = result
+        self.show_residuals(residuals)
+        control_points = spline.control_points
+        if self.view is not None:
+            self.fitPolygonLine.set_points(control_points)
+            self.view.fit()
+            matrix = self.view.pixel_matrix()
+        else:
+            self.fitPolygonLine.set_data(control_points[:, 0], control_points[:, 1])
+            self.figure.ax.relim()
+            self.figure.ax.autoscale_view()
+            self.lod.add(self.fitPolygonLine, control_points, markers=True)
+            matrix = pixel_matrix(self.figure.ax.transData)
+            self.figure.draw_idle()
+        workers = self.workersField.value()
+        self.tessellate = lambda matrix: self.runner.submit(sample_bspline_adaptive, (self.curve_cache, control_points, spline.degree, spline.knots,
+                                                                                      matrix, PIXEL_TOLERANCE, workers), self.show_approximation_curve)
+        self.tessellate(matrix)
+        self.zoom.track(matrix)
+
+    def show_approximation_curve(self, result):
+        # the curve lies in the hull of its control points, already in view
+        self.show_curve(result[1].T)
+
+    def show_residuals(self, residuals):
+        count = sum(r.count for r in residuals)
+        rms = np.sqrt(sum(r.rms ** 2 * r.count for r in residuals) / count)
+        worst = max(residuals, key=lambda r: r.rms)
+        self.residualLabel.setText(f'Residual RMS {rms:.4g}, max {max(r.max for r in residuals):.4g} over {count} points; '
+                                   f'worst chunk rows {worst.start}-{worst.start + worst.count - 1} (RMS {worst.rms:.4g})')
+        lines = [f'rows {r.start}-{r.start + r.count - 1}: RMS {r.rms:.4g}, max {r.max:.4g}' for r in residuals[:RESIDUAL_TOOLTIP_ROWS]]
+        if len(residuals) > RESIDUAL_TOOLTIP_ROWS:
+            lines.append(f'... {len(residuals) - RESIDUAL_TOOLTIP_ROWS} more chunks')
+        self.residualLabel.setToolTip('\n'.join(lines))
+        self.residualLabel.show()
+
+    def show_job_error(self, message):
+        self.errorLabel.setText('Error: ' + message)
+        self.errorLabel.show()
+
+    def export_image(self):
+        # the scene renderer is for editing, pictures are still drawn by matplotlib
+        from batch.render import render_curve
+
+        self.update_values()
+        if self.points is None or self.degree is None:
+            return
+
+        filename = QFileDialog.getSaveFileName(self, 'Save Image', '', 'Images (*.png *.svg)')[0]
+        if filename == '':
+            return
+
+        knots = self.get_knot_vector() if self.knotVectorField.text() != '' else None
+        try:
+            render_curve(loaders.CurveRecord('bspline', np.asarray(self.points, dtype=np.float64), self.degree, knots), filename)
+        except (OSError, ValueError) as e:
+            self.errorLabel.setText('Error: ' + str(e))
+            self.errorLabel.show()
+
     def open_animation_window(self):
         self.update_values()
         
-        if self.points is None or self.degree is None or self.points == [] or len(self.points) < 2:
+        if self.points is None or self.degree is None or len(self.points) < 2:
             self.errorLabel.setText('Error: Not enough points')
             return
         
@@ -427,26 +939,16 @@ class BSplineWidget(QWidget):
         
         self.errorLabel.hide()
     
-        self.anim_window = AnimationWindow(self.points, self.degree, knots)
+        self.anim_window = AnimationWindow(self.points, self.degree, knots, self.curve_cache)
         self.anim_window.show()
         
     def random_data(self):
-        self.figure.ax.clear()
+        self.clear_plot()
         
         n = np.random.randint(2, 10)
-        if self.pointsArray:
-            self.clear_points()
-        for i in range(n):
-            self.add_point()
-            x = np.random.randint(0, 10)
-            y = np.random.randint(0, 10)
-            pointLayout = self.pointsArray[-1]
-            xField = pointLayout.itemAt(1).widget()
-            yField = pointLayout.itemAt(2).widget()
-            xField.setText(str(x))
-            yField.setText(str(y))
+        self.pointsModel.set_points(np.random.randint(0, 10, (n, 2)))
             
-        degree = np.random.randint(1, len(self.pointsArray))
+        degree = np.random.randint(1, n)
         self.degreeField.setText(str(degree))
         
         self.generate_knots()
@@ -455,75 +957,54 @@ class BSplineWidget(QWidget):
         filename = QFileDialog.getOpenFileName(self, 'Open File', '', 'Text Files (*.txt)')[0]
         if filename == '':
             return
-        
-        with open(filename, 'r') as file:
-            lines = file.readlines()
-
-            self.figure.ax.clear()
-            points_line = lines[0].strip()
-            points = []
-            points_str = points_line[1:-1].replace('), (', '),(').split('),(')
-
-            for point_str in points_str:
-                point = point_str.split(',')
-                points.append((float(point[0]), float(point[1])))
-
-            self.clear_points()
-            for point in points:
-                self.add_point()
-                pointLayout = self.pointsArray[-1]
-                xField = pointLayout.itemAt(1).widget()
-                yField = pointLayout.itemAt(2).widget()
-                xField.setText(str(point[0]))
-                yField.setText(str(point[1]))
-            
-            degree = int(lines[1].strip())
-            self.degreeField.setText(str(degree))
-            
-            self.knotVectorField.setText('')
-            if len(lines) > 2:
-                knots = []
-                knots_line = lines[2].strip()
-                knots = list(map(float, knots_line.split()))
-                self.knotVectorField.setText(' '.join(map(str, knots)))
+        self.load_file(loaders.load_bspline_txt, filename)
         
     def get_json_data(self):
         filename = QFileDialog.getOpenFileName(self, 'Open File', '', 'JSON Files (*.json)')[0]
         if filename == '':
             return
+        self.load_file(loaders.load_json, filename)
 
-        with open(filename, 'r') as file:
-            json_data = json.load(file)
+    def get_binary_data(self):
+        filename = QFileDialog.getOpenFileName(self, 'Open File', '', 'Binary Curve Files (*.crv)')[0]
+        if filename == '':
+            return
+        self.load_file(binary.load_binary, filename)
 
-            if 'points' not in json_data or 'degree' not in json_data:
-                self.errorLabel.setText('Error: JSON file does not contain points or degree')
-                self.errorLabel.show()
-                return
+    def export_binary_data(self):
+        self.update_values()
+        if self.points is None or self.degree is None:
+            return
+        
+        filename = QFileDialog.getSaveFileName(self, 'Save File', '', 'Binary Curve Files (*.crv)')[0]
+        if filename == '':
+            return
+        if not filename.endswith(binary.EXTENSION):
+            filename += binary.EXTENSION
+        
+        knots = self.get_knot_vector() if self.knotVectorField.text() != '' else None
+        try:
+            binary.save_binary(filename, loaders.CurveRecord('bspline', self.points, self.degree, knots))
+        except (OSError, ValueError) as e:
+            self.errorLabel.setText('Error: ' + str(e))
+            self.errorLabel.show()
 
-            self.figure.ax.clear()
-            
-            points_str = json_data['points']
-            points = re.findall(r'\(([^)]+)\)', points_str)
-            points = [tuple(map(float, point.split(','))) for point in points]
-
-            if self.pointsArray:
-                self.clear_points()
-                
-            for point in points:
-                self.add_point()
-                pointLayout = self.pointsArray[-1]
-                xField = pointLayout.itemAt(1).widget()
-                yField = pointLayout.itemAt(2).widget()
-                xField.setText(str(point[0]))
-                yField.setText(str(point[1]))
-
-            degree = json_data['degree']
-            self.degreeField.setText(str(degree))
+    def load_file(self, loader, filename):
+        try:
+            record = loader(filename)
+        except (OSError, ValueError) as e:
+            self.errorLabel.setText('Error: ' + str(e))
+            self.errorLabel.show()
+            return
 
-            self.knotVectorField.setText('')
-            if 'knots' in json_data and json_data['knots'] != 'None':
-                knots_str = json_data['knots']
-                knots = list(map(float, knots_str.split()))
-                self.knotVectorField.setText(' '.join(map(str, knots)))
+        self.errorLabel.hide()
+        self.clear_plot()
+        self.show_record(record)
 
-                
\ No newline at end of file
+    def show_record(self, record):
+        self.pointsModel.set_points(record.points)
+        self.degreeField.setText(str(record.degree))
+        if record.knots is None:
+            self.knotVectorField.setText('')
+        else:
+            self.knotVectorField.setText(' '.join(map(str, record.knots)))
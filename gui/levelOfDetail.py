@@ -0,0 +1,118 @@
+from PyQt5.QtCore import QObject, QTimer
+
+import numpy as np
+
+from curves.lod import LOD_THRESHOLD, decimate_polyline
+
+# a curve is tessellated again once the scale has not changed for this long (ms)
+RETESSELLATE_DELAY = 150
+# relative scale change below which the tessellation is kept
+SCALE_TOLERANCE = 1e-6
+
+
+class LevelOfDetail:
+    '''
+    keeps the lines registered with add() decimated for the current view
+    of ax; the full-resolution points stay with the caller and are only
+    read here. Decimation is redone when the limits or the canvas size change
+    '''
+    def __init__(self, ax, threshold=LOD_THRESHOLD):
+        self.ax = ax
+        self.threshold = threshold
+        self.lines = []
+        self.view = None
+        ax.callbacks.connect('xlim_changed', self.limits_changed)
+        ax.callbacks.connect('ylim_changed', self.limits_changed)
+        self.resize_cid = ax.figure.canvas.mpl_connect('resize_event', self.limits_changed)
+
+    def add(self, line, points, markers=False):
+        self.remove(line)
+        points = np.asarray(points, dtype=np.float64)
+        if len(points) <= self.threshold:
+            # the mask of an earlier decimation would thin the full data
+            line.set_data(points[:, 0], points[:, 1])
+            line.set_markevery(None)
+            return
+        self.lines.append((line, points, markers))
+        self.update_line(line, points, markers)
+
+    def remove(self, line):
+        self.lines = [entry for entry in self.lines if entry[0] is not line]
+
+    def limits_changed(self, *args):
+        if not self.lines:
+            return
+        # x and y limits usually change together, decimate once per new view
+        view = (tuple(self.ax.viewLim.bounds), tuple(self.ax.bbox.bounds))
+        if view == self.view:
+            return
+        self.view = view
+        for line, points, markers in self.lines:
+            self.update_line(line, points, markers)
+
+    def update_line(self, line, points, markers):
+        pixels = self.ax.transData.transform(points)
+        viewport = self.ax.bbox.extents
+        if markers:
+            data, mask = decimate_polyline(points, pixels, viewport, markers=True)
+            line.set_data(data[:, 0], data[:, 1])
+            line.set_markevery(mask)
+        else:
+            data = decimate_polyline(points, pixels, viewport)
+            line.set_data(data[:, 0], data[:, 1])
+
+    def close(self):
+        self.lines = []
+        self.ax.figure.canvas.mpl_disconnect(self.resize_cid)
+
+
+class ZoomTracker(QObject):
+    '''
+    re-runs the adaptive tessellation of a curve once the data -> pixel scale
+    of its plot settles at a new value: changed() (connected to the redraws
+    or view changes) restarts a debounce timer, and when it fires with a
+    scale other than the tracked one, callback(matrix) is called. Panning
+    keeps the scale and is ignored; while busy() the check is postponed
+    '''
+    def __init__(self, pixel_matrix, callback, busy, delay=RETESSELLATE_DELAY, parent=None):
+        super().__init__(parent)
+        self.pixel_matrix = pixel_matrix
+        self.callback = callback
+        self.busy = busy
+        self.matrix = None
+        self.stale = False
+        self.timer = QTimer(self)
+        self.timer.setSingleShot(True)
+        self.timer.setInterval(delay)
+        self.timer.timeout.connect(self.check)
+
+    def track(self, matrix):
+        '''
+        the scale the shown curve was tessellated at, None stops tracking
+        '''
+        self.matrix = matrix
+        self.stale = False
+        if matrix is None:
+            self.timer.stop()
+
+    def expire(self):
+        # the tessellation for the current scale was dropped, redo it when idle
+        if self.matrix is not None:
+            self.stale = True
+            self.timer.start()
+
+    def changed(self, *args):
+        if self.matrix is not None:
+            self.timer.start()
+
+    def check(self):
+        if self.matrix is None:
+            return
+        if self.busy():
+            self.timer.start()
+            return
+        matrix = self.pixel_matrix()
+        # limits moved by a pan keep their span up to rounding
+        if self.stale or not np.allclose(matrix, self.matrix, rtol=SCALE_TOLERANCE, atol=0):
+            self.track(matrix)
+            self.callback(matrix)
@@ -1,6 +1,4 @@
 from PyQt5.QtWidgets import *
-from . import bezierWidget
-from . import bsplineWidget
 
 class MainFrame(QMainWindow):
     def __init__(self):
@@ -26,17 +24,25 @@ class MainFrame(QMainWindow):
         self.stacked_widget = QStackedWidget()
         self.layout.addWidget(self.stacked_widget)
 
-        self.bspline_widget = bsplineWidget.BSplineWidget()
-        self.bezier_widget = bezierWidget.BezierWidget()
-
-        self.stacked_widget.addWidget(self.bspline_widget)
-        self.stacked_widget.addWidget(self.bezier_widget)
+        # pages (and the matplotlib/scipy imports behind them) are built on first use
+        self.bspline_widget = None
+        self.bezier_widget = None
 
         self.button1.clicked.connect(self.show_bspline_widget)
         self.button2.clicked.connect(self.show_bezier_widget)
 
+        self.show_bspline_widget()
+
     def show_bspline_widget(self):
+        if self.bspline_widget is None:
+            from . import bsplineWidget
+            self.bspline_widget = bsplineWidget.BSplineWidget()
+            self.stacked_widget.addWidget(self.bspline_widget)
         self.stacked_widget.setCurrentWidget(self.bspline_widget)
 
     def show_bezier_widget(self):
-        self.stacked_widget.setCurrentWidget(self.bezier_widget)
\ No newline at end of file
+        if self.bezier_widget is None:
+            from . import bezierWidget
+            self.bezier_widget = bezierWidget.BezierWidget()
+            self.stacked_widget.addWidget(self.bezier_widget)
+        self.stacked_widget.setCurrentWidget(self.bezier_widget)
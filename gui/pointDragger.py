@@ -0,0 +1,245 @@
+from PyQt5.QtCore import QObject, QTimer, Qt, pyqtSignal
+from PyQt5.QtGui import QGuiApplication
+
+import numpy as np
+
+from curves.adaptive import pixel_matrix
+
+# how close (in pixels) a press has to be to a control point to grab it
+PICK_RADIUS = 8
+DEFAULT_REFRESH_RATE = 60
+
+
+class PointPicker:
+    '''
+    finds the point within radius pixels of a data position; the KD-tree
+    over the points in pixel space is rebuilt only when the points are
+    invalidated or the data -> pixel scale changes
+    '''
+    def __init__(self, radius=PICK_RADIUS):
+        self.radius = radius
+        self.points = None
+        self.tree = None
+        self.tree_key = None
+
+    def set_points(self, points):
+        self.points = points
+        self.invalidate()
+
+    def invalidate(self):
+        self.tree = None
+
+    def pick(self, x, y, matrix):
+        '''
+        matrix: the 2x2 data -> pixel scale (distances do not depend on the
+        offset); returns the index of the nearest point or None
+        '''
+        from scipy.spatial import cKDTree
+
+        if self.points is None or len(self.points) == 0:
+            return None
+        key = matrix.tobytes()
+        if self.tree is None or key != self.tree_key:
+            self.tree = cKDTree(self.points @ matrix.T)
+            self.tree_key = key
+        distance, index = self.tree.query(np.array([x, y]) @ matrix.T, distance_upper_bound=self.radius)
+        return None if np.isinf(distance) else int(index)
+
+
+class MotionBuffer(QObject):
+    '''
+    keeps only the latest cursor position and hands it to callback(x, y)
+    at most once per display refresh
+    '''
+    def __init__(self, callback, parent=None):
+        super().__init__(parent)
+        self.callback = callback
+        self.position = None
+
+        screen = QGuiApplication.primaryScreen()
+        rate = screen.refreshRate() if screen is not None else 0
+        self.timer = QTimer(self)
+        self.timer.setSingleShot(True)
+        self.timer.setTimerType(Qt.PreciseTimer)
+        self.timer.setInterval(round(1000 / (rate if rate > 0 else DEFAULT_REFRESH_RATE)))
+        self.timer.timeout.connect(self.flush)
+
+    def push(self, x, y):
+        self.position = (x, y)
+        if not self.timer.isActive():
+            self.timer.start()
+
+    def flush(self):
+        # also called directly, to deliver the last position right away
+        self.timer.stop()
+        if self.position is None:
+            return
+        x, y = self.position
+        self.position = None
+        self.callback(x, y)
+
+    def cancel(self):
+        self.timer.stop()
+        self.position = None
+
+
+class PointDragger(QObject):
+    '''
+    lets the user drag control points on a matplotlib axes\n
+    presses are hit-tested by a PointPicker in pixel space. Slots of
+    dragStarted choose the artists that move with set_artists; they are
+    animated for the drag and blitted over a background saved when it
+    started. Motion events go through a MotionBuffer, at most one
+    dragMoved is emitted per display refresh
+    '''
+    dragStarted = pyqtSignal(int)
+    dragMoved = pyqtSignal(int, float, float)
+    dragFinished = pyqtSignal(int, float, float)
+
+    def __init__(self, canvas, ax, radius=PICK_RADIUS, parent=None):
+        super().__init__(parent)
+        self.canvas = canvas
+        self.ax = ax
+        self.picker = PointPicker(radius)
+        self.motion = MotionBuffer(self.move, self)
+        self.artists = []
+        self.index = None
+        self.background = None
+
+        self.cids = [
+            canvas.mpl_connect('button_press_event', self.on_press),
+            canvas.mpl_connect('motion_notify_event', self.on_motion),
+            canvas.mpl_connect('button_release_event', self.on_release),
+        ]
+
+    @property
+    def points(self):
+        return self.picker.points
+
+    def set_points(self, points):
+        '''
+        points: the (N, 2) array to pick from (None disables dragging); it
+        is read, never written, and may change between drags
+        '''
+        self.cancel()
+        self.picker.set_points(points)
+
+    def set_artists(self, artists):
+        self.artists = list(artists)
+
+    def invalidate(self):
+        self.picker.invalidate()
+
+    def pick(self, x, y):
+        return self.picker.pick(x, y, pixel_matrix(self.ax.transData))
+
+    def is_dragging(self):
+        return self.index is not None
+
+    def on_press(self, event):
+        if self.points is None or len(self.points) == 0 or event.button != 1 or event.inaxes is not self.ax:
+            return
+        # leave the canvas to the toolbar while panning or zooming
+        toolbar = getattr(self.canvas, 'toolbar', None)
+        if toolbar is not None and toolbar.mode:
+            return
+        index = self.pick(event.xdata, event.ydata)
+        if index is None:
+            return
+
+        self.index = index
+        self.motion.cancel()
+        self.artists = []
+        self.dragStarted.emit(index)
+        for artist in self.artists:
+            artist.set_animated(True)
+        self.canvas.draw()
+        self.background = self.canvas.copy_from_bbox(self.ax.bbox)
+        self.blit()
+
+    def on_motion(self, event):
+        if self.index is None or event.inaxes is not self.ax:
+            return
+        self.motion.push(event.xdata, event.ydata)
+
+    def on_release(self, event):
+        if self.index is None or event.button != 1:
+            return
+        if event.inaxes is self.ax:
+            self.motion.push(event.xdata, event.ydata)
+        self.motion.flush()
+
+        index = self.index
+        x, y = self.points[index]
+        self.index = None
+        self.background = None
+        for artist in self.artists:
+            artist.set_animated(False)
+        self.artists = []
+        self.invalidate()
+        self.dragFinished.emit(index, x, y)
+        self.canvas.draw_idle()
+
+    def move(self, x, y):
+        if self.index is None:
+            return
+        self.dragMoved.emit(self.index, x, y)
+        self.blit()
+
+    def blit(self):
+        if self.background is None:
+            return
+        self.canvas.restore_region(self.background)
+        for artist in self.artists:
+            self.ax.draw_artist(artist)
+        self.canvas.blit(self.ax.bbox)
+
+    def cancel(self):
+        if self.index is None:
+            return
+        self.motion.cancel()
+        self.index = None
+        self.background = None
+        for artist in self.artists:
+            artist.set_animated(False)
+        self.artists = []
+
+    def close(self):
+        self.cancel()
+        for cid in self.cids:
+            self.canvas.mpl_disconnect(cid)
+
+
+class DragPiece:
+    '''
+    the part of a plotted line that moves while a point is dragged: rows
+    [lo, hi) of data are cut out of the static line and drawn by an animated
+    copy, with one row of overlap on each side so both join up
+    '''
+    def __init__(self, lod, line, data, lo, hi, markers=False):
+        self.lod = lod
+        self.line = line
+        self.data = data
+        self.markers = markers
+        self.start = max(lo - 1, 0)
+        self.stop = hi + 1
+
+        static = np.array(data, dtype=np.float64)
+        static[lo:hi] = np.nan
+        lod.add(line, static, markers)
+
+        self.piece, = line.axes.plot([], [])
+        self.piece.update_from(line)
+        self.piece.set_markevery(None)
+        self.piece.set_label('_nolegend_')
+        self.piece.set_animated(True)
+        self.update()
+
+    def update(self):
+        # data is updated in place by the caller
+        piece = self.data[self.start:self.stop]
+        self.piece.set_data(piece[:, 0], piece[:, 1])
+
+    def restore(self):
+        self.piece.remove()
+        self.lod.add(self.line, self.data, self.markers)
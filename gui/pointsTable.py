@@ -0,0 +1,112 @@
+from PyQt5.QtWidgets import QTableView, QHeaderView, QAbstractItemView
+from PyQt5.QtCore import Qt, QAbstractTableModel, QModelIndex
+
+import numpy as np
+
+
+class PointsTableModel(QAbstractTableModel):
+    '''
+    table model over an (N, 2) float64 array of control points\n
+    edits are written straight into the array and empty cells are NaN, so
+    curve code can read self.points without parsing any text
+    '''
+    def __init__(self, prefix='Point', parent=None):
+        super().__init__(parent)
+        self.prefix = prefix
+        self.points = np.empty((0, 2))
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.points)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else 2
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid() or role not in (Qt.DisplayRole, Qt.EditRole):
+            return None
+        value = self.points[index.row(), index.column()]
+        return '' if np.isnan(value) else f'{value:g}'
+
+    def setData(self, index, value, role=Qt.EditRole):
+        if not index.isValid() or role != Qt.EditRole:
+            return False
+        text = str(value).strip()
+        try:
+            number = float(text) if text else np.nan
+        except ValueError:
+            return False
+        self.points[index.row(), index.column()] = number
+        self.dataChanged.emit(index, index, [Qt.DisplayRole, Qt.EditRole])
+        return True
+
+    def set_point(self, row, x, y):
+        self.points[row] = (x, y)
+        self.dataChanged.emit(self.index(row, 0), self.index(row, 1), [Qt.DisplayRole, Qt.EditRole])
+
+    def flags(self, index):
+        if not index.isValid():
+            return Qt.NoItemFlags
+        return Qt.ItemIsSelectable | Qt.ItemIsEnabled | Qt.ItemIsEditable
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role != Qt.DisplayRole:
+            return None
+        if orientation == Qt.Horizontal:
+            return ('x', 'y')[section]
+        return f'{self.prefix}{section + 1}'
+
+    def set_points(self, points):
+        '''
+        float64 (N, 2) arrays are used without copying, so memory-mapped
+        point files are only paged in as rows are shown or evaluated
+        '''
+        points = np.asarray(points, dtype=np.float64)
+        if points.ndim != 2 or points.shape[1] != 2:
+            points = points.reshape(-1, 2)
+        self.beginResetModel()
+        self.points = points
+        self.endResetModel()
+
+    def resize(self, count):
+        '''
+        keep the first count points, padding with empty rows
+        '''
+        points = np.full((count, 2), np.nan)
+        keep = min(count, len(self.points))
+        points[:keep] = self.points[:keep]
+        self.set_points(points)
+
+    def set_empty(self, count):
+        self.set_points(np.full((count, 2), np.nan))
+
+    def append_point(self, x=np.nan, y=np.nan):
+        row = len(self.points)
+        self.beginInsertRows(QModelIndex(), row, row)
+        self.points = np.vstack((self.points, [[x, y]]))
+        self.endInsertRows()
+
+    def clear_values(self):
+        self.points[:] = np.nan
+        if len(self.points):
+            self.dataChanged.emit(self.index(0, 0), self.index(len(self.points) - 1, 1))
+
+    def clear(self):
+        self.set_points(np.empty((0, 2)))
+
+    def has_empty(self):
+        return bool(np.isnan(self.points).any())
+
+
+class PointsTableView(QTableView):
+    '''
+    table view for a PointsTableModel with fixed row heights, so only the
+    visible rows are ever measured or painted
+    '''
+    def __init__(self, model, parent=None):
+        super().__init__(parent)
+        self.setModel(model)
+        self.setSelectionMode(QAbstractItemView.ContiguousSelection)
+        self.setWordWrap(False)
+        self.verticalHeader().setSectionResizeMode(QHeaderView.Fixed)
+        self.verticalHeader().setDefaultSectionSize(22)
+        self.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
@@ -0,0 +1,445 @@
+'''
+retained-mode plotting on a QGraphicsScene, the 'scene' renderer\n
+every plotted line is one item that keeps its full-resolution points and
+rebuilds only its own polygons when they change; Qt repaints just the
+region the item covers. Zoom and pan are the view's own transform, the
+data is never re-projected by hand
+'''
+import numpy as np
+
+from PyQt5.QtCore import QPointF, QRectF, Qt, QTimer, pyqtSignal
+from PyQt5.QtGui import QColor, QFont, QPainter, QPen, QPolygonF, QTransform
+from PyQt5.QtWidgets import QGraphicsItem, QGraphicsScene, QGraphicsView, QHBoxLayout, QPushButton, QWidget
+
+from curves.lod import LOD_THRESHOLD, decimate_polyline
+from .animationEngine import FrameAnimator
+from .pointDragger import PICK_RADIUS, MotionBuffer, PointPicker
+
+# matplotlib's colour cycle and single letter colours, so both renderers look alike
+COLOR_CYCLE = ('#1f77b4', '#ff7f0e', '#2ca02c', '#d62728', '#9467bd', '#8c564b', '#e377c2', '#7f7f7f', '#bcbd22', '#17becf')
+COLORS = {'b': '#0000ff', 'g': '#008000', 'r': '#ff0000', 'k': '#000000'}
+# fraction of the data range added on every side by fit(), like the axes margins
+MARGIN = 0.05
+GRID_LINES = 8
+ZOOM_STEP = 1.2
+# how far (in data ranges) the view can be panned away from the data
+PAN_RANGE = 100
+
+
+def to_polygons(points):
+    '''
+    one QPolygonF per run of finite points (NaN rows break a line), filled
+    through the polygon's own buffer
+    '''
+    finite = np.isfinite(points).all(axis=1)
+    edges = np.flatnonzero(np.diff(np.concatenate(([0], finite.view(np.int8), [0]))))
+    polygons = []
+    for start, stop in zip(edges[::2], edges[1::2]):
+        polygon = QPolygonF(int(stop - start))
+        buffer = polygon.data()
+        buffer.setsize(int(stop - start) * 16)
+        np.frombuffer(buffer, dtype=np.float64).reshape(-1, 2)[:] = points[start:stop]
+        polygons.append(polygon)
+    return polygons
+
+
+def nice_step(span, count=GRID_LINES):
+    raw = span / count
+    magnitude = 10.0 ** np.floor(np.log10(raw))
+    for factor in (1, 2, 5, 10):
+        if factor * magnitude >= raw:
+            return factor * magnitude
+
+
+def ticks(lo, hi):
+    if not hi > lo:
+        return np.array([])
+    step = nice_step(hi - lo)
+    return np.arange(np.ceil(lo / step), np.floor(hi / step) + 1) * step
+
+
+class SceneLine(QGraphicsItem):
+    '''
+    a polyline with optional round markers, drawn with cosmetic pens so
+    widths stay in pixels under zoom; past LOD_THRESHOLD points the drawn
+    polygons are decimated for the current view
+    '''
+    def __init__(self, color=None, linestyle='-', linewidth=1.5, marker=None, markersize=6, markerfacecolor=None, label=None):
+        super().__init__()
+        color = QColor(COLORS.get(color, color))
+        self.label = label
+        self.pen = QPen(color, linewidth)
+        self.pen.setCosmetic(True)
+        if linestyle == '--':
+            self.pen.setStyle(Qt.DashLine)
+        elif linestyle in ('', 'None'):
+            self.pen.setStyle(Qt.NoPen)
+        self.marker_pens = []
+        if marker is not None:
+            face = QColor(COLORS.get(markerfacecolor, markerfacecolor)) if markerfacecolor is not None else None
+            for width, marker_color in ((markersize, color), (markersize - 2, face)):
+                if marker_color is None:
+                    continue
+                pen = QPen(marker_color, width)
+                pen.setCosmetic(True)
+                pen.setCapStyle(Qt.RoundCap)
+                self.marker_pens.append(pen)
+        self.extent = max(linewidth, markersize if marker else 0) / 2 + 1
+        self.points = np.empty((0, 2))
+        self.lines = []
+        self.markers = []
+        self.bounds = QRectF()
+
+    def set_data(self, x, y):
+        # same call as Line2D.set_data, so FrameAnimator can drive it
+        self.set_points(np.column_stack((x, y)))
+
+    def set_points(self, points):
+        self.points = np.asarray(points, dtype=np.float64).reshape(-1, 2)
+        self.refresh()
+
+    def view(self):
+        scene = self.scene()
+        return scene.views()[0] if scene is not None and scene.views() else None
+
+    def refresh(self):
+        points = self.points
+        mask = None
+        view = self.view()
+        if view is not None and len(points) > LOD_THRESHOLD:
+            pixels = view.to_pixels(points)
+            viewport = (0, 0, view.viewport().width(), view.viewport().height())
+            if self.marker_pens:
+                points, mask = decimate_polyline(points, pixels, viewport, markers=True)
+            else:
+                points = decimate_polyline(points, pixels, viewport)
+
+        self.lines = to_polygons(points) if self.pen.style() != Qt.NoPen else []
+        self.markers = to_polygons(points if mask is None else points[mask]) if self.marker_pens else []
+
+        finite = points[np.isfinite(points).all(axis=1)]
+        self.prepareGeometryChange()
+        if len(finite):
+            # the pens reach extent pixels past the points
+            sx, sy = view.pixel_size() if view is not None else (0.0, 0.0)
+            (x0, y0), (x1, y1) = finite.min(axis=0), finite.max(axis=0)
+            self.bounds = QRectF(QPointF(x0 - sx * self.extent, y0 - sy * self.extent), QPointF(x1 + sx * self.extent, y1 + sy * self.extent))
+        else:
+            self.bounds = QRectF()
+        self.update()
+
+    def boundingRect(self):
+        return self.bounds
+
+    def paint(self, painter, option, widget=None):
+        painter.setPen(self.pen)
+        for polygon in self.lines:
+            painter.drawPolyline(polygon)
+        for pen in self.marker_pens:
+            painter.setPen(pen)
+            for polygon in self.markers:
+                painter.drawPoints(polygon)
+
+
+class SceneView(QGraphicsView):
+    '''
+    y-up plot view over a QGraphicsScene: the wheel zooms around the cursor,
+    dragging empty space (or with the middle button) pans, a double click
+    fits the data again. Control points given to set_points can be dragged,
+    with the same picking, refresh-rate coalescing and signals as
+    PointDragger
+    '''
+    dragStarted = pyqtSignal(int)
+    dragMoved = pyqtSignal(int, float, float)
+    dragFinished = pyqtSignal(int, float, float)
+    # emitted once the items are refreshed for a new zoom, pan or size
+    viewChanged = pyqtSignal()
+
+    def __init__(self, parent=None, radius=PICK_RADIUS):
+        super().__init__(parent)
+        self.setScene(QGraphicsScene(self))
+        self.setRenderHint(QPainter.Antialiasing)
+        self.setViewportUpdateMode(QGraphicsView.SmartViewportUpdate)
+        self.setTransformationAnchor(QGraphicsView.AnchorUnderMouse)
+        self.setHorizontalScrollBarPolicy(Qt.ScrollBarAlwaysOff)
+        self.setVerticalScrollBarPolicy(Qt.ScrollBarAlwaysOff)
+        self.setBackgroundBrush(Qt.white)
+        self.setMinimumHeight(300)
+
+        self.picker = PointPicker(radius)
+        self.motion = MotionBuffer(self.move, self)
+        self.title = ''
+        self.show_legend = False
+        self.lines = []
+        self.cycle = 0
+        self.limits = None
+        self.index = None
+        self.pan_origin = None
+
+        # zoom, pan and resize steps are coalesced into one refresh
+        self.refresh_timer = QTimer(self)
+        self.refresh_timer.setSingleShot(True)
+        self.refresh_timer.setInterval(0)
+        self.refresh_timer.timeout.connect(self.refresh)
+
+    def clear(self, title=''):
+        self.cancel()
+        self.scene().clear()
+        self.lines = []
+        self.cycle = 0
+        self.picker.set_points(None)
+        self.title = title
+        self.show_legend = False
+        self.viewport().update()
+
+    def plot(self, points=None, label=None, color=None, **style):
+        # like matplotlib, only lines without a colour advance the cycle
+        if color is None:
+            color = COLOR_CYCLE[self.cycle % len(COLOR_CYCLE)]
+            self.cycle += 1
+        line = SceneLine(color=color, label=label, **style)
+        self.scene().addItem(line)
+        self.lines.append(line)
+        if points is not None:
+            line.set_points(points)
+        return line
+
+    def legend(self):
+        self.show_legend = True
+        self.viewport().update()
+
+    def fit(self, points=None):
+        '''
+        show points (by default everything plotted) with a margin around them
+        '''
+        if points is None:
+            points = np.concatenate([line.points for line in self.lines] + [np.empty((0, 2))])
+        points = np.asarray(points, dtype=np.float64).reshape(-1, 2)
+        points = points[np.isfinite(points).all(axis=1)]
+        if len(points) == 0:
+            lo, hi = np.zeros(2), np.ones(2)
+        else:
+            lo, hi = points.min(axis=0), points.max(axis=0)
+        span = hi - lo
+        span = np.where(span > 0, span, np.maximum(np.abs(lo), 1.0))
+        self.set_limits(lo - span * MARGIN, hi + span * MARGIN)
+
+    def set_limits(self, lo, hi):
+        self.limits = (np.asarray(lo, dtype=np.float64), np.asarray(hi, dtype=np.float64))
+        lo, hi = self.limits
+        span = hi - lo
+        # a scene rect around the data leaves room to pan
+        self.setSceneRect(QRectF(lo[0] - PAN_RANGE * span[0], lo[1] - PAN_RANGE * span[1], (2 * PAN_RANGE + 1) * span[0], (2 * PAN_RANGE + 1) * span[1]))
+        size = self.viewport().size()
+        self.setTransform(QTransform(max(size.width(), 1) / span[0], 0, 0, -max(size.height(), 1) / span[1], 0, 0))
+        self.centerOn(*((lo + hi) / 2))
+        self.view_changed()
+
+    def visible_limits(self):
+        rect = self.mapToScene(self.viewport().rect()).boundingRect()
+        return np.array([rect.left(), rect.top()]), np.array([rect.right(), rect.bottom()])
+
+    def to_pixels(self, points):
+        t = self.viewportTransform()
+        matrix = np.array([[t.m11(), t.m21()], [t.m12(), t.m22()]])
+        return points @ matrix.T + (t.dx(), t.dy())
+
+    def pixel_matrix(self):
+        # data -> pixel scale without the offset, like curves.adaptive.pixel_matrix
+        t = self.viewportTransform()
+        return np.array([[t.m11(), t.m21()], [t.m12(), t.m22()]])
+
+    def pixel_size(self):
+        t = self.viewportTransform()
+        return 1 / abs(t.m11()) if t.m11() else 0.0, 1 / abs(t.m22()) if t.m22() else 0.0
+
+    def view_changed(self):
+        self.refresh_timer.start()
+
+    def refresh(self):
+        for line in self.lines:
+            line.refresh()
+        # ticks and labels sit on the viewport, not in the scene
+        self.viewport().update()
+        self.viewChanged.emit()
+
+    # point dragging, the PointDragger interface
+
+    @property
+    def points(self):
+        return self.picker.points
+
+    def set_points(self, points):
+        self.cancel()
+        self.picker.set_points(points)
+
+    def invalidate(self):
+        self.picker.invalidate()
+
+    def is_dragging(self):
+        return self.index is not None
+
+    def cancel(self):
+        self.motion.cancel()
+        self.index = None
+
+    def pick(self, position):
+        # position in viewport pixels
+        point = self.mapToScene(position.toPoint())
+        return self.picker.pick(point.x(), point.y(), self.pixel_matrix())
+
+    def move(self, x, y):
+        if self.index is not None:
+            self.dragMoved.emit(self.index, x, y)
+
+    # events
+
+    def mousePressEvent(self, event):
+        if event.button() == Qt.LeftButton and self.points is not None and len(self.points):
+            index = self.pick(event.localPos())
+            if index is not None:
+                self.index = index
+                self.dragStarted.emit(index)
+                return
+        if event.button() in (Qt.LeftButton, Qt.MiddleButton):
+            self.pan_origin = event.pos()
+            self.viewport().setCursor(Qt.ClosedHandCursor)
+            return
+        super().mousePressEvent(event)
+
+    def mouseMoveEvent(self, event):
+        if self.index is not None:
+            position = self.mapToScene(event.pos())
+            self.motion.push(position.x(), position.y())
+            return
+        if self.pan_origin is not None:
+            delta = event.pos() - self.pan_origin
+            self.pan_origin = event.pos()
+            self.horizontalScrollBar().setValue(self.horizontalScrollBar().value() - delta.x())
+            self.verticalScrollBar().setValue(self.verticalScrollBar().value() - delta.y())
+            return
+        super().mouseMoveEvent(event)
+
+    def mouseReleaseEvent(self, event):
+        if self.index is not None and event.button() == Qt.LeftButton:
+            position = self.mapToScene(event.pos())
+            self.motion.push(position.x(), position.y())
+            self.motion.flush()
+            index = self.index
+            self.index = None
+            self.invalidate()
+            x, y = self.points[index]
+            self.dragFinished.emit(index, x, y)
+            return
+        if self.pan_origin is not None:
+            self.pan_origin = None
+            self.viewport().unsetCursor()
+            return
+        super().mouseReleaseEvent(event)
+
+    def mouseDoubleClickEvent(self, event):
+        self.fit()
+
+    def wheelEvent(self, event):
+        factor = ZOOM_STEP ** (event.angleDelta().y() / 120)
+        self.scale(factor, factor)
+        self.view_changed()
+
+    def scrollContentsBy(self, dx, dy):
+        super().scrollContentsBy(dx, dy)
+        self.view_changed()
+
+    def resizeEvent(self, event):
+        # keep showing the same data range, stretched to the new size
+        limits = self.visible_limits() if self.limits is not None and event.oldSize().isValid() else self.limits
+        super().resizeEvent(event)
+        if limits is not None:
+            lo, hi = limits
+            self.set_limits(np.minimum(lo, hi), np.maximum(lo, hi))
+
+    # decorations
+
+    def drawBackground(self, painter, rect):
+        super().drawBackground(painter, rect)
+        pen = QPen(QColor(220, 220, 220), 1)
+        pen.setCosmetic(True)
+        painter.setPen(pen)
+        for x in ticks(rect.left(), rect.right()):
+            painter.drawLine(QPointF(x, rect.top()), QPointF(x, rect.bottom()))
+        for y in ticks(rect.top(), rect.bottom()):
+            painter.drawLine(QPointF(rect.left(), y), QPointF(rect.right(), y))
+
+    def drawForeground(self, painter, rect):
+        painter.save()
+        painter.resetTransform()
+        width, height = self.viewport().width(), self.viewport().height()
+        painter.setPen(Qt.black)
+        metrics = painter.fontMetrics()
+
+        (x0, y0), (x1, y1) = self.visible_limits()
+        for x in ticks(min(x0, x1), max(x0, x1)):
+            px = self.to_pixels(np.array([[x, 0.0]]))[0, 0]
+            painter.drawText(QPointF(px + 2, height - 4), f'{x:g}')
+        for y in ticks(min(y0, y1), max(y0, y1)):
+            py = self.to_pixels(np.array([[0.0, y]]))[0, 1]
+            painter.drawText(QPointF(4, py - 2), f'{y:g}')
+
+        if self.title:
+            font = QFont(painter.font())
+            font.setBold(True)
+            painter.setFont(font)
+            painter.drawText(QRectF(0, 4, width, metrics.height() + 4), Qt.AlignHCenter, self.title)
+            painter.setFont(self.font())
+
+        entries = [line for line in self.lines if line.label and not line.label.startswith('_')]
+        if self.show_legend and entries:
+            row = metrics.height() + 4
+            box = QRectF(0, 0, 40 + max(metrics.horizontalAdvance(line.label) for line in entries), row * len(entries) + 8)
+            box.moveTopRight(QPointF(width - 8, 8))
+            painter.setPen(QColor(200, 200, 200))
+            painter.setBrush(QColor(255, 255, 255, 220))
+            painter.drawRect(box)
+            for k, line in enumerate(entries):
+                y = box.top() + 4 + row * k + row / 2
+                sample = QPolygonF([QPointF(box.left() + 6, y), QPointF(box.left() + 30, y)])
+                painter.setPen(line.pen)
+                painter.drawPolyline(sample)
+                for pen in line.marker_pens:
+                    painter.setPen(pen)
+                    painter.drawPoint(QPointF(box.left() + 18, y))
+                painter.setPen(Qt.black)
+                painter.drawText(QPointF(box.left() + 36, y + metrics.ascent() / 2 - 1), line.label)
+        painter.restore()
+
+
+class SceneAnimator(FrameAnimator):
+    '''
+    FrameAnimator on a SceneView: the level lines are SceneLines, setting
+    their data is all a frame needs, there is no background to blit over
+    '''
+    def connect_canvas(self):
+        pass
+
+    def disconnect_canvas(self):
+        pass
+
+    def blit(self):
+        pass
+
+
+class SceneToolbar(QWidget):
+    '''
+    Fit and Export image buttons for a SceneView; export is handed to the
+    given callback, which writes the picture with matplotlib
+    '''
+    def __init__(self, view, export, parent=None):
+        super().__init__(parent)
+        layout = QHBoxLayout(self)
+        layout.setContentsMargins(0, 0, 0, 0)
+        self.fitButton = QPushButton('Fit')
+        self.fitButton.clicked.connect(lambda: view.fit())
+        self.exportButton = QPushButton('Export image')
+        self.exportButton.clicked.connect(export)
+        layout.addWidget(self.fitButton)
+        layout.addWidget(self.exportButton)
+        layout.addStretch()
@@ -0,0 +1,13 @@
+'''
+application wide settings\n
+RENDERER selects how the editing widgets draw their plots: 'matplotlib'
+(FigureCanvasQTAgg) or 'scene' (retained QGraphicsScene items, see
+sceneView). It is read from the CURVES_RENDERER environment variable and
+can be overridden with main.py --renderer before the widgets are built
+'''
+import os
+
+RENDERERS = ('matplotlib', 'scene')
+RENDERER = os.environ.get('CURVES_RENDERER', 'matplotlib')
+if RENDERER not in RENDERERS:
+    raise ValueError(f"Unknown CURVES_RENDERER '{RENDERER}', expected one of: {', '.join(RENDERERS)}")
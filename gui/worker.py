@@ -0,0 +1,103 @@
+from PyQt5.QtCore import QCoreApplication, QObject, QRunnable, QThreadPool, pyqtSignal
+
+
+class JobSignals(QObject):
+    finished = pyqtSignal(int, object)
+    failed = pyqtSignal(int, str)
+
+
+class Job(QRunnable):
+    '''
+    runs fn(*args) on a pool thread and reports the result through signals
+    '''
+    def __init__(self, job_id, fn, args):
+        super().__init__()
+        self.setAutoDelete(False)
+        self.job_id = job_id
+        self.fn = fn
+        self.args = args
+        self.cancelled = False
+        self.signals = JobSignals()
+
+    def run(self):
+        if self.cancelled:
+            return
+        try:
+            result = self.fn(*self.args)
+        except Exception as e:
+            self.signals.failed.emit(self.job_id, str(e))
+            return
+        self.signals.finished.emit(self.job_id, result)
+
+
+class JobRunner(QObject):
+    '''
+    submits evaluation jobs to a single background thread\n
+    only the most recently submitted job counts: submitting a new one removes
+    any job still queued and drops the result of the one already running, so
+    the callback only ever sees results for the latest inputs; the callback
+    runs on the GUI thread
+    '''
+    busy = pyqtSignal(bool)
+    failed = pyqtSignal(str)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.pool = QThreadPool(self)
+        self.pool.setMaxThreadCount(1)
+        self.latest = 0
+        self.jobs = {}
+        # finished jobs are kept until the pool is idle, so a runnable is never
+        # deleted while its thread is still returning from run()
+        self.retired = []
+        app = QCoreApplication.instance()
+        if app is not None:
+            app.aboutToQuit.connect(self.shutdown)
+
+    def submit(self, fn, args, callback):
+        self.cancel()
+        if self.pool.activeThreadCount() == 0:
+            self.retired.clear()
+        self.latest += 1
+        job = Job(self.latest, fn, args)
+        job.signals.finished.connect(self.on_finished)
+        job.signals.failed.connect(self.on_failed)
+        self.jobs[job.job_id] = (job, callback)
+        self.pool.start(job)
+        self.busy.emit(True)
+        return job.job_id
+
+    def cancel(self):
+        for job_id, (job, callback) in list(self.jobs.items()):
+            job.cancelled = True
+            if self.pool.tryTake(job):
+                self.retired.append(self.jobs.pop(job_id)[0])
+        if not self.jobs:
+            self.busy.emit(False)
+
+    def on_finished(self, job_id, result):
+        job, callback = self.jobs.pop(job_id, (None, None))
+        if job is not None:
+            self.retired.append(job)
+        if not self.jobs:
+            self.busy.emit(False)
+        if job_id != self.latest or job is None:
+            return
+        callback(result)
+
+    def on_failed(self, job_id, message):
+        job, callback = self.jobs.pop(job_id, (None, None))
+        if job is not None:
+            self.retired.append(job)
+        if not self.jobs:
+            self.busy.emit(False)
+        if job_id != self.latest or job is None:
+            return
+        self.failed.emit(message)
+
+    def wait(self, msecs=-1):
+        return self.pool.waitForDone(msecs)
+
+    def shutdown(self):
+        self.cancel()
+        self.pool.waitForDone()
@@ -1,10 +1,36 @@
 import sys
+import time
+
+START_TIME = time.perf_counter()
+
 from PyQt5.QtWidgets import QApplication
+from gui import settings
 from gui.mainFrame import MainFrame   
 from PyQt5.QtGui import QPalette, QColor
-from PyQt5.QtCore import Qt
+from PyQt5.QtCore import Qt, QObject, QEvent, QTimer
+
+
+class FirstPaintTimer(QObject):
+    '''
+    reports the time until the main window is first painted, then quits\n
+    used by benchmarks/startup.py through the --startup-report flag
+    '''
+    def eventFilter(self, obj, event):
+        if event.type() == QEvent.Paint:
+            obj.removeEventFilter(self)
+            print(f'first paint: {(time.perf_counter() - START_TIME) * 1000:.1f} ms', flush=True)
+            QTimer.singleShot(0, QApplication.quit)
+        return False
+
 
 if __name__ == "__main__":
+    if '--renderer' in sys.argv:
+        position = sys.argv.index('--renderer') + 1
+        renderer = sys.argv[position] if position < len(sys.argv) else ''
+        if renderer not in settings.RENDERERS:
+            sys.exit(f"Unknown renderer '{renderer}', expected one of: {', '.join(settings.RENDERERS)}")
+        settings.RENDERER = renderer
+
     app = QApplication(sys.argv)
     app.setStyle('Fusion')
     
@@ -25,5 +51,8 @@ if __name__ == "__main__":
     app.setPalette(palette)
     
     main_window = MainFrame()
+    if '--startup-report' in sys.argv:
+        paint_timer = FirstPaintTimer()
+        main_window.installEventFilter(paint_timer)
     main_window.show()
-    sys.exit(app.exec_())
\ No newline at end of file
+    sys.exit(app.exec_())
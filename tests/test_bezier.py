@@ -0,0 +1,41 @@
+import numpy as np
+import pytest
+
+from curves import bezier
+
+SAMPLES = 101
+TOLERANCE = 1e-10
+
+
+def control_points(degree):
+    return np.random.default_rng(degree).uniform(-1, 1, (degree + 1, 2))
+
+
+@pytest.mark.parametrize('method', ['bernstein', 'horner'])
+@pytest.mark.parametrize('degree', range(1, 101))
+def test_matches_de_casteljau(method, degree):
+    points = control_points(degree)
+    expected = bezier.de_casteljau(points, np.linspace(0, 1, SAMPLES))
+    np.testing.assert_allclose(bezier.evaluate(points, SAMPLES, method), expected, rtol=0, atol=TOLERANCE)
+
+
+@pytest.mark.parametrize('degree', range(1, bezier.HORNER_MAX_DEGREE + 1))
+def test_horner_matches_de_casteljau(degree):
+    # evaluate() only uses Horner up to HORNER_MAX_DEGREE, check the scheme itself there
+    points = control_points(degree)
+    ts = np.linspace(0, 1, SAMPLES)
+    np.testing.assert_allclose(bezier.horner(points, ts), bezier.de_casteljau(points, ts), rtol=0, atol=TOLERANCE)
+
+
+def test_endpoints_are_interpolated():
+    points = control_points(7)
+    curve = bezier.evaluate(points, SAMPLES)
+    np.testing.assert_allclose(curve[[0, -1]], points[[0, -1]], rtol=0, atol=TOLERANCE)
+
+
+@pytest.mark.parametrize('degree', [300, 1000])
+def test_bernstein_needs_no_fallback(degree):
+    # the basis is built from non-negative terms, high degrees stay accurate
+    points = control_points(degree)
+    ts = np.linspace(0, 1, SAMPLES)
+    np.testing.assert_allclose(bezier.bernstein_matrix(degree, ts) @ points, bezier.de_casteljau(points, ts), rtol=0, atol=TOLERANCE)
@@ -0,0 +1,26 @@
+import numpy as np
+import pytest
+
+from curves import binary
+from curves.loaders import CurveRecord
+
+
+def test_round_trip(tmp_path):
+    path = str(tmp_path / 'curve.crv')
+    points = np.random.default_rng(0).uniform(-1, 1, (6, 3))
+    knots = np.linspace(0, 1, 10)
+    binary.save_binary(path, CurveRecord('bspline', points, 3, knots))
+    record = binary.load_binary(path)
+    assert record.kind == 'bspline' and record.degree == 3
+    np.testing.assert_array_equal(record.points, points)
+    np.testing.assert_array_equal(record.knots, knots)
+
+
+@pytest.mark.parametrize('record', [
+    CurveRecord('bezier', np.empty((0, 2)), -1, None),
+    CurveRecord('bspline', np.ones((3, 2)), -2, None),
+    CurveRecord('nurbs', np.ones((3, 2)), 2, None),
+])
+def test_invalid_records_raise_value_error(tmp_path, record):
+    with pytest.raises(ValueError):
+        binary.save_binary(str(tmp_path / 'curve.crv'), record)
@@ -0,0 +1,50 @@
+import numpy as np
+import pytest
+from scipy.interpolate import splev
+
+from curves.bspline import BSpline, BSplineEvaluator, generate_knots
+
+
+def clamped(n, degree):
+    return generate_knots(n, degree, decimals=None)
+
+
+def open_uniform(n, degree):
+    return np.arange(n + degree + 1, dtype=np.float64)
+
+
+def open_irregular(n, degree):
+    return np.cumsum(np.random.default_rng(n * 10 + degree).uniform(0.2, 1.0, n + degree + 1))
+
+
+def reference(knots, control_points, degree, u):
+    # splev takes one coefficient array per coordinate
+    return np.column_stack([splev(u, (knots, column, degree)) for column in control_points.T])
+
+
+@pytest.mark.parametrize('make_knots', [clamped, open_uniform, open_irregular])
+@pytest.mark.parametrize('degree', [1, 2, 3, 4, 5])
+@pytest.mark.parametrize('n', [2, 3, 6, 20])
+def test_evaluator_matches_splev(make_knots, degree, n):
+    if n <= degree:
+        pytest.skip('needs more control points than the degree')
+    knots = make_knots(n, degree)
+    control_points = np.random.default_rng(n).uniform(-1, 1, (n, 2))
+    spline = BSpline(control_points, degree, knots)
+    start, end = spline.domain
+    # the grid hits every knot, including the end of the domain
+    u = np.union1d(np.linspace(start, end, 257), knots[degree:n + 1])
+    np.testing.assert_allclose(spline.evaluate(u), reference(knots, control_points, degree, u), atol=1e-12)
+
+
+def test_two_control_points_keep_their_orientation():
+    # a (2, 2) array reads the same either way round, rows are always points
+    control_points = np.array([[0.0, 1.0], [2.0, 3.0]])
+    evaluator = BSplineEvaluator(clamped(2, 1), 1)
+    np.testing.assert_allclose(evaluator.evaluate(control_points, [0.0, 0.5, 1.0]), [[0, 1], [1, 2], [2, 3]])
+
+
+def test_splev_style_lists_are_rejected():
+    evaluator = BSplineEvaluator(clamped(5, 3), 3)
+    with pytest.raises(ValueError):
+        evaluator.evaluate(np.zeros((2, 5)), [0.5])
@@ -0,0 +1,63 @@
+import numpy as np
+import pytest
+
+from curves.lod import decimate_polyline
+
+WIDTH, HEIGHT = 600, 400
+VIEWPORT = (0, 0, WIDTH, HEIGHT)
+
+
+def to_pixels(points):
+    lo, hi = points.min(axis=0), points.max(axis=0)
+    return (points - lo) / (hi - lo) * (WIDTH, HEIGHT)
+
+
+def kept_rows(pixels, markers=False):
+    # decimating the row numbers tells which vertices were kept
+    rows = np.arange(len(pixels), dtype=np.float64)[:, None]
+    out = decimate_polyline(rows, pixels, VIEWPORT, markers=markers)
+    if markers:
+        out, mask = out
+        return out[:, 0].astype(int), mask
+    return out[:, 0].astype(int)
+
+
+def noisy_sine(rng, n):
+    x = np.linspace(0, 10, n)
+    return np.column_stack((x, np.sin(x) + rng.normal(0, 0.1, n)))
+
+
+def random_trace(rng, n):
+    return np.column_stack((np.linspace(0, 1, n), rng.uniform(0, 1, n)))
+
+
+@pytest.mark.parametrize('make', [noisy_sine, random_trace])
+@pytest.mark.parametrize('n', [20000, 200000])
+def test_noisy_trace_is_reduced_to_the_width(make, n):
+    pixels = to_pixels(make(np.random.default_rng(0), n))
+    rows = kept_rows(pixels)
+    assert len(rows) <= 4 * (WIDTH + 1)
+
+    # every pixel column keeps its vertical extent
+    columns = np.floor(pixels[:, 0]).astype(int)
+    for column in np.unique(columns):
+        full = pixels[columns == column, 1]
+        kept = pixels[rows[columns[rows] == column], 1]
+        assert kept.min() == full.min() and kept.max() == full.max()
+
+
+def test_folding_curve_keeps_its_drawing_order():
+    t = np.linspace(0, 1, 100000)
+    pixels = to_pixels(np.column_stack((np.cos(40 * t), np.sin(40 * t) * t)))
+    rows = kept_rows(pixels)
+    assert len(rows) < len(pixels) // 4
+    assert np.all(np.diff(rows) > 0)
+    assert rows[0] == 0 and rows[-1] == len(pixels) - 1
+
+
+def test_markers_keep_one_vertex_per_cell():
+    pixels = to_pixels(np.random.default_rng(1).uniform(0, 1, (50000, 2)))
+    rows, mask = kept_rows(pixels, markers=True)
+    cells = np.unique(np.floor(pixels / 2).astype(int), axis=0)
+    assert mask.sum() == len(cells)
+    assert len(np.unique(np.floor(pixels[rows[mask]] / 2).astype(int), axis=0)) == len(cells)